@@ -0,0 +1,64 @@
+# analysis/matrix_stats.py
+# 선발 투수 (IP, 실점) 매트릭스의 칸별 승률/신뢰구간 계산
+# 오프라인 집계(data_science/build_pitcher_matrix.py)와 웹 조건별 조회(views.py)가 함께 사용하므로
+# numpy/pandas 외의 의존성(scipy, pyarrow 등)을 두지 않습니다.
+from statistics import NormalDist
+import numpy as np
+
+# 칸별 승률 신뢰구간: Wilson 구간 + 부트스트랩 백분위 구간
+CI_LEVEL = 0.95
+BOOTSTRAP_SAMPLES = 5000
+BOOTSTRAP_SEED = 42  # 같은 데이터면 같은 구간이 나오도록 고정
+
+
+def wilson_interval(wins, count, level=CI_LEVEL):
+    """(승리 수, 표본 수) 배열의 Wilson 점수 구간 (하한, 상한) - 비율(0~1)"""
+    wins = np.asarray(wins, dtype=float)
+    count = np.asarray(count, dtype=float)
+    z = NormalDist().inv_cdf(0.5 + level / 2)
+    p = wins / count
+    denom = 1 + z ** 2 / count
+    center = (p + z ** 2 / (2 * count)) / denom
+    half = z * np.sqrt(p * (1 - p) / count + z ** 2 / (4 * count ** 2)) / denom
+    return center - half, center + half
+
+
+def bootstrap_interval(wins, count, level=CI_LEVEL, n_samples=BOOTSTRAP_SAMPLES, seed=BOOTSTRAP_SEED):
+    """
+    (승리 수, 표본 수) 배열의 부트스트랩 백분위 구간 (하한, 상한) - 비율(0~1)
+    한 칸의 경기 결과(승/패) n개를 복원 추출하면 승리 수는 Binomial(n, 승률)을 따르므로,
+    모든 칸 x n_samples번의 재표본을 (n_samples, 칸 수) 배열 하나로 한 번에 뽑습니다.
+    """
+    wins = np.asarray(wins, dtype=np.int64)
+    count = np.asarray(count, dtype=np.int64)
+    rng = np.random.default_rng(seed)
+    resampled = rng.binomial(count, wins / count, size=(n_samples, len(count))) / count
+    alpha = (1 - level) / 2 * 100
+    low, high = np.percentile(resampled, [alpha, 100 - alpha], axis=0)
+    return low, high
+
+
+def records_from_counts(counts):
+    """시즌별 중간 집계를 합쳐서 (IP, 실점)별 승률/표본 수/신뢰구간 목록을 만듭니다."""
+    matrix = counts.groupby(['ip', 'runs'])[['wins', 'count']].sum().reset_index()
+    if matrix.empty:
+        return []
+
+    wins = matrix['wins'].to_numpy()
+    count = matrix['count'].to_numpy()
+    ci_low, ci_high = wilson_interval(wins, count)
+    boot_low, boot_high = bootstrap_interval(wins, count)
+
+    output_data = []
+    for i, (ip, runs) in enumerate(zip(matrix['ip'], matrix['runs'])):
+        output_data.append({
+            'ip': int(ip),
+            'runs': int(runs),
+            'win_rate': round(wins[i] / count[i] * 100, 1),
+            'sample_size': int(count[i]),
+            'ci_low': round(ci_low[i] * 100, 1),
+            'ci_high': round(ci_high[i] * 100, 1),
+            'boot_low': round(boot_low[i] * 100, 1),
+            'boot_high': round(boot_high[i] * 100, 1),
+        })
+    return output_data
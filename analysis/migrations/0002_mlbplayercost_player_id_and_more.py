@@ -0,0 +1,22 @@
+# Generated by Django 6.0 on 2026-10-18 08:11
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('analysis', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='mlbplayercost',
+            name='player_id',
+            field=models.IntegerField(blank=True, db_index=True, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='mlbplayercost',
+            index=models.Index(fields=['year', 'player_id'], name='analysis_ml_year_8dd5c0_idx'),
+        ),
+    ]
@@ -9,7 +9,8 @@ class MlbPlayerCost(models.Model):
 
     id = models.AutoField(primary_key=True)
     year = models.IntegerField(db_index=True)      # 연도 (2020 ~ 2025)
-    name = models.CharField(max_length=100, db_index=True) # 선수명
+    name = models.CharField(max_length=100, db_index=True) # 선수명 (표시용)
+    player_id = models.IntegerField(null=True, blank=True, db_index=True) # 투수 MLBAM id (simulation.PitchData.player_id와 연결용, 타자/이름 매칭 실패 시 None)
     team = models.CharField(max_length=50)         # 팀명
     player_type = models.CharField(max_length=10, choices=PLAYER_TYPES, default='batter') # 타자/투수 구분
     
@@ -25,6 +26,7 @@ class MlbPlayerCost(models.Model):
         indexes = [
             models.Index(fields=['year', 'player_type']),
             models.Index(fields=['year', 'name']),
+            models.Index(fields=['year', 'player_id']),
         ]
         unique_together = ('year', 'name', 'player_type') # 중복 방지
 
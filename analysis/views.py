@@ -5,7 +5,10 @@ import random
 # Sample size를 위한
 import math
 import pandas as pd
+import numpy as np
 import os
+from functools import lru_cache
+from django.http import JsonResponse
 # 가성비 선수 지표를 위한
 from .models import MlbPlayerCost
 from django.db.models import Max
@@ -96,12 +99,30 @@ def pitcher_meta_view(request):
             print(f"Error loading JSON: {e}")
             real_data = []
 
+    # 조건(연도 범위/팀/홈·원정)이 있으면 선발 등판 배열에서 다시 집계
+    arrays = load_starter_arrays()
+    filters, error, scope, games = None, None, None, None
+    if arrays is not None:
+        filters, error = parse_pitcher_filters(request.GET, arrays)
+        if filters and any(request.GET.get(key) for key in ('year_from', 'year_to', 'team', 'side')):
+            scope = filters
+            real_data, games = query_pitcher_matrix(arrays, **filters)
+        else:
+            # 전체 매트릭스(JSON)와 같은 범위의 경기 수 (설명 문구용)
+            scope = parse_pitcher_filters({}, arrays)[0]
+            games = query_pitcher_matrix(arrays, **scope)[1]
+
     # 2. 데이터 매핑
     data_map = {}
     for d in real_data:
         data_map[(d['ip'], d['runs'])] = {
             'win_rate': d['win_rate'],
-            'count': d.get('sample_size', 0)
+            'count': d.get('sample_size', 0),
+            # 95% 신뢰구간 (Wilson / 부트스트랩). 이전 버전 JSON에는 없을 수 있음
+            'ci_low': d.get('ci_low'),
+            'ci_high': d.get('ci_high'),
+            'boot_low': d.get('boot_low'),
+            'boot_high': d.get('boot_high'),
         }
 
     # 3. 히트맵 데이터 생성
@@ -142,6 +163,10 @@ def pitcher_meta_view(request):
                     'runs': runs,
                     'win_rate': win_rate,
                     'count': count,
+                    'ci_low': data['ci_low'],
+                    'ci_high': data['ci_high'],
+                    'boot_low': data['boot_low'],
+                    'boot_high': data['boot_high'],
                     'color_type': color_type, # 템플릿에서 class 분기용
                     'opacity': opacity
                 })
@@ -150,10 +175,123 @@ def pitcher_meta_view(request):
 
     context = {
         'matrix_json': json.dumps(real_data),
-        'heatmap_rows': heatmap_rows
+        'heatmap_rows': heatmap_rows,
+        'filters': filters,
+        'filter_error': error,
+        'scope': scope,
+        'games': games,
+        'teams': list(arrays['teams']) if arrays is not None else [],
+        'years': sorted(set(arrays['year'].tolist())) if arrays is not None else [],
     }
     
     return render(request, 'analysis/pitcher_meta.html', context)
+# 조건별(연도 범위 / 팀 / 홈·원정) 히트맵 조회
+# build_pitcher_matrix.py가 저장한 선발 등판 배열(pitcher_starters.npz)을 메모리에 한 번 올려두고,
+# 조건에 맞는 행만 골라 (IP, 실점) 칸별로 bincount 합니다. 같은 조건은 결과를 캐시해서 바로 반환합니다.
+# 칸별 승률/신뢰구간(Wilson + 부트스트랩)은 전체 매트릭스와 같은 함수로 계산 (matrix_stats.py)
+from .matrix_stats import records_from_counts
+
+PITCHER_STARTERS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'pitcher_starters.npz')
+PITCHER_RUNS_MAX = 15  # 매트릭스 실점 범위 (0~15)
+
+
+class StarterArrays(dict):
+    """선발 등판 배열 묶음. 조회 결과 캐시(lru_cache)의 키로는 파일 수정 시각(mtime_ns)만 사용합니다."""
+
+    def __init__(self, mtime_ns, data):
+        super().__init__(data)
+        self.mtime_ns = mtime_ns
+
+    def __hash__(self):
+        return hash(self.mtime_ns)
+
+    def __eq__(self, other):
+        return isinstance(other, StarterArrays) and self.mtime_ns == other.mtime_ns
+
+
+_starter_arrays = {'arrays': None}
+
+
+def load_starter_arrays():
+    """선발 등판 배열 (파일이 바뀌었을 때만 다시 읽음). 파일이 없으면 None"""
+    if not os.path.exists(PITCHER_STARTERS_PATH):
+        return None
+    mtime_ns = os.stat(PITCHER_STARTERS_PATH).st_mtime_ns
+    cached = _starter_arrays['arrays']
+    if cached is None or cached.mtime_ns != mtime_ns:
+        with np.load(PITCHER_STARTERS_PATH) as npz:
+            data = {key: npz[key] for key in npz.files}
+        data['cell'] = data['ip'].astype(np.int32) * (PITCHER_RUNS_MAX + 1) + data['runs']
+        _starter_arrays['arrays'] = StarterArrays(mtime_ns, data)
+        query_pitcher_matrix.cache_clear()
+    return _starter_arrays['arrays']
+
+
+def parse_pitcher_filters(params, arrays):
+    """GET 파라미터(year_from, year_to, team, side)를 검증합니다. 반환: (조건 dict, 오류 메시지)"""
+    years = arrays['year']
+    try:
+        year_from = int(params.get('year_from') or years.min())
+        year_to = int(params.get('year_to') or years.max())
+    except ValueError:
+        return None, '연도는 숫자로 입력해주세요.'
+    if year_from > year_to:
+        return None, '시작 연도가 끝 연도보다 늦습니다.'
+
+    team = params.get('team') or ''
+    if team and team not in arrays['teams']:
+        return None, f'알 수 없는 팀입니다: {team}'
+
+    side = params.get('side') or ''
+    if side not in ('', 'home', 'away'):
+        return None, "side는 'home' 또는 'away'만 가능합니다."
+
+    return {'year_from': year_from, 'year_to': year_to, 'team': team, 'side': side}, None
+
+
+@lru_cache(maxsize=256)
+def query_pitcher_matrix(arrays, year_from, year_to, team, side):
+    """
+    조건에 맞는 선발 등판만 (IP, 실점)별로 집계합니다.
+    반환값: (pitcher_meta_matrix.json과 같은 형식의 목록, 경기 수 - 이전 버전 배열 파일이면 None)
+    arrays는 load_starter_arrays()의 결과 (캐시 키는 배열 파일의 mtime_ns - 파일이 바뀌면 이전 결과를 쓰지 않음)
+    """
+    mask = (arrays['year'] >= year_from) & (arrays['year'] <= year_to)
+    if team:
+        mask &= arrays['team'] == int(np.searchsorted(arrays['teams'], team))
+    if side:
+        mask &= arrays['is_home'] == (1 if side == 'home' else 0)
+
+    n_cells = 10 * (PITCHER_RUNS_MAX + 1)
+    cell = arrays['cell'][mask]
+    count = np.bincount(cell, minlength=n_cells)
+    wins = np.bincount(cell, weights=arrays['win'][mask], minlength=n_cells).astype(np.int64)
+
+    # 표본이 있는 칸만 (IP, 실점, 승리 수, 표본 수)로 넘겨 전체 매트릭스와 같은 방식으로 구간 계산
+    filled = np.flatnonzero(count)
+    ip, runs = np.divmod(filled, PITCHER_RUNS_MAX + 1)
+    counts = pd.DataFrame({'ip': ip, 'runs': runs, 'wins': wins[filled], 'count': count[filled]})
+    games = int(np.unique(arrays['game_pk'][mask]).size) if 'game_pk' in arrays else None
+    return records_from_counts(counts), games
+
+
+def pitcher_meta_query_view(request):
+    """GET /analysis/pitcher-meta/query/?year_from=2020&year_to=2025&team=LAD&side=home"""
+    arrays = load_starter_arrays()
+    if arrays is None:
+        return JsonResponse({'error': '선발 등판 데이터가 없습니다. build_pitcher_matrix.py를 먼저 실행해주세요.'}, status=404)
+
+    filters, error = parse_pitcher_filters(request.GET, arrays)
+    if error:
+        return JsonResponse({'error': error}, status=400)
+
+    records, games = query_pitcher_matrix(arrays, **filters)
+    return JsonResponse({
+        'filters': filters,
+        'games': games,
+        'sample_size': sum(r['sample_size'] for r in records),
+        'matrix': records,
+    })
 # ------------------------------------------------------------------------------------------------------------------------
 # 불펜투수 지표
 def relief_metrics_view(request):
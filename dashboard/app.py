@@ -18,9 +18,26 @@ def load_summary():
         data = json.load(f)
     return data
 
+@st.cache_data
+def load_catalog():
+    # collect_data.py가 연도 파일을 저장할 때마다 갱신하는 카탈로그 (없으면 None)
+    base_dir = os.path.dirname(os.path.abspath(__file__))
+    catalog_path = os.path.join(base_dir, '..', 'simulation', 'data', 'statcast_catalog.json')
+
+    if not os.path.exists(catalog_path):
+        return None
+    with open(catalog_path, 'r', encoding='utf-8') as f:
+        return json.load(f)['files']
+
 # --- 메인 화면 시작 ---
 try:
     data = load_summary()
+    catalog = load_catalog()
+
+    # 연도별 행 수는 카탈로그가 있으면 카탈로그 기준 (데이터를 다시 스캔하지 않음)
+    if catalog:
+        data['years'] = {year: entry['num_rows'] for year, entry in catalog.items()}
+        data['total_pitches'] = sum(data['years'].values())
 
     st.title("⚾ 2016-2025 MLB Statcast Data Overview")
     st.markdown("### 내가 수집한 데이터의 규모(Sample Size)를 확인합니다.")
@@ -43,6 +60,15 @@ try:
                        title="연도별 투구 수 (2020년 단축 시즌 확인)", color='Count')
     st.plotly_chart(fig_years, use_container_width=True)
 
+    # 연도별 경기 수 / 날짜 범위 (카탈로그)
+    if catalog:
+        df_catalog = pd.DataFrame([
+            {'Year': year, 'Games': entry['num_games'], 'Dates': entry['num_dates'],
+             'First Date': entry['min_game_date'], 'Last Date': entry['max_game_date']}
+            for year, entry in catalog.items()
+        ]).sort_values('Year')
+        st.dataframe(df_catalog, hide_index=True, use_container_width=True)
+
     col1, col2 = st.columns(2)
 
     with col1:
@@ -1,9 +1,15 @@
 import os
-import glob
+import sys
 import pandas as pd
 import numpy as np
 from scipy.stats import pearsonr
 
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from data_loader import StatcastLoader
+from player_dim import season_key
+from stabilization_engine import RESAMPLES, player_codes, resampled_curve
+from event_lookup import EVENT_ATTRIBUTES, classify_events
+
 # ==========================================================
 # 1. 경로 설정 (collect_data.py와 동일한 로직 적용)
 # ==========================================================
@@ -15,30 +21,52 @@ DATA_DIR = os.path.join(BASE_DIR, '..', 'simulation', 'data')
 
 # 경로 정규화 (OS 호환성 확보)
 DATA_DIR = os.path.normpath(DATA_DIR)
+
+# add_pa_count()에 필요한 투구 단위 컬럼 (시즌별 스트리밍 모드에서 읽는 기본 컬럼)
+PA_COUNT_COLUMNS = ['game_date', 'game_pk', 'at_bat_number', 'game_year', 'batter', 'events']
 # ==========================================================
 
 
-def load_all_data(data_dir):
+def load_all_data(data_dir, compact=False, use_cache=False):
     """
     DATA_DIR 내의 모든 statcast_*.parquet 파일을 로드하여 하나로 합칩니다.
+    compact=True면 문자열은 category, 숫자는 작은 타입으로 변환해 메모리를 줄입니다.
+    use_cache=True면 압축 해제된 Arrow IPC 캐시를 메모리 매핑으로 읽습니다.
     """
     print(f"📂 데이터 로딩 경로: {data_dir}")
-    all_files = glob.glob(os.path.join(data_dir, "statcast_*.parquet"))
+    loader = StatcastLoader(data_dir, use_cache=use_cache)
+    years = loader.available_years()
     
-    if not all_files:
+    if not years:
         print("⚠️ 데이터 파일이 없습니다. collect_data.py를 먼저 실행해 주세요.")
         return None
 
-    print(f"   -> 총 {len(all_files)}개의 파일을 발견했습니다. 병합을 시작합니다...")
+    print(f"   -> 총 {len(years)}개 연도 데이터를 발견했습니다. 병합을 시작합니다...")
     
-    # 리스트 컴프리헨션으로 로드 후 concat (메모리 효율 및 속도 최적화)
-    df_list = [pd.read_parquet(f) for f in all_files]
-    full_df = pd.concat(df_list, ignore_index=True)
+    full_df = loader.load(compact=compact)
     
     print(f"📊 총 {len(full_df):,}개 행(Rows) 로드 완료.")
     return full_df
 
 
+def load_pa_data(data_dir, compact=False):
+    """
+    시즌별 타석(PA) 테이블을 로드합니다. (없거나 원본이 바뀐 시즌은 먼저 생성)
+    add_pa_count()를 거친 결과와 같은 순서/순번(pa_count_season)이며, 결과 플래그(is_hr 등)가 포함됩니다.
+    """
+    print(f"📂 데이터 로딩 경로: {data_dir}")
+    loader = StatcastLoader(data_dir)
+
+    if not loader.available_years():
+        print("⚠️ 데이터 파일이 없습니다. collect_data.py를 먼저 실행해 주세요.")
+        return None
+
+    pa_df = loader.load_pa(compact=compact)
+
+    print(f"📊 총 {len(pa_df):,}개 타석(PA) 로드 완료.")
+    return pa_df
+
+
 def add_pa_count(df):
     """
     타자별 시즌 누적 타석 번호(PA Count)를 생성합니다.
@@ -116,18 +144,144 @@ def calculate_reliability_stat(pa_df, stat_col, min_pa=50):
     return r_corrected
 
 
+def reliability_partials(pa_df, stat_cols):
+    """
+    짝홀 신뢰도 계산에 필요한 선수별 부분합만 남깁니다.
+    반환: (선수별 총 타석 수 Series, 선수 x (스탯, sum/count, odd/even) DataFrame) - 인덱스는 (game_year, batter)
+    선수-시즌 단위라 시즌별로 구한 부분합을 이어 붙이기만 하면 전체를 한 번에 구한 것과 같습니다.
+    """
+    keys = [pa_df['game_year'], pa_df['batter']]
+    half = pd.Series(np.where(pa_df['pa_count_season'] % 2 != 0, 'odd', 'even'), index=pa_df.index, name='half')
+
+    # 1. 선수별 총 타석 수 (모든 스탯/기준 공통)
+    player_counts = pa_df.groupby(keys, observed=True).size()
+
+    # 2. 선수 x 짝홀별 모든 스탯의 합계/개수를 한 번의 groupby로
+    half_sums = pa_df[list(stat_cols)].groupby(keys + [half], observed=True).agg(['sum', 'count']).unstack('half')
+    return player_counts, half_sums
+
+
+def reliability_from_partials(player_counts, half_sums, stat_cols, min_pas):
+    """선수별 부분합에서 스탯 x 최소 타석 기준별 계수를 계산합니다. 반환: DataFrame (stat, min_pa, players, r, r_corrected)"""
+    rows = []
+    for min_pa in min_pas:
+        valid = half_sums.index.isin(player_counts[player_counts >= min_pa].index)
+        for stat_col in stat_cols:
+            sums = half_sums.loc[valid, stat_col]
+            if ('sum', 'odd') not in sums.columns or ('sum', 'even') not in sums.columns:
+                continue
+            # 홀/짝 모두 기록이 있는 선수만 (inner join과 동일)
+            pair = pd.DataFrame({
+                'odd': sums[('sum', 'odd')] / sums[('count', 'odd')],
+                'even': sums[('sum', 'even')] / sums[('count', 'even')],
+            }).dropna()
+            if len(pair) < 10:
+                continue
+            r, _ = pearsonr(pair['odd'], pair['even'])
+            rows.append({
+                'stat': stat_col,
+                'min_pa': min_pa,
+                'players': len(pair),
+                'r': r,
+                'r_corrected': (2 * r) / (1 + r),  # Spearman-Brown 보정
+            })
+    return pd.DataFrame(rows, columns=['stat', 'min_pa', 'players', 'r', 'r_corrected'])
+
+
+def calculate_reliability_batch(pa_df, stat_cols, min_pas=(50,)):
+    """
+    여러 스탯 x 여러 최소 타석 기준의 신뢰도(Split-Half Reliability)를 한 번에 계산합니다.
+    calculate_reliability_stat과 같은 짝홀법이지만, 선수별 타석 수 / 짝홀 분리 / 선수별 평균은
+    모든 스탯이 공유하므로 한 번만 계산합니다. (스탯 수와 상관없이 groupby 한 번)
+
+    :param stat_cols: 분석할 스탯 컬럼 목록 (결측 값은 해당 스탯 평균에서만 제외)
+    :param min_pas: 최소 타석 기준 목록 (선수 필터는 pa_df 전체 타석 수 기준으로 공통 적용)
+    :return: DataFrame (stat, min_pa, players, r, r_corrected)
+    """
+    stat_cols = list(stat_cols)
+    print(f"🧪 스탯 {len(stat_cols)}개 x 기준 {len(min_pas)}개 일괄 분석 중...")
+
+    player_counts, half_sums = reliability_partials(pa_df, stat_cols)
+    result = reliability_from_partials(player_counts, half_sums, stat_cols, min_pas)
+    print(f"   -> 계수 {len(result)}개 계산 완료")
+    return result
+
+
+def calculate_reliability_streaming(data_dir, stat_cols, min_pas=(50,)):
+    """
+    시즌을 하나씩 읽어서 calculate_reliability_batch와 같은 결과를 계산합니다. (아웃 오브 코어)
+    타석 번호는 시즌 안에서만 매기므로 add_pa_count를 시즌별로 적용하고,
+    시즌이 끝나면 선수별 짝홀 부분합만 남기고 원본은 버립니다. 메모리 사용량은 가장 큰 시즌 하나 분량입니다.
+
+    :param stat_cols: 원본 컬럼(launch_speed 등) 또는 이벤트 분류 플래그(is_hr, is_k, total_bases ...)
+    """
+    stat_cols = list(stat_cols)
+    loader = StatcastLoader(data_dir)
+    years = loader.available_years()
+    if not years:
+        print("⚠️ 데이터 파일이 없습니다. collect_data.py를 먼저 실행해 주세요.")
+        return None
+
+    # 원본에 없는 스탯은 events에서 분류 (event_lookup 분류표)
+    derived = [c for c in stat_cols if c in EVENT_ATTRIBUTES]
+    raw = [c for c in stat_cols if c not in EVENT_ATTRIBUTES]
+    columns = list(dict.fromkeys(PA_COUNT_COLUMNS + raw))
+
+    print(f"🧪 스탯 {len(stat_cols)}개 x 기준 {len(min_pas)}개 시즌별 분석 중... ({len(years)}개 시즌)")
+    counts, sums = [], []
+    for year in years:
+        season_df = loader.load(columns=columns, years=[year])
+        pa_df = add_pa_count(season_df)
+        del season_df
+        if derived:
+            flags = classify_events(pa_df['events'], derived)
+            for name in derived:
+                pa_df[name] = flags[name]
+
+        player_counts, half_sums = reliability_partials(pa_df, stat_cols)
+        counts.append(player_counts)
+        sums.append(half_sums)
+        print(f"   -> {year}년: {len(pa_df):,}타석 -> 선수 {len(player_counts):,}명 부분합")
+        del pa_df
+
+    # 같은 선수-시즌이 여러 파일에 나뉘어 있어도 부분합은 더하면 됨
+    player_counts = pd.concat(counts).groupby(level=[0, 1]).sum()
+    half_sums = pd.concat(sums).groupby(level=[0, 1]).sum(min_count=1)
+    result = reliability_from_partials(player_counts, half_sums, stat_cols, min_pas)
+    print(f"   -> 계수 {len(result)}개 계산 완료")
+    return result
+
+
+def calculate_reliability_resampled(pa_df, stat_col, min_pa=50, resamples=RESAMPLES):
+    """
+    홀짝 분할 한 번 대신, 선수별 타석을 무작위로 반씩 나누는 일을 resamples번 반복한 신뢰도를 계산합니다.
+    반복은 선수별 값 개수/합계 배열 위에서 한 번에 처리합니다. (stabilization_engine.resampled_curve)
+
+    :return: (보정 신뢰도 평균, 95% 구간 하한, 상한) / 표본이 부족하면 None
+    """
+    print(f"🧪 스탯 분석 중 (무작위 반분 {resamples}회): {stat_col} ...")
+
+    codes, n_players = player_codes(season_key(pa_df['batter'], pa_df['game_year']))
+    curve = resampled_curve(codes, n_players, pa_df[stat_col].to_numpy(dtype=np.float64), None, [min_pa],
+                            n_resamples=resamples)
+    if not curve:
+        print("   -> 표본이 너무 적어 상관계수를 계산할 수 없습니다.")
+        return None
+
+    _, r_mean, low, high = curve[0]
+    print(f"   -> 보정값 평균: {r_mean:.3f} (95% 구간 {low:.3f} ~ {high:.3f})")
+    return r_mean, low, high
+
+
 # ==========================================================
 # 실행부 (Main)
 # ==========================================================
 if __name__ == "__main__":
-    # 1. 데이터 로드
-    full_df = load_all_data(DATA_DIR)
+    # 1. 데이터 로드: 타석 테이블은 PA Count가 이미 매겨져 있어 정렬/필터 과정이 필요 없음
+    # (메모리가 부족하면 compact=True - 단, launch_speed 등이 float32가 되어 결과가 소수점 아래에서 달라질 수 있음)
+    pa_df = load_pa_data(DATA_DIR)
     
-    if full_df is not None:
-        # 2. 전처리: PA Count 생성
-        # (메모리 절약을 위해 필요한 컬럼만 선택해서 넘길 수도 있음)
-        pa_df = add_pa_count(full_df)
-        
+    if pa_df is not None:
         # 3. 분석 예시
         print("\n[ 분석 결과 예시 ]")
         
@@ -137,8 +291,25 @@ if __name__ == "__main__":
         calculate_reliability_stat(ls_df, 'launch_speed', min_pa=50)
         
         # (예시 2) 홈런율 (HR Rate) 신뢰도
-        # 'events'가 'home_run'이면 1, 아니면 0인 컬럼 생성
-        pa_df['is_homerun'] = pa_df['events'].apply(lambda x: 1 if x == 'home_run' else 0)
-        calculate_reliability_stat(pa_df, 'is_homerun', min_pa=100) # 홈런은 희귀해서 PA 기준을 높임
+        # 타석 테이블의 is_hr: 'events'가 'home_run'이면 1, 아니면 0
+        calculate_reliability_stat(pa_df, 'is_hr', min_pa=100) # 홈런은 희귀해서 PA 기준을 높임
+
+        # (예시 3) 홈런율을 무작위 반분 반복으로 (분할 하나에 따른 흔들림 확인)
+        calculate_reliability_resampled(pa_df, 'is_hr', min_pa=100)
+
+        # (예시 4) 여러 스탯 x 여러 기준을 한 번에
+        batch = calculate_reliability_batch(
+            pa_df, ['is_hr', 'is_k', 'is_bb', 'is_hit', 'is_onbase', 'total_bases', 'launch_speed'],
+            min_pas=[50, 100, 200],
+        )
+        print(batch.round(3).to_string(index=False))
+
+        # (예시 5) 같은 분석을 시즌 단위로 (전체 기간을 메모리에 올리지 않음)
+        streaming = calculate_reliability_streaming(
+            DATA_DIR, ['is_hr', 'is_k', 'is_bb', 'is_hit', 'is_onbase', 'total_bases', 'launch_speed'],
+            min_pas=[50, 100, 200],
+        )
+        diff = (batch['r_corrected'] - streaming['r_corrected']).abs().max()
+        print(f"   -> 전체 로드 결과와 최대 차이: {diff:.1e}")
         
         print("\n✅ 모든 분석 완료.")
\ No newline at end of file
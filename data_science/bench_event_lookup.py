@@ -0,0 +1,94 @@
+import pandas as pd
+import numpy as np
+import time
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from event_lookup import classify_events, classify_descriptions
+
+# ==========================================================
+# 이벤트 분류 속도 비교: 행 단위 .apply vs 분류표 배열 인덱싱
+# ==========================================================
+N_ROWS = 3_000_000
+
+EVENTS = ['field_out', 'strikeout', 'single', 'walk', 'double', 'home_run', 'grounded_into_double_play',
+          'force_out', 'hit_by_pitch', 'sac_fly', 'triple', 'fielders_choice_out', 'strikeout_double_play',
+          'caught_stealing_2b', 'triple_play', None]
+DESCRIPTIONS = ['ball', 'called_strike', 'foul', 'swinging_strike', 'hit_into_play', 'foul_tip',
+                'blocked_ball', 'swinging_strike_blocked', 'hit_by_pitch']
+
+
+# --- 기존 방식 (build_pitcher_matrix / calc_stabilization / analyze_reliability에 있던 행 단위 함수) ---
+def get_event_outs(event):
+    if pd.isna(event): return 0
+    if 'triple_play' in event: return 3
+    if 'double_play' in event or 'grounded_into_double_play' in event: return 2
+    out_events = [
+        'strikeout', 'field_out', 'force_out', 'sac_fly', 'sac_bunt',
+        'fielders_choice', 'fielders_choice_out', 'strikeout_double_play',
+        'caught_stealing_2b', 'caught_stealing_3b', 'caught_stealing_home',
+        'pickoff_caught_stealing_2b', 'pickoff_caught_stealing_3b',
+        'pickoff_caught_stealing_home', 'batter_interference'
+    ]
+    if 'strikeout_double_play' in event: return 2
+    if event in out_events: return 1
+    return 0
+
+
+def get_slg_value(event):
+    if event == 'single': return 1
+    elif event == 'double': return 2
+    elif event == 'triple': return 3
+    elif event == 'home_run': return 4
+    return 0
+
+
+def old_path(df):
+    swings = ['foul', 'foul_bunt', 'foul_tip', 'hit_into_play', 'swinging_strike', 'swinging_strike_blocked', 'missed_bunt']
+    contacts = ['foul', 'foul_bunt', 'foul_tip', 'hit_into_play']
+    return pd.DataFrame({
+        'outs': df['events'].apply(get_event_outs),
+        'total_bases': df['events'].apply(get_slg_value),
+        'is_hr': df['events'].apply(lambda x: 1 if x == 'home_run' else 0),
+        'is_swing': df['description'].isin(swings).astype(int),
+        'is_contact': df['description'].isin(contacts).astype(int),
+    })
+
+
+def new_path(df):
+    events = classify_events(df['events'], ['outs', 'total_bases', 'is_hr'])
+    descriptions = classify_descriptions(df['description'], ['is_swing', 'is_contact'])
+    return pd.concat([events, descriptions], axis=1)
+
+
+def timed(fn, df):
+    start_time = time.time()
+    result = fn(df)
+    return result, time.time() - start_time
+
+
+if __name__ == "__main__":
+    print(f"📦 데이터 생성 중... ({N_ROWS:,}행)")
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame({
+        'events': pd.Series(rng.choice(np.array(EVENTS, dtype=object), N_ROWS)),
+        'description': pd.Series(rng.choice(np.array(DESCRIPTIONS, dtype=object), N_ROWS)),
+    })
+
+    print("🏁 속도 대결 시작!\n")
+    old, old_time = timed(old_path, df)
+    print(f"🐢 .apply (행 단위): {old_time:.3f} 초")
+
+    new, new_time = timed(new_path, df)
+    print(f"🚀 분류표 (object 컬럼): {new_time:.3f} 초")
+
+    compact = df.astype('category')
+    new_cat, cat_time = timed(new_path, compact)
+    print(f"🚀 분류표 (category 코드): {cat_time:.3f} 초")
+
+    print("-" * 30)
+    same = all((old[c].to_numpy() == new[c].to_numpy()).all() and (old[c].to_numpy() == new_cat[c].to_numpy()).all()
+               for c in old.columns)
+    print(f"✅ 결과 일치: {same}")
+    print(f"🏆 분류표가 {old_time / new_time:.1f}배 (category: {old_time / cat_time:.1f}배) 더 빠릅니다!")
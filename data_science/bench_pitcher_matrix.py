@@ -0,0 +1,111 @@
+import pandas as pd
+import time
+import os
+import sys
+import shutil
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from data_loader import StatcastLoader
+from build_pitcher_matrix import DATA_DIR, MATRIX_WORKERS, TARGET_YEARS, iter_season_starters, matrix_records
+
+# ==========================================================
+# 선발 매트릭스 생성 속도 비교: 경기별 루프 vs 시즌 단위 그룹 연산 (+ 시즌별 프로세스)
+# ==========================================================
+# 사용법: python bench_pitcher_matrix.py [데이터 폴더]
+# 결과 JSON은 건드리지 않고, 두 방식의 집계 결과가 같은지만 비교합니다.
+
+
+# --- 기존 방식 (build_pitcher_matrix.build_matrix에 있던 경기별 루프) ---
+def get_event_outs(event):
+    if pd.isna(event): return 0
+    if 'triple_play' in event: return 3
+    if 'double_play' in event or 'grounded_into_double_play' in event: return 2
+    out_events = [
+        'strikeout', 'field_out', 'force_out', 'sac_fly', 'sac_bunt',
+        'fielders_choice', 'fielders_choice_out', 'strikeout_double_play',
+        'caught_stealing_2b', 'caught_stealing_3b', 'caught_stealing_home',
+        'pickoff_caught_stealing_2b', 'pickoff_caught_stealing_3b',
+        'pickoff_caught_stealing_home', 'batter_interference'
+    ]
+    if 'strikeout_double_play' in event: return 2
+    if event in out_events: return 1
+    return 0
+
+
+def old_path(data_dir, years):
+    loader = StatcastLoader(data_dir)
+    columns = ['game_pk', 'inning', 'inning_topbot', 'events', 'pitcher', 'post_away_score', 'post_home_score',
+               'at_bat_number', 'pitch_number']
+    all_starters_data = []
+
+    for year in years:
+        df = loader.load(columns=columns, filters=[('game_type', '==', 'R')], years=[year])
+        for game_pk, game in df.groupby('game_pk'):
+            game = game.sort_values(by=['at_bat_number', 'pitch_number'], ascending=[True, True])
+            last_row = game.iloc[-1]
+            final_home = last_row['post_home_score']
+            final_away = last_row['post_away_score']
+            if final_home == final_away: continue
+            is_home_win = final_home > final_away
+
+            top_1st = game[(game['inning'] == 1) & (game['inning_topbot'] == 'Top')]
+            bot_1st = game[(game['inning'] == 1) & (game['inning_topbot'] == 'Bot')]
+
+            if not top_1st.empty:
+                p_events = game[game['pitcher'] == top_1st.iloc[0]['pitcher']]
+                all_starters_data.append({
+                    'ip': p_events['events'].apply(get_event_outs).sum() / 3.0,
+                    'runs': int(p_events['post_away_score'].max()),
+                    'win': 1 if is_home_win else 0
+                })
+            if not bot_1st.empty:
+                p_events = game[game['pitcher'] == bot_1st.iloc[0]['pitcher']]
+                all_starters_data.append({
+                    'ip': p_events['events'].apply(get_event_outs).sum() / 3.0,
+                    'runs': int(p_events['post_home_score'].max()),
+                    'win': 0 if is_home_win else 1
+                })
+
+    return matrix_records(pd.DataFrame(all_starters_data))
+
+
+def new_path(data_dir, years, workers):
+    frames = []
+    for year, result in iter_season_starters(years, workers, data_dir):
+        if isinstance(result, Exception):
+            raise result
+        frames.append(result[0])
+    return matrix_records(pd.concat(frames, ignore_index=True))
+
+
+def timed(fn, *args):
+    start_time = time.time()
+    result = fn(*args)
+    return result, time.time() - start_time
+
+
+if __name__ == "__main__":
+    data_dir = sys.argv[1] if len(sys.argv) > 1 else DATA_DIR
+    loader = StatcastLoader(data_dir)
+    years = [y for y in TARGET_YEARS if y in set(loader.available_years())]
+    print(f"📂 데이터 경로: {loader.data_dir} ({len(years)}개 시즌, 코어 {os.cpu_count()}개)")
+    print("🏁 속도 대결 시작!\n")
+
+    old, old_time = timed(old_path, data_dir, years)
+    print(f"🐢 경기별 루프: {old_time:.2f} 초")
+
+    # 타석/경기 테이블을 지우고 처음부터 (테이블 생성 시간 포함)
+    for path in (loader.pa_dir, loader.game_dir):
+        shutil.rmtree(path, ignore_errors=True)
+    cold, cold_time = timed(new_path, data_dir, years, MATRIX_WORKERS)
+    print(f"🚀 시즌 단위 그룹 연산 (테이블 생성 포함, 프로세스 {MATRIX_WORKERS}개): {cold_time:.2f} 초")
+
+    single, single_time = timed(new_path, data_dir, years, 1)
+    print(f"🚀 시즌 단위 그룹 연산 (테이블 있음, 단일 프로세스): {single_time:.2f} 초")
+
+    warm, warm_time = timed(new_path, data_dir, years, MATRIX_WORKERS)
+    print(f"🚀 시즌 단위 그룹 연산 (테이블 있음, 프로세스 {MATRIX_WORKERS}개): {warm_time:.2f} 초")
+
+    print("-" * 30)
+    print(f"✅ 결과 일치: {old == cold == single == warm}")
+    print(f"🏆 처음부터 생성해도 {old_time / cold_time:.1f}배, 테이블이 있으면 {old_time / warm_time:.1f}배 더 빠릅니다!")
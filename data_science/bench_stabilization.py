@@ -0,0 +1,123 @@
+import pandas as pd
+import numpy as np
+import time
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from stabilization_engine import RESAMPLES, player_codes, half_totals, threshold_sweep, run_stat_curves, resampled_curve
+
+# ==========================================================
+# 안정화 분석 속도 비교: 기준 타석마다 groupby vs 선수별 반분 합계 + 기준 훑기
+# ==========================================================
+N_ROWS = 3_000_000
+N_PLAYERS = 6_000
+THRESHOLDS = range(50, 601, 50)
+WORKERS = os.cpu_count() or 1
+
+# (값 컬럼, 분모 조건 컬럼) - calc_stabilization의 스탯 정의와 같은 모양
+STATS = [('is_k', None), ('is_hr', None), ('is_gb', 'is_batted'), ('total_bases', 'ab_flag')]
+
+
+# --- 기존 방식 (calc_stabilization.calculate_correlations에 있던 기준별 루프) ---
+def old_path(df):
+    results = []
+    for val_col, filter_col in STATS:
+        target_df = df[df[filter_col] == True] if filter_col else df
+        for threshold in THRESHOLDS:
+            counts = target_df.groupby('player_season_id').size()
+            valid_players = counts[counts >= threshold].index
+            if len(valid_players) < 50: continue
+
+            sample = target_df[target_df['player_season_id'].isin(valid_players)]
+            grouped = sample.groupby(['player_season_id', 'group'])[val_col].mean().unstack()
+            grouped = grouped.dropna()
+
+            if len(grouped) > 30:
+                r = grouped[0].corr(grouped[1])
+                if pd.isna(r): continue
+                results.append((val_col, threshold, round((2 * r) / (1 + r), 3)))
+    return results
+
+
+def new_path(df):
+    results = []
+    player_code, n_players = player_codes(df['player_season_id'])
+    group = df['group'].to_numpy()
+    for val_col, filter_col in STATS:
+        mask = df[filter_col].to_numpy(dtype=bool) if filter_col else None
+        totals = half_totals(player_code, n_players, group, df[val_col].to_numpy(dtype=np.float64), mask)
+        for threshold, r in threshold_sweep(totals, THRESHOLDS):
+            results.append((val_col, threshold, round(r, 3)))
+    return results
+
+
+def parallel_path(df):
+    # 공유 메모리 컬럼 + 스탯별 프로세스 (calc_stabilization의 workers 모드)
+    player_code, n_players = player_codes(df['player_season_id'])
+    columns = {('pa', 'player'): player_code, ('pa', 'group'): df['group'].to_numpy()}
+    tasks = []
+    for val_col, filter_col in STATS:
+        for col in filter(None, (val_col, filter_col)):
+            columns.setdefault(('pa', col), df[col].to_numpy())
+        tasks.append(('pa', n_players, val_col, filter_col, THRESHOLDS))
+    curves = run_stat_curves(columns, tasks, WORKERS)
+    return [(val_col, threshold, round(r, 3))
+            for (val_col, _), curve in zip(STATS, curves) for threshold, r in curve]
+
+
+def resampled_path(df):
+    # 무작위 반분 RESAMPLES번 반복 (평균 보정 신뢰도 + 95% 구간)
+    player_code, n_players = player_codes(df['player_season_id'])
+    results = []
+    for val_col, filter_col in STATS:
+        mask = df[filter_col].to_numpy(dtype=bool) if filter_col else None
+        for threshold, r, low, high in resampled_curve(player_code, n_players, df[val_col].to_numpy(), mask,
+                                                       THRESHOLDS, n_resamples=RESAMPLES):
+            results.append((val_col, threshold, round(r, 3), round(low, 3), round(high, 3)))
+    return results
+
+
+def timed(fn, df):
+    start_time = time.time()
+    result = fn(df)
+    return result, time.time() - start_time
+
+
+if __name__ == "__main__":
+    print(f"📦 데이터 생성 중... ({N_ROWS:,}행, 선수 {N_PLAYERS:,}명)")
+    rng = np.random.default_rng(0)
+    # 선수별 출전 빈도와 실력(확률)을 다르게 해서 실제 데이터처럼 기준별 선수 수가 줄어들도록
+    weights = rng.pareto(1.5, N_PLAYERS) + 0.05
+    players = rng.choice(N_PLAYERS, N_ROWS, p=weights / weights.sum())
+    skill = rng.beta(4, 16, N_PLAYERS)[players]
+    is_batted = rng.random(N_ROWS) < 0.7
+    df = pd.DataFrame({
+        'player_season_id': players.astype(np.int64) * 10000 + 2024,
+        'group': (np.arange(N_ROWS) % 2).astype(np.int8),
+        'is_k': (rng.random(N_ROWS) < skill).astype(int),
+        'is_hr': (rng.random(N_ROWS) < skill / 6).astype(int),
+        'is_batted': is_batted,
+        'is_gb': (is_batted & (rng.random(N_ROWS) < 0.3 + skill)).astype(int),
+        'ab_flag': rng.random(N_ROWS) < 0.85,
+        'total_bases': rng.choice(5, N_ROWS, p=[0.75, 0.15, 0.05, 0.01, 0.04]),
+    })
+
+    print("🏁 속도 대결 시작!\n")
+    old, old_time = timed(old_path, df)
+    print(f"🐢 기준별 groupby: {old_time:.2f} 초")
+
+    new, new_time = timed(new_path, df)
+    print(f"🚀 선수별 반분 합계 + 기준 훑기: {new_time:.2f} 초")
+
+    parallel, parallel_time = timed(parallel_path, df)
+    print(f"🚀 공유 메모리 + 프로세스 {WORKERS}개: {parallel_time:.2f} 초")
+
+    resampled, resampled_time = timed(resampled_path, df)
+    print(f"🎲 무작위 반분 {RESAMPLES}회 반복: {resampled_time:.2f} 초")
+
+    print("-" * 30)
+    print(f"✅ 결과 일치: {old == new == parallel} ({len(new)}개 계수)")
+    for (val_col, threshold, r), (_, _, mean, low, high) in list(zip(new, resampled))[::6]:
+        print(f"   {val_col:>11} {threshold:>3}: 홀짝 {r:.3f} / 무작위 평균 {mean:.3f} [{low:.3f} ~ {high:.3f}]")
+    print(f"🏆 {old_time / new_time:.1f}배 더 빠릅니다!")
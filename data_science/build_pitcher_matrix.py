@@ -2,7 +2,15 @@
 import pandas as pd
 import numpy as np
 import os
+import sys
 import json
+from concurrent.futures import ProcessPoolExecutor
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from data_loader import StatcastLoader
+# 칸별 승률/신뢰구간 계산은 웹 조건별 조회(analysis/views.py)와 공유
+from analysis.matrix_stats import records_from_counts
 
 # --------------------------------------------------------------------------------------
 # 1. 경로 및 설정
@@ -17,151 +25,234 @@ DATA_DIR = os.path.join(BASE_DIR, 'simulation', 'data')
 OUTPUT_DIR = os.path.join(BASE_DIR, 'analysis', 'data')
 OUTPUT_FILE = os.path.join(OUTPUT_DIR, 'pitcher_meta_matrix.json')
 
+# 조건별 히트맵 조회용 선발 등판 배열: analysis/data/pitcher_starters.npz
+# (연도, 팀, 홈 여부, IP, 실점, 승리, 경기 id) 정수 배열 - 웹에서 메모리에 올려두고 연도/팀/홈·원정으로 다시 집계
+APPEARANCES_FILE = os.path.join(OUTPUT_DIR, 'pitcher_starters.npz')
+APPEARANCE_COLUMNS = ['year', 'team', 'is_home', 'ip', 'runs', 'win', 'game_pk']
+
 TARGET_YEARS = range(2016, 2026)
 
+# 시즌을 동시에 처리할 프로세스 수
+MATRIX_WORKERS = os.cpu_count() or 1
+
+# 시즌별 중간 집계 캐시: simulation/data/pitcher_matrix_cache/{year}.json
+# 원본 파일 내용(SHA-256)이 바뀐 시즌만 다시 계산합니다.
+CACHE_DIR_NAME = 'pitcher_matrix_cache'
+CACHE_VERSION = 3  # 집계 방식이 바뀌면 올려서 기존 캐시를 무효화
+COUNT_COLUMNS = ['ip', 'runs', 'wins', 'count']
+
 # --------------------------------------------------------------------------------------
 # 2. 헬퍼 함수
 # --------------------------------------------------------------------------------------
-def get_event_outs(event):
-    """Statcast 이벤트 문자열을 아웃 카운트로 변환"""
-    if pd.isna(event): return 0
-    if 'triple_play' in event: return 3
-    if 'double_play' in event or 'grounded_into_double_play' in event: return 2
+def starter_appearances(games):
+    """
+    경기 테이블을 선발 등판 단위(ip, runs, win, year, team, is_home, game_pk)로 펼칩니다. 무승부 경기는 제외합니다.
+    홈팀 선발은 원정팀 점수를, 원정팀 선발은 홈팀 점수를 허용 실점으로 봅니다.
+    """
+    games = games[games['winner'].notna()]
+    parts = []
+    for side in ('home', 'away'):
+        starters = games[games[f'{side}_starter'].notna()]
+        parts.append(pd.DataFrame({
+            'ip': starters[f'{side}_starter_outs'].astype(int) / 3.0,
+            'runs': starters[f'{side}_starter_runs'].astype(int),
+            'win': (starters['winner'] == side).astype(int),
+            'year': starters['game_year'].astype(int),
+            'team': starters[f'{side}_team'],
+            'is_home': int(side == 'home'),
+            'game_pk': starters['game_pk'].astype(int),
+        }))
+    return pd.concat(parts, ignore_index=True)
+
+# --------------------------------------------------------------------------------------
+# 3. 시즌 단위 처리 (시즌마다 별도 프로세스)
+# --------------------------------------------------------------------------------------
+def season_starters(year, data_dir=DATA_DIR):
+    """
+    한 시즌의 선발 등판 데이터(ip, runs, win)와 경기 수를 반환합니다.
+    경기 테이블이 없으면 타석/경기 테이블을 먼저 만듭니다. (시즌 전체를 한 번에 그룹 연산)
+    """
+    loader = StatcastLoader(data_dir, max_workers=1)
+    # 경기 테이블(최종 점수/선발/선발 아웃·실점)에서 정규시즌('R') 경기만 읽기
+    games = loader.load_games(filters=[('game_type', '==', 'R')], years=[year])
+    return starter_appearances(games), int(games['winner'].notna().sum())
+
+
+def filter_starters(starters):
+    """IP를 반올림(ip_int)하고 이상치(1~9이닝, 0~15실점 밖)를 제거합니다."""
+    starters = starters.copy()
+
+    # IP 반올림
+    starters['ip_int'] = starters['ip'].round().astype(int)
     
-    out_events = [
-        'strikeout', 'field_out', 'force_out', 'sac_fly', 'sac_bunt', 
-        'fielders_choice', 'fielders_choice_out', 'strikeout_double_play',
-        'caught_stealing_2b', 'caught_stealing_3b', 'caught_stealing_home',
-        'pickoff_caught_stealing_2b', 'pickoff_caught_stealing_3b', 
-        'pickoff_caught_stealing_home', 'batter_interference'
-    ]
-    if 'strikeout_double_play' in event: return 2
-    if event in out_events: return 1
-    return 0
+    # 이상치 제거
+    starters = starters[(starters['ip_int'] >= 1) & (starters['ip_int'] <= 9)]
+    starters = starters[(starters['runs'] >= 0) & (starters['runs'] <= 15)]
+    return starters
+
+
+def season_counts(starters):
+    """
+    선발 등판 데이터를 (IP, 실점)별 승리 수/표본 수로 집계합니다.
+    행 단위 필터와 합계뿐이라, 시즌별로 집계한 뒤 더해도 전체를 한 번에 집계한 것과 같습니다.
+    """
+    starters = filter_starters(starters)
+    counts = starters.groupby(['ip_int', 'runs'])['win'].agg(wins='sum', count='count').reset_index()
+    return counts.rename(columns={'ip_int': 'ip'})[COUNT_COLUMNS]
+
+
+def season_appearances(starters):
+    """매트릭스 집계에 들어간 선발 등판만 (연도, 팀, 홈 여부, IP, 실점, 승리, 경기 id) 형태로 반환합니다."""
+    starters = filter_starters(starters)
+    return starters.rename(columns={'ip': 'ip_raw', 'ip_int': 'ip'})[APPEARANCE_COLUMNS].reset_index(drop=True)
+
+
+def season_partial(year, data_dir=DATA_DIR):
+    """한 시즌의 중간 집계 결과: ((IP, 실점)별 승리/표본 수, 선발 등판 수, 경기 수, 선발 등판 배열)"""
+    starters, game_count = season_starters(year, data_dir)
+    return season_counts(starters), len(starters), game_count, season_appearances(starters)
+
+
+def iter_season_starters(years, workers=MATRIX_WORKERS, data_dir=DATA_DIR, fn=season_starters):
+    """
+    시즌별 fn(year, data_dir) 결과를 years 순서대로 (year, 결과 또는 예외)로 반환합니다.
+    workers > 1이면 시즌마다 별도 프로세스에서 동시에 처리합니다. (pandas 연산은 GIL을 풀지 않으므로 프로세스 사용)
+    """
+    if workers <= 1 or len(years) <= 1:
+        for year in years:
+            try:
+                yield year, fn(year, data_dir)
+            except Exception as e:
+                yield year, e
+        return
+
+    with ProcessPoolExecutor(max_workers=min(workers, len(years))) as executor:
+        futures = [(year, executor.submit(fn, year, data_dir)) for year in years]
+        for year, future in futures:
+            try:
+                yield year, future.result()
+            except Exception as e:
+                yield year, e
+
+
+def matrix_records(df_res):
+    """선발 등판 데이터를 (IP, 실점)별 승률/표본 수 목록으로 집계합니다."""
+    return records_from_counts(season_counts(df_res))
+
+# --------------------------------------------------------------------------------------
+# 4. 시즌별 중간 집계 캐시
+# --------------------------------------------------------------------------------------
+def _cache_path(data_dir, year):
+    return os.path.join(data_dir, CACHE_DIR_NAME, f"{year}.json")
+
+
+def load_cached_partial(loader, year, sources):
+    """원본 서명이 그대로인 시즌의 캐시된 중간 집계를 반환합니다. (없거나 바뀌었으면 None)"""
+    path = _cache_path(loader.data_dir, year)
+    if not os.path.exists(path):
+        return None
+    with open(path, 'r', encoding='utf-8') as f:
+        cached = json.load(f)
+    if cached.get('version') != CACHE_VERSION or not loader.signature_is_current(path, sources):
+        return None
+    return (pd.DataFrame(cached['counts'], columns=COUNT_COLUMNS), cached['starters'], cached['games'],
+            pd.DataFrame(cached['appearances'], columns=APPEARANCE_COLUMNS))
+
+
+def save_partial(loader, year, sources, partial):
+    counts, starter_count, game_count, appearances = partial
+    path = _cache_path(loader.data_dir, year)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump({
+            'version': CACHE_VERSION,
+            'year': year,
+            'sources': loader.source_signature(sources),
+            'starters': starter_count,
+            'games': game_count,
+            'counts': counts.astype(int).values.tolist(),
+            'appearances': appearances.values.tolist(),
+        }, f)
+    os.replace(tmp_path, path)
 
 # --------------------------------------------------------------------------------------
-# 3. 메인 로직
+# 5. 메인 로직
 # --------------------------------------------------------------------------------------
-def build_matrix():
+def save_appearances(appearances, path=APPEARANCES_FILE):
+    """선발 등판 배열을 팀 코드로 압축해서 npz로 저장합니다. (팀 이름 목록은 teams 배열)"""
+    teams, team_codes = np.unique(appearances['team'].astype(str).to_numpy(), return_inverse=True)
+    arrays = {
+        'year': appearances['year'].to_numpy(np.int16),
+        'team': team_codes.astype(np.int8),
+        'is_home': appearances['is_home'].to_numpy(np.int8),
+        'ip': appearances['ip'].to_numpy(np.int8),
+        'runs': appearances['runs'].to_numpy(np.int8),
+        'win': appearances['win'].to_numpy(np.int8),
+        'game_pk': appearances['game_pk'].to_numpy(np.int32),
+    }
+
+    tmp_path = f"{path}.{os.getpid()}.tmp.npz"
+    np.savez_compressed(tmp_path, teams=teams.astype(str), **arrays)
+    os.replace(tmp_path, path)
+
+
+def build_matrix(workers=MATRIX_WORKERS, use_cache=True):
     print(f"📂 데이터 경로: {DATA_DIR}")
     print("⚾ 선발 투수 승리 확률 매트릭스 생성 시작 (2016-2025)...")
     
-    all_starters_data = []
+    loader = StatcastLoader(DATA_DIR)
+    available_years = set(loader.available_years())
 
+    years = []
     for year in TARGET_YEARS:
-        file_name = f"statcast_{year}.parquet"
-        file_path = os.path.join(DATA_DIR, file_name)
-        
-        if not os.path.exists(file_path):
+        if year not in available_years:
             print(f"⚠️  [Skip] {year}년 데이터 파일 없음")
             continue
-            
-        print(f"   -> {year}년 데이터 로드 및 분석 중...", end=" ")
-        
-        try:
-            # [수정] 정렬을 위해 'at_bat_number', 'pitch_number' 추가
-            columns = [
-                'game_pk', 'game_type', 'inning', 'inning_topbot', 
-                'events', 'pitcher', 'post_away_score', 'post_home_score',
-                'at_bat_number', 'pitch_number'
-            ]
-            
-            # 일부 컬럼이 없을 경우를 대비해 안전하게 읽기 (try-except 보완 필요 시 사용)
-            df = pd.read_parquet(file_path, columns=columns)
-            
-            # 정규시즌('R') 필터링
-            if 'game_type' in df.columns:
-                df = df[df['game_type'] == 'R']
-            
-            # 게임별 그룹화
-            grouped = df.groupby('game_pk')
-            game_count = 0
-            
-            for game_pk, game in grouped:
-                # [핵심 수정] 데이터를 타석/투구 순서대로 정렬 (과거 -> 미래)
-                # 데이터가 역순으로 저장된 경우를 바로잡음
-                if 'at_bat_number' in game.columns and 'pitch_number' in game.columns:
-                    game = game.sort_values(by=['at_bat_number', 'pitch_number'], ascending=[True, True])
-                
-                # A. 경기 결과 확인 (이제 iloc[-1]은 진짜 경기 끝!)
-                last_row = game.iloc[-1]
-                final_home = last_row['post_home_score']
-                final_away = last_row['post_away_score']
-                
-                if final_home == final_away: continue # 무승부 제외
-
-                is_home_win = final_home > final_away
-
-                # B. 선발 투수 식별
-                top_1st = game[(game['inning'] == 1) & (game['inning_topbot'] == 'Top')]
-                bot_1st = game[(game['inning'] == 1) & (game['inning_topbot'] == 'Bot')]
-
-                # 1) 홈팀 선발 (Top 1st 수비)
-                if not top_1st.empty:
-                    starter_id = top_1st.iloc[0]['pitcher']
-                    p_events = game[game['pitcher'] == starter_id]
-                    
-                    outs = p_events['events'].apply(get_event_outs).sum()
-                    ip = outs / 3.0
-                    runs_allowed = p_events['post_away_score'].max()
-                    
-                    all_starters_data.append({
-                        'ip': ip,
-                        'runs': int(runs_allowed),
-                        'win': 1 if is_home_win else 0
-                    })
-
-                # 2) 원정팀 선발 (Bot 1st 수비)
-                if not bot_1st.empty:
-                    starter_id = bot_1st.iloc[0]['pitcher']
-                    p_events = game[game['pitcher'] == starter_id]
-                    
-                    outs = p_events['events'].apply(get_event_outs).sum()
-                    ip = outs / 3.0
-                    runs_allowed = p_events['post_home_score'].max()
-                    
-                    all_starters_data.append({
-                        'ip': ip,
-                        'runs': int(runs_allowed),
-                        'win': 0 if is_home_win else 1
-                    })
-                
-                game_count += 1
-            
-            print(f"완료 ({game_count}경기)")
-
-        except Exception as e:
-            print(f"\n❌ [Error] {year}년 처리 중 오류: {e}")
+        years.append(year)
+
+    # 원본이 바뀌지 않은 시즌은 캐시된 중간 집계를 그대로 사용
+    sources = loader.year_sources(years)
+    partials = {}
+    for year in years:
+        cached = load_cached_partial(loader, year, sources[year]) if use_cache else None
+        if cached is not None:
+            partials[year] = cached
+
+    stale = [year for year in years if year not in partials]
+    if partials:
+        print(f"   -> ♻️ 캐시 사용: {sorted(partials)}")
+    if stale:
+        print(f"   -> {len(stale)}개 시즌 다시 계산 중... (프로세스 {max(1, min(workers, len(stale)))}개)")
+
+    for year, result in iter_season_starters(stale, workers, fn=season_partial):
+        if isinstance(result, Exception):
+            print(f"❌ [Error] {year}년 처리 중 오류: {result}")
+            continue
+        partials[year] = result
+        save_partial(loader, year, sources[year], result)
+
+    for year in years:
+        if year in partials:
+            print(f"   -> {year}년 완료 ({partials[year][2]}경기)")
 
     # --------------------------------------------------------------------------------------
-    # 4. 집계 및 저장
+    # 6. 집계 및 저장 (시즌별 승리/표본 수 합산)
     # --------------------------------------------------------------------------------------
-    if not all_starters_data:
+    if not partials:
         print("❌ 분석된 데이터가 없습니다.")
         return
 
-    print(f"\n📊 총 {len(all_starters_data):,}명의 선발 등판 데이터 분석 완료.")
-    
-    df_res = pd.DataFrame(all_starters_data)
-    
-    # IP 반올림
-    df_res['ip_int'] = df_res['ip'].round().astype(int)
-    
-    # 이상치 제거
-    df_res = df_res[(df_res['ip_int'] >= 1) & (df_res['ip_int'] <= 9)]
-    df_res = df_res[(df_res['runs'] >= 0) & (df_res['runs'] <= 15)]
+    counts = pd.concat([partials[year][0] for year in years if year in partials], ignore_index=True)
+    starter_total = sum(partials[year][1] for year in partials)
+    if starter_total == 0:
+        print("❌ 분석된 데이터가 없습니다.")
+        return
 
-    # 승률 계산
-    matrix = df_res.groupby(['ip_int', 'runs'])['win'].agg(['mean', 'count']).reset_index()
+    print(f"\n📊 총 {starter_total:,}명의 선발 등판 데이터 분석 완료.")
     
-    output_data = []
-    for _, row in matrix.iterrows():
-        output_data.append({
-            'ip': int(row['ip_int']),
-            'runs': int(row['runs']),
-            'win_rate': round(row['mean'] * 100, 1),
-            'sample_size': int(row['count'])
-        })
+    output_data = records_from_counts(counts)
     
     os.makedirs(OUTPUT_DIR, exist_ok=True)
     with open(OUTPUT_FILE, 'w', encoding='utf-8') as f:
@@ -169,5 +260,9 @@ def build_matrix():
         
     print(f"✅ 결과 파일 저장 완료: {OUTPUT_FILE}")
 
+    appearances = pd.concat([partials[year][3] for year in years if year in partials], ignore_index=True)
+    save_appearances(appearances)
+    print(f"✅ 선발 등판 배열 저장 완료: {APPEARANCES_FILE} ({len(appearances):,}건)")
+
 if __name__ == "__main__":
-    build_matrix()
\ No newline at end of file
+    build_matrix()
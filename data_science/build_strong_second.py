@@ -1,7 +1,12 @@
 # data_science/build_strong_second.py
 import pandas as pd
 import os
+import sys
 import json
+from concurrent.futures import ProcessPoolExecutor
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from data_loader import file_sha256
 
 # --------------------------------------------------------------------------------------
 # 1. 경로 설정
@@ -13,94 +18,219 @@ OUTPUT_FILE = os.path.join(DATA_DIR, 'strong_second_data.json')
 
 TARGET_YEARS = list(range(2016, 2026))
 
-def build_strong_second_data():
+SUFFIXES = {1: '1st', 2: '2nd', 3: '3rd', 4: '4th',
+            5: '5th', 6: '6th', 7: '7th', 8: '8th', 9: '9th'}
+SOURCE_KINDS = ['batting_order', 'frequency']
+
+# 연도 폴더를 동시에 처리할 프로세스 수
+BUILD_WORKERS = os.cpu_count() or 1
+
+# 연도 폴더별 중간 결과 캐시: analysis/data/strong_second_cache/{year}.json
+# 폴더 안 CSV 내용(SHA-256)이 바뀐 연도만 다시 읽습니다.
+CACHE_DIR_NAME = 'strong_second_cache'
+CACHE_VERSION = 1  # 구조화 방식이 바뀌면 올려서 기존 캐시를 무효화
+
+PLAYER_COLUMNS = ['Tm', 'PlayerName', 'PlayerPA', 'PlayerOPS', 'PlayerWRC']
+
+# --------------------------------------------------------------------------------------
+# 2. 헬퍼 함수
+# --------------------------------------------------------------------------------------
+def _source_path(data_dir, kind, year, suffix):
+    return os.path.join(data_dir, kind, str(year), f"Splits Leaderboard Data Batting {suffix}.csv")
+
+
+def year_sources(year, data_dir=DATA_DIR):
+    """연도 폴더의 (타순, 성적 CSV, 빈도 CSV) 목록. 두 파일이 모두 있는 타순만 포함합니다."""
+    sources = []
+    for order, suffix in SUFFIXES.items():
+        stats_path, freq_path = (_source_path(data_dir, kind, year, suffix) for kind in SOURCE_KINDS)
+        if os.path.exists(stats_path) and os.path.exists(freq_path):
+            sources.append((order, stats_path, freq_path))
+    return sources
+
+
+def source_hashes(year, data_dir=DATA_DIR):
+    """연도 폴더의 원본 CSV별 SHA-256 (data_dir 기준 상대 경로 -> 해시). 캐시의 키로 기록합니다."""
+    return {os.path.relpath(path, data_dir): file_sha256(path)
+            for _, stats_path, freq_path in year_sources(year, data_dir) for path in (stats_path, freq_path)}
+
+
+def _read_splits(path):
+    df = pd.read_csv(path, encoding='utf-8-sig')
+    df.columns = df.columns.str.strip()
+    return df
+
+
+def representative_players(df_freq):
+    """팀별로 타석(PA)이 가장 많은 선수 한 명 (Tm, PlayerName, PlayerPA, PlayerOPS, PlayerWRC)"""
+    if df_freq.empty or 'PA' not in df_freq.columns:
+        return pd.DataFrame(columns=PLAYER_COLUMNS)
+    df_rep = df_freq.sort_values(by='PA', ascending=False).drop_duplicates(subset=['Tm'], keep='first')
+    rename_map = {'Name': 'PlayerName', 'PA': 'PlayerPA', 'OPS': 'PlayerOPS', 'wRC+': 'PlayerWRC'}
+    return df_rep.rename(columns={k: v for k, v in rename_map.items() if k in df_rep.columns})
+
+
+def order_entries(merged_df, order):
+    """
+    팀 성적 + 대표 선수 병합 결과를 [팀, 시즌, 타순, 항목] 목록으로 바꿉니다.  (행 단위 iterrows 대신)
+    항목 값은 컬럼 단위로 한 번에 계산하고, 없는 컬럼/병합되지 않은 선수 값은 기본값(0, "Unknown")으로 채웁니다.
+    """
+    if merged_df.empty:
+        return []
+    seasons = merged_df['Season'].astype(int)
+    in_target = seasons.isin(TARGET_YEARS)
+    merged_df, seasons = merged_df[in_target], seasons[in_target]
+
+    def column(name, default):
+        return merged_df[name] if name in merged_df.columns else pd.Series(default, index=merged_df.index)
+
+    values = pd.DataFrame({
+        'team_ops': merged_df['OPS'].round(3),
+        'team_wrc': column('wRC+', 0.0).round(1),
+        'team_pa': column('PA', 0).astype(int),
+        'player_name': column('PlayerName', None).fillna("Unknown"),
+        'player_pa': column('PlayerPA', float('nan')).fillna(0).astype(int),
+        'player_ops': column('PlayerOPS', float('nan')).round(3).fillna(0.0),
+        'player_wrc': column('PlayerWRC', float('nan')).round(1).fillna(0.0),
+    }, index=merged_df.index)
+    return [[team, season, order, payload] for team, season, payload
+            in zip(merged_df['Tm'].tolist(), seasons.tolist(), values.to_dict('records'))]
+
+
+def process_year(year, data_dir=DATA_DIR):
+    """
+    연도 폴더 하나의 타순별 CSV를 읽어 구조화에 필요한 중간 결과를 만듭니다.
+    - entries: [팀, 시즌, 타순, 항목] (파일/행 순서 그대로 - 합칠 때 뒤의 값이 앞의 값을 덮어씀)
+    - averages: [파일 시즌, 타순, {'ops', 'wrc_plus'}]
+    - errors: 처리하지 못한 타순별 오류 메시지
+    """
+    result = {'entries': [], 'averages': [], 'errors': []}
+    for order, stats_path, freq_path in year_sources(year, data_dir):
+        try:
+            df_stats = _read_splits(stats_path)
+            df_freq = _read_splits(freq_path)
+
+            for col in ['OPS', 'wRC+', 'PA', 'Season']:
+                if col in df_stats.columns:
+                    df_stats[col] = pd.to_numeric(df_stats[col], errors='coerce').fillna(0)
+            for col in ['PA', 'OPS', 'wRC+']:
+                if col in df_freq.columns:
+                    df_freq[col] = pd.to_numeric(df_freq[col], errors='coerce').fillna(0)
+
+            df_rep = representative_players(df_freq)
+            player_cols = [c for c in PLAYER_COLUMNS if c in df_rep.columns]
+            merged_df = pd.merge(df_stats, df_rep[player_cols], on='Tm', how='left')
+
+            entries = order_entries(merged_df, order)
+            averages = []
+            if not df_stats.empty:
+                current_file_year = int(df_stats['Season'].mode()[0])
+                if current_file_year in TARGET_YEARS:
+                    averages.append([current_file_year, order, {
+                        'ops': round(df_stats['OPS'].mean(), 3),
+                        'wrc_plus': round(df_stats['wRC+'].mean(), 1) if 'wRC+' in df_stats.columns else 0.0
+                    }])
+            result['entries'].extend(entries)
+            result['averages'].extend(averages)
+
+        except Exception as e:
+            result['errors'].append(f"{order}순 처리 중: {e}")
+    return result
+
+
+def iter_years(years, workers=BUILD_WORKERS, data_dir=DATA_DIR):
+    """
+    연도별 process_year 결과를 years 순서대로 (year, 결과 또는 예외)로 반환합니다.
+    workers > 1이면 연도마다 별도 프로세스에서 CSV 파싱/병합을 동시에 처리합니다.
+    """
+    if workers <= 1 or len(years) <= 1:
+        for year in years:
+            try:
+                yield year, process_year(year, data_dir)
+            except Exception as e:
+                yield year, e
+        return
+
+    with ProcessPoolExecutor(max_workers=min(workers, len(years))) as executor:
+        futures = [(year, executor.submit(process_year, year, data_dir)) for year in years]
+        for year, future in futures:
+            try:
+                yield year, future.result()
+            except Exception as e:
+                yield year, e
+
+# --------------------------------------------------------------------------------------
+# 3. 연도별 중간 결과 캐시
+# --------------------------------------------------------------------------------------
+def _cache_path(data_dir, year):
+    return os.path.join(data_dir, CACHE_DIR_NAME, f"{year}.json")
+
+
+def load_cached_year(year, hashes, data_dir=DATA_DIR):
+    """원본 CSV 해시가 그대로인 연도의 캐시된 중간 결과를 반환합니다. (없거나 바뀌었으면 None)"""
+    path = _cache_path(data_dir, year)
+    if not os.path.exists(path):
+        return None
+    with open(path, 'r', encoding='utf-8') as f:
+        cached = json.load(f)
+    if cached.get('version') != CACHE_VERSION or cached.get('sources') != hashes:
+        return None
+    return cached['result']
+
+
+def save_year(year, hashes, result, data_dir=DATA_DIR):
+    path = _cache_path(data_dir, year)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump({'version': CACHE_VERSION, 'year': year, 'sources': hashes, 'result': result}, f)
+    os.replace(tmp_path, path)
+
+# --------------------------------------------------------------------------------------
+# 4. 메인 로직
+# --------------------------------------------------------------------------------------
+def build_strong_second_data(workers=BUILD_WORKERS, use_cache=True):
     print("⚾ 강한 2번 타자 데이터 생성 시작...")
-    
+
+    # 원본 CSV가 바뀌지 않은 연도는 캐시된 중간 결과를 그대로 사용
+    hashes = {year: source_hashes(year, DATA_DIR) for year in TARGET_YEARS}
+    results = {}
+    for year in TARGET_YEARS:
+        cached = load_cached_year(year, hashes[year], DATA_DIR) if use_cache else None
+        if cached is not None:
+            results[year] = cached
+
+    stale = [year for year in TARGET_YEARS if year not in results]
+    if results:
+        print(f"   -> ♻️ 캐시 사용: {sorted(results)}")
+    if stale:
+        print(f"   -> {len(stale)}개 연도 다시 처리 중... (프로세스 {max(1, min(workers, len(stale)))}개)")
+
+    for year, result in iter_years(stale, workers, DATA_DIR):
+        if isinstance(result, Exception):
+            print(f"[Error] {year}년 처리 중: {result}")
+            continue
+        results[year] = result
+        save_year(year, hashes[year], result, DATA_DIR)
+
+    # 연도 폴더 -> 타순 -> 행 순서대로 채워서 팀/시즌/타순 키 순서를 기존과 같게 유지
     mlb_data = {}
     mlb_teams_set = set()
     avg_data = {y: {} for y in TARGET_YEARS}
 
-    suffixes = {1: '1st', 2: '2nd', 3: '3rd', 4: '4th', 
-                5: '5th', 6: '6th', 7: '7th', 8: '8th', 9: '9th'}
-    
-    # 데이터 처리 로직 (views.py에서 가져옴)
     for folder_year in TARGET_YEARS:
+        if folder_year not in results:
+            continue
         print(f"   -> {folder_year}년 데이터 처리 중...")
-        for order, suffix in suffixes.items():
-            filename = f"Splits Leaderboard Data Batting {suffix}.csv"
-            stats_path = os.path.join(DATA_DIR, 'batting_order', str(folder_year), filename)
-            freq_path = os.path.join(DATA_DIR, 'frequency', str(folder_year), filename)
-
-            if not os.path.exists(stats_path) or not os.path.exists(freq_path):
-                continue
-
-            try:
-                # (1) 데이터 로드
-                df_stats = pd.read_csv(stats_path, encoding='utf-8-sig')
-                df_stats.columns = df_stats.columns.str.strip()
-
-                df_freq = pd.read_csv(freq_path, encoding='utf-8-sig')
-                df_freq.columns = df_freq.columns.str.strip()
-
-                # (2) 전처리
-                for col in ['OPS', 'wRC+', 'PA', 'Season']:
-                    if col in df_stats.columns:
-                        df_stats[col] = pd.to_numeric(df_stats[col], errors='coerce').fillna(0)
-                
-                for col in ['PA', 'OPS', 'wRC+']:
-                    if col in df_freq.columns:
-                        df_freq[col] = pd.to_numeric(df_freq[col], errors='coerce').fillna(0)
-
-                # (3) 대표 선수 추출
-                if not df_freq.empty and 'PA' in df_freq.columns:
-                    df_freq = df_freq.sort_values(by='PA', ascending=False)
-                    df_rep = df_freq.drop_duplicates(subset=['Tm'], keep='first').copy()
-                    
-                    rename_map = {'Name': 'PlayerName', 'PA': 'PlayerPA', 'OPS': 'PlayerOPS', 'wRC+': 'PlayerWRC'}
-                    rename_cols = {k: v for k, v in rename_map.items() if k in df_rep.columns}
-                    df_rep = df_rep.rename(columns=rename_cols)
-                else:
-                    df_rep = pd.DataFrame(columns=['Tm', 'PlayerName', 'PlayerPA', 'PlayerOPS', 'PlayerWRC'])
-
-                # (4) 병합
-                player_cols = [c for c in ['Tm', 'PlayerName', 'PlayerPA', 'PlayerOPS', 'PlayerWRC'] if c in df_rep.columns]
-                merged_df = pd.merge(df_stats, df_rep[player_cols], on='Tm', how='left')
-
-                # (5) 딕셔너리 구조화
-                for _, row in merged_df.iterrows():
-                    team = row['Tm']
-                    real_year = int(row['Season'])
-                    
-                    if real_year not in TARGET_YEARS: continue
-
-                    if team not in mlb_data: mlb_data[team] = {}
-                    if real_year not in mlb_data[team]: mlb_data[team][real_year] = {}
-                    
-                    mlb_data[team][real_year][order] = {
-                        'team_ops': round(row['OPS'], 3),
-                        'team_wrc': round(row['wRC+'], 1) if 'wRC+' in row else 0.0,
-                        'team_pa': int(row['PA']) if 'PA' in row else 0,
-                        'player_name': row['PlayerName'] if pd.notna(row.get('PlayerName')) else "Unknown",
-                        'player_pa': int(row['PlayerPA']) if pd.notna(row.get('PlayerPA')) else 0,
-                        'player_ops': round(row['PlayerOPS'], 3) if pd.notna(row.get('PlayerOPS')) else 0.000,
-                        'player_wrc': round(row['PlayerWRC'], 1) if pd.notna(row.get('PlayerWRC')) else 0.0
-                    }
-                    mlb_teams_set.add(team)
-
-                # (6) 평균 데이터
-                if not df_stats.empty:
-                    current_file_year = int(df_stats['Season'].mode()[0])
-                    if current_file_year in TARGET_YEARS:
-                        if order not in avg_data[current_file_year]:
-                            avg_data[current_file_year][order] = {}
-                        
-                        avg_data[current_file_year][order] = {
-                            'ops': round(df_stats['OPS'].mean(), 3),
-                            'wrc_plus': round(df_stats['wRC+'].mean(), 1) if 'wRC+' in df_stats.columns else 0.0
-                        }
-
-            except Exception as e:
-                print(f"[Error] {folder_year}년 {order}순 처리 중: {e}")
+        result = results[folder_year]
+        for error in result['errors']:
+            print(f"[Error] {folder_year}년 {error}")
+        for team, real_year, order, payload in result['entries']:
+            mlb_data.setdefault(team, {}).setdefault(real_year, {})[order] = payload
+            mlb_teams_set.add(team)
+        for file_year, order, averages in result['averages']:
+            avg_data[file_year][order] = averages
 
     # (7) 결과 저장
     output_data = {
@@ -116,4 +246,4 @@ def build_strong_second_data():
     print(f"✅ 데이터 생성 완료: {OUTPUT_FILE}")
 
 if __name__ == "__main__":
-    build_strong_second_data()
\ No newline at end of file
+    build_strong_second_data()
@@ -2,154 +2,312 @@ import pandas as pd
 import numpy as np
 import os
 import sys
+import json
+import argparse
 
 # 경로 설정
 current_dir = os.path.dirname(os.path.abspath(__file__))
 sys.path.append(current_dir)
 from data_loader import StatcastLoader
+from player_dim import season_key
+from event_lookup import classify_descriptions, classify_events
+from stabilization_engine import player_codes, run_stat_curves, closed_form_curve
 
-def get_slg_value(event):
-    """장타율 계산을 위한 루타 수 매핑"""
-    if event == 'single': return 1
-    elif event == 'double': return 2
-    elif event == 'triple': return 3
-    elif event == 'home_run': return 4
-    return 0
+# 투구 단위로 계산하는 스탯(스윙/컨택)에 필요한 컬럼만 읽음 (전체 컬럼 대비 메모리/IO 대폭 절감)
+STAT_COLUMNS = ['game_date', 'pitcher', 'description']
 
-def calculate_correlations():
-    loader = StatcastLoader()
-    df = loader.load_all_years()
+# 나머지 스탯은 타석(PA) 테이블에서 계산 (투구 단위 대비 약 1/4 행, 결과 플래그가 미리 계산되어 있음)
+PA_STAT_COLUMNS = ['game_year', 'pitcher', 'events', 'bb_type', 'pitch_index',
+                   'is_k', 'is_bb', 'is_1b', 'is_hr', 'is_hit', 'is_onbase', 'is_batted', 'total_bases']
+
+# 투구 단위 데이터에서 계산하는 스탯 컬럼
+PITCH_LEVEL_STATS = ['is_swing', 'is_contact']
+
+# 스탯별 계산을 나눠 맡을 프로세스 수 (1이면 현재 프로세스에서 순서대로)
+STAT_WORKERS = os.cpu_count() or 1
+
+# 구간 설정 (50 ~ 600)
+THRESHOLDS = range(50, 601, 50)
+
+# 폐쇄형(closed-form) 추정용 선수-시즌 집계 캐시: simulation/data/player_season_totals/totals_{year}.parquet
+TOTALS_DIR_NAME = 'player_season_totals'
+TOTALS_VERSION = 1  # 집계 방식/스탯 정의가 바뀌면 올려서 기존 캐시를 무효화
+
+# ---------------------------------------------------------
+# 분석할 스탯 정의 (카테고리 분류)
+# ---------------------------------------------------------
+# 형식: {'표시이름': ('컬럼명', '조건필터_컬럼')}
+# 조건필터가 None이면 전체 데이터 대상
+
+STATS_MAP = {
+    'Offense': {
+        'Swing%': ('is_swing', None), # 전체 투구 중 스윙 비율
+        'Contact%': ('is_contact', 'is_swing'), # 스윙 중 컨택 비율
+        'Strikeout Rate': ('is_k', 'events_exist'), # 타석당 삼진
+        'Walk Rate': ('is_bb', 'events_exist'),     # 타석당 볼넷
+        'Home Run Rate': ('is_hr', 'events_exist'), # 타석당 홈런
+        'AVG': ('is_hit', 'ab_flag'), # 타수당 안타 (약식: events 있으면 타수로 가정)
+        'OBP': ('is_onbase', 'events_exist'),
+        'SLG': ('total_bases', 'ab_flag'),
+        'ISO': ('total_bases', 'ab_flag'), # ISO는 SLG - AVG 이지만 여기선 SLG랑 비슷하게 추이 봄
+        'Line Drive%': ('is_ld', 'is_batted'), # 타구 중 라인드라이브
+        'Ground Ball%': ('is_gb', 'is_batted'),
+        'Fly Ball%': ('is_fb', 'is_batted'),
+        'Popup%': ('is_popup', 'is_batted'),
+    },
+    'Pitching': {
+        # 투수 입장은 타자와 동일한 로직이지만 'Player'가 투수여야 함 (선수-시즌 키가 pitcher id 기반)
+        'K/PA': ('is_k', 'events_exist'),
+        'BB/PA': ('is_bb', 'events_exist'),
+        'HR/PA': ('is_hr', 'events_exist'),
+        'GB%': ('is_gb', 'is_batted'),
+        'FB%': ('is_fb', 'is_batted'),
+    }
+}
+
+
+def add_derived_columns(df, pa_df):
+    """
+    파생 변수 생성 (Statcast -> 야구 지표 매핑)
+    df: 투구 단위 (description 필요) / pa_df: 타석 단위 (events, bb_type 필요)
+    """
+    # (1) 스윙/컨택 관련 (description 컬럼 활용, 투구 단위 - 공용 분류표로 한 번에 계산)
+    swing_flags = classify_descriptions(df['description'], ['is_swing', 'is_contact'])
+    df['is_swing'] = swing_flags['is_swing']
+    df['is_contact'] = swing_flags['is_contact'] # 분모는 Swing일 때만 써야 함
+    
+    # (2) 타구질 관련 (bb_type 활용, 타구는 타석 결과가 나온 투구에서만 발생)
+    pa_df['is_gb'] = (pa_df['bb_type'] == 'ground_ball').astype(int)
+    pa_df['is_ld'] = (pa_df['bb_type'] == 'line_drive').astype(int)
+    pa_df['is_fb'] = (pa_df['bb_type'] == 'fly_ball').astype(int)
+    pa_df['is_popup'] = (pa_df['bb_type'] == 'popup').astype(int)
+    
+    # (3) 결과 관련 / (4) AVG, OBP, SLG용 플래그는 타석 테이블에 이미 있음
+    #     is_k, is_bb, is_1b, is_hr, is_hit, is_onbase, total_bases(0, 1, 2, 3, 4)
+
+    # 필터용 플래그 생성 (타구 발생 여부 is_batted는 타석 테이블에 있음)
+    pa_df['events_exist'] = True # 타석 테이블은 모두 타석 결과가 있는 행 (PA)
+    pa_df['ab_flag'] = classify_events(pa_df['events'], ['is_ab_approx'])['is_ab_approx'] == 1 # 대략적 AB
+
+
+def stat_source(val_col):
+    """스윙/컨택은 투구 단위('pitch'), 나머지는 타석 단위('pa') 데이터 사용"""
+    return 'pitch' if val_col in PITCH_LEVEL_STATS else 'pa'
+
+
+def calculate_correlations(compact=False, workers=STAT_WORKERS, resamples=0):
+    """
+    스탯별/기준 타석별 반분 신뢰도(스피어만-브라운 보정)를 계산해 stabilization_results_v2.csv로 저장합니다.
+    resamples > 0이면 홀짝 분할 한 번 대신 무작위 반분을 resamples번 반복해서
+    correlation에 보정 신뢰도 평균을, ci_low / ci_high에 95% 구간을 기록합니다.
+    """
+    # 반복 실행되는 분석이므로 Arrow IPC 캐시 사용 (두 번째 실행부터 디코딩 없이 메모리 매핑)
+    loader = StatcastLoader(use_cache=True)
+    df = loader.load_all_years(columns=STAT_COLUMNS, compact=compact)
     
     if df is None: return
 
+    pa_df = loader.load_pa(columns=PA_STAT_COLUMNS, compact=compact)
+
     print("🚀 고급 스탯 신뢰도 분석 시작 (MLB Statcast)...")
 
     # 1. 기본 전처리
     df['year'] = pd.to_datetime(df['game_date']).dt.year
-    df['player_season_id'] = df['player_name'] + "_" + df['year'].astype(str)
+    # 선수-시즌 키: 이름 문자열 결합 대신 MLBAM id와 연도로 만든 정수 키 (player_name은 투수 이름이므로 pitcher id 사용)
+    df['player_season_id'] = season_key(df['pitcher'], df['year'])
+    pa_df['player_season_id'] = season_key(pa_df['pitcher'], pa_df['game_year'])
     
-    # 반분 신뢰도용 그룹 (홀수/짝수)
-    df['group'] = np.where(df.index % 2 == 0, 'A', 'B')
+    # 반분 신뢰도용 그룹 (짝수 행 A=0 / 홀수 행 B=1)
+    df['group'] = (df.index % 2).astype(np.int8)
 
-    # ---------------------------------------------------------
-    # 2. 파생 변수 생성 (Statcast -> 야구 지표 매핑)
-    # ---------------------------------------------------------
-    
-    # (1) 스윙/컨택 관련 (description 컬럼 활용)
-    swings = ['foul', 'foul_bunt', 'foul_tip', 'hit_into_play', 'swinging_strike', 'swinging_strike_blocked', 'missed_bunt']
-    contacts = ['foul', 'foul_bunt', 'foul_tip', 'hit_into_play']
-    
-    df['is_swing'] = df['description'].isin(swings).astype(int)
-    df['is_contact'] = df['description'].isin(contacts).astype(int) # 분모는 Swing일 때만 써야 함
-    
-    # (2) 타구질 관련 (bb_type 활용)
-    df['is_gb'] = (df['bb_type'] == 'ground_ball').astype(int)
-    df['is_ld'] = (df['bb_type'] == 'line_drive').astype(int)
-    df['is_fb'] = (df['bb_type'] == 'fly_ball').astype(int)
-    df['is_popup'] = (df['bb_type'] == 'popup').astype(int)
-    
-    # (3) 결과 관련 (events 활용)
-    df['is_k'] = df['events'].isin(['strikeout', 'strikeout_double_play']).astype(int)
-    df['is_bb'] = df['events'].isin(['walk']).astype(int)
-    df['is_1b'] = (df['events'] == 'single').astype(int)
-    df['is_hr'] = (df['events'] == 'home_run').astype(int)
-    
-    # (4) AVG, OBP, SLG용
-    df['is_hit'] = df['events'].isin(['single', 'double', 'triple', 'home_run']).astype(int)
-    df['is_onbase'] = df['events'].isin(['single', 'double', 'triple', 'home_run', 'walk', 'hit_by_pitch']).astype(int)
-    df['slg_val'] = df['events'].apply(get_slg_value) # 0, 1, 2, 3, 4
-
-    # ---------------------------------------------------------
-    # 3. 분석할 스탯 정의 (카테고리 분류)
-    # ---------------------------------------------------------
-    # 형식: {'표시이름': ('컬럼명', '조건필터_컬럼', '분모_설명')}
-    # 조건필터가 None이면 전체 데이터 대상
-    
-    stats_map = {
-        'Offense': {
-            'Swing%': ('is_swing', None), # 전체 투구 중 스윙 비율
-            'Contact%': ('is_contact', 'is_swing'), # 스윙 중 컨택 비율
-            'Strikeout Rate': ('is_k', 'events_exist'), # 타석당 삼진
-            'Walk Rate': ('is_bb', 'events_exist'),     # 타석당 볼넷
-            'Home Run Rate': ('is_hr', 'events_exist'), # 타석당 홈런
-            'AVG': ('is_hit', 'ab_flag'), # 타수당 안타 (약식: events 있으면 타수로 가정)
-            'OBP': ('is_onbase', 'events_exist'),
-            'SLG': ('slg_val', 'ab_flag'),
-            'ISO': ('slg_val', 'ab_flag'), # ISO는 SLG - AVG 이지만 여기선 SLG랑 비슷하게 추이 봄
-            'Line Drive%': ('is_ld', 'is_batted'), # 타구 중 라인드라이브
-            'Ground Ball%': ('is_gb', 'is_batted'),
-            'Fly Ball%': ('is_fb', 'is_batted'),
-            'Popup%': ('is_popup', 'is_batted'),
-        },
-        'Pitching': {
-            # 투수 입장은 타자와 동일한 로직이지만 'Player'가 투수여야 함 (나중에 그룹핑할 때 처리)
-            'K/PA': ('is_k', 'events_exist'),
-            'BB/PA': ('is_bb', 'events_exist'),
-            'HR/PA': ('is_hr', 'events_exist'),
-            'GB%': ('is_gb', 'is_batted'),
-            'FB%': ('is_fb', 'is_batted'),
-        }
-    }
+    # 타석 행은 원래 투구 단위 데이터에서의 행 위치(연도 시작 위치 + pitch_index)로 같은 짝홀 그룹을 받음
+    year_offsets = pd.Series(df.index, index=df['year'].values).groupby(level=0).min()
+    pa_position = pa_df['game_year'].map(year_offsets).to_numpy() + pa_df['pitch_index'].to_numpy()
+    pa_df['group'] = (pa_position % 2).astype(np.int8)
 
-    # 필터용 플래그 생성
-    df['events_exist'] = df['events'].notnull() # 타석 결과가 있는 경우 (PA)
-    df['is_batted'] = df['bb_type'].notnull()   # 타구가 발생한 경우
-    df['ab_flag'] = df['events'].isin(['single','double','triple','home_run','strikeout','strikeout_double_play','field_out']) # 대략적 AB
+    # 2. 파생 변수 생성 / 필터용 플래그
+    add_derived_columns(df, pa_df)
 
     results = []
-    
-    # 구간 설정 (50 ~ 600)
-    thresholds = range(50, 601, 50)
+    thresholds = THRESHOLDS
 
-    # --- 분석 루프 ---
-    for category, metrics in stats_map.items():
-        # 투수/타자 기준 설정
-        if category == 'Pitching':
-            id_col = 'pitcher_season_id' # 투수 기준 (추가 필요)
-            # 투수 ID 생성
-            df['pitcher_season_id'] = df['player_name'] + "(P)_" + df['year'].astype(str)
-        else:
-            id_col = 'player_season_id' # 타자 기준
+    # 선수(-시즌) 코드는 데이터별로 한 번만 계산 (투수 기준 / 타자 기준 모두 pitcher id 기반 키)
+    sources = {'pitch': df, 'pa': pa_df}
+    codes = {name: player_codes(source['player_season_id']) for name, source in sources.items()}
 
+    # 스탯마다 (데이터, 선수 수, 값 컬럼, 분모 조건) 작업을 만들고, 필요한 컬럼만 배열로 모음
+    # 스윙/컨택은 투구 단위, 나머지는 타석 단위 데이터 사용 (분모 조건이 None이면 전체 투구 대상)
+    tasks, labels = [], []
+    columns = {(name, 'player'): codes[name][0] for name in sources}
+    columns.update({(name, 'group'): sources[name]['group'].to_numpy() for name in sources})
+    for category, metrics in STATS_MAP.items():
         for stat_name, (val_col, filter_col) in metrics.items():
-            print(f"   📊 [{category}] {stat_name} 분석 중...")
-            
-            # 필터링 (분모가 되는 상황만 추출)
-            if filter_col:
-                target_df = df[df[filter_col] == True]
-            else:
-                target_df = df # 전체 투구 대상
-
-            for threshold in thresholds:
-                # 1. 샘플 사이즈 충족하는 선수 찾기
-                counts = target_df.groupby(id_col).size()
-                valid_players = counts[counts >= threshold].index
-                
-                if len(valid_players) < 50: continue # 선수 너무 적으면 패스
-
-                sample = target_df[target_df[id_col].isin(valid_players)]
-
-                # 2. 반분 신뢰도 계산
-                grouped = sample.groupby([id_col, 'group'])[val_col].mean().unstack()
-                grouped = grouped.dropna()
-
-                if len(grouped) > 30:
-                    r = grouped['A'].corr(grouped['B'])
-                    if pd.isna(r): continue
-                    
-                    r_corrected = (2 * r) / (1 + r) # 스피어만-브라운 보정
-                    
-                    results.append({
-                        'category': category,
-                        'stat': stat_name,
-                        'pa': threshold,
-                        'correlation': round(r_corrected, 3)
-                    })
+            name = stat_source(val_col)
+            for col in filter(None, (val_col, filter_col)):
+                columns.setdefault((name, col), sources[name][col].to_numpy())
+            tasks.append((name, codes[name][1], val_col, filter_col, thresholds, resamples))
+            labels.append((category, stat_name))
+
+    # --- 분석 루프 ---
+    # 스탯마다 선수별 반분 합계/개수를 한 번만 구하고, 모든 기준 타석은 선수 배열 위에서 계산
+    # workers > 1이면 컬럼을 공유 메모리에 한 번 올리고 스탯을 프로세스별로 나눠 계산 (결과 순서는 고정)
+    split = f"무작위 반분 {resamples}회" if resamples else "홀짝 반분"
+    print(f"   ⚙️ 스탯 {len(tasks)}개 계산 중... ({split}, 프로세스 {max(1, min(workers, len(tasks)))}개)")
+    curves = run_stat_curves(columns, tasks, workers)
+
+    for (category, stat_name), curve in zip(labels, curves):
+        print(f"   📊 [{category}] {stat_name} 분석 완료 ({len(curve)}개 구간)")
+        for threshold, r_corrected, *band in curve:
+            row = {
+                'category': category,
+                'stat': stat_name,
+                'pa': threshold,
+                'correlation': round(r_corrected, 3)
+            }
+            if band:
+                row['ci_low'], row['ci_high'] = round(band[0], 3), round(band[1], 3)
+            results.append(row)
 
     # 저장
+    save_results(results)
+
+
+def save_results(results):
     output_path = os.path.join(current_dir, 'stabilization_results_v2.csv')
     pd.DataFrame(results).to_csv(output_path, index=False)
     print("✅ 모든 분석 완료! 저장됨:", output_path)
 
+
+# ---------------------------------------------------------
+# 폐쇄형(closed-form) 추정용 선수-시즌 집계
+# ---------------------------------------------------------
+def stat_pairs():
+    """STATS_MAP에 나오는 (값 컬럼, 분모 조건) 조합 (중복 제거, 정의 순서)"""
+    pairs = []
+    for metrics in STATS_MAP.values():
+        for pair in metrics.values():
+            if pair not in pairs:
+                pairs.append(pair)
+    return pairs
+
+
+def season_totals(loader, year):
+    """
+    한 시즌의 선수-시즌별 스탯 집계 (값 컬럼, 분모 조건, 선수-시즌 키, 개수, 합계, 제곱합).
+    한 시즌 데이터만 메모리에 올리고, 결과는 스탯 x 선수 수 정도의 작은 테이블입니다.
+    """
+    df = loader.load(columns=STAT_COLUMNS, years=[year])
+    pa_df = loader.load_pa(columns=PA_STAT_COLUMNS, years=[year])
+    df['player_season_id'] = season_key(df['pitcher'], pd.to_datetime(df['game_date']).dt.year)
+    pa_df['player_season_id'] = season_key(pa_df['pitcher'], pa_df['game_year'])
+    add_derived_columns(df, pa_df)
+
+    sources = {'pitch': df, 'pa': pa_df}
+    codes = {name: pd.factorize(source['player_season_id'], sort=True) for name, source in sources.items()}
+
+    parts = []
+    for val_col, filter_col in stat_pairs():
+        name = stat_source(val_col)
+        source = sources[name]
+        player_code, players = codes[name]
+        values = source[val_col].to_numpy(dtype=np.float64)
+        if filter_col:
+            mask = source[filter_col].to_numpy(dtype=bool)
+            player_code, values = player_code[mask], values[mask]
+
+        n = np.bincount(player_code, minlength=len(players))
+        parts.append(pd.DataFrame({
+            'val_col': val_col,
+            'filter_col': filter_col or '',
+            'player_season_id': np.asarray(players, dtype=np.int64),
+            'n': n,
+            'sum': np.bincount(player_code, weights=values, minlength=len(players)),
+            'sumsq': np.bincount(player_code, weights=values * values, minlength=len(players)),
+        })[n > 0])
+    return pd.concat(parts, ignore_index=True)
+
+
+def _totals_paths(loader, year):
+    totals_dir = os.path.join(loader.data_dir, TOTALS_DIR_NAME)
+    return (os.path.join(totals_dir, f"totals_{year}.parquet"),
+            os.path.join(totals_dir, f"totals_{year}.json"))
+
+
+def load_player_season_totals(loader):
+    """시즌별 선수-시즌 집계를 읽습니다. 없거나 원본이 바뀐 시즌만 새로 집계해서 저장합니다."""
+    frames = []
+    for year, paths in loader.year_sources().items():
+        totals_path, meta_path = _totals_paths(loader, year)
+        is_current = os.path.exists(totals_path) and os.path.exists(meta_path)
+        if is_current:
+            with open(meta_path, 'r', encoding='utf-8') as f:
+                is_current = json.load(f).get('version') == TOTALS_VERSION
+        if is_current and loader.signature_is_current(meta_path, paths):
+            frames.append(pd.read_parquet(totals_path))
+            continue
+
+        totals = season_totals(loader, year)
+        os.makedirs(os.path.dirname(totals_path), exist_ok=True)
+        tmp_path = f"{totals_path}.{os.getpid()}.tmp"
+        totals.to_parquet(tmp_path, index=False)
+        os.replace(tmp_path, totals_path)
+        loader._write_json(meta_path, {
+            'version': TOTALS_VERSION,
+            'year': year,
+            'rows': len(totals),
+            'sources': loader.source_signature(paths),
+        })
+        print(f"   - {year}년 선수-시즌 집계 생성: {len(totals):,}행")
+        frames.append(totals)
+    return pd.concat(frames, ignore_index=True) if frames else None
+
+
+def calculate_closed_form():
+    """
+    반분 대신 선수-시즌 집계(개수, 합계, 제곱합)만으로 신뢰도를 추정합니다. (분산분해 / 베타-이항 적률 추정)
+    결과는 calculate_correlations와 같은 category, stat, pa, correlation 형식으로 저장합니다.
+    """
+    loader = StatcastLoader()
+    if not loader.available_years():
+        print("❌ 데이터 파일을 찾을 수 없습니다!")
+        return
+
+    print("🚀 고급 스탯 신뢰도 분석 시작 (선수-시즌 집계 기반 폐쇄형 추정)...")
+    totals = load_player_season_totals(loader)
+    print(f"   📦 선수-시즌 집계: {len(totals):,}행 ({totals.memory_usage(deep=True).sum() / 1024 ** 2:.1f} MB)")
+
+    grouped = {key: group for key, group in totals.groupby(['val_col', 'filter_col'], sort=False)}
+    results = []
+    for category, metrics in STATS_MAP.items():
+        for stat_name, (val_col, filter_col) in metrics.items():
+            group = grouped.get((val_col, filter_col or ''))
+            if group is None:
+                continue
+            curve = closed_form_curve(group['n'].to_numpy(), group['sum'].to_numpy(), group['sumsq'].to_numpy(),
+                                      THRESHOLDS)
+            print(f"   📊 [{category}] {stat_name} 분석 완료 ({len(curve)}개 구간)")
+            for threshold, reliability in curve:
+                results.append({
+                    'category': category,
+                    'stat': stat_name,
+                    'pa': threshold,
+                    'correlation': round(reliability, 3)
+                })
+
+    save_results(results)
+
 if __name__ == "__main__":
-    calculate_correlations()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="스탯별 안정화(반분 신뢰도) 곡선 계산")
+    parser.add_argument('--workers', type=int, default=None,
+                        help=f"스탯을 나눠 계산할 프로세스 수 (기본: {STAT_WORKERS}, split_half 전용)")
+    parser.add_argument('--resamples', type=int, default=0,
+                        help="무작위 반분 반복 횟수 (0이면 기존 홀짝 분할 한 번, split_half 전용)")
+    parser.add_argument('--estimator', choices=['split_half', 'closed_form'], default='split_half',
+                        help="split_half: 반분 신뢰도 / closed_form: 선수-시즌 집계만으로 분산분해 추정")
+    args = parser.parse_args()
+    if args.estimator == 'closed_form':
+        if args.workers is not None or args.resamples:
+            parser.error("--workers / --resamples는 --estimator split_half에서만 사용할 수 있습니다.")
+        calculate_closed_form()
+    else:
+        calculate_correlations(workers=STAT_WORKERS if args.workers is None else args.workers, resamples=args.resamples)
\ No newline at end of file
@@ -1,22 +1,58 @@
 import pandas as pd
+import pyarrow.dataset as ds
 import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from data_loader import StatcastLoader
+
+# 검사 대상 연도
+TARGET_YEAR = 2025
 
 # 파일 경로
 base_dir = os.path.dirname(os.path.abspath(__file__))
-file_path = os.path.join(base_dir, '..', 'simulation', 'data', 'statcast_2025.parquet')
+data_dir = os.path.join(base_dir, '..', 'simulation', 'data')
 
 print("🕵️‍♂️ '진짜' 데이터 무결성 검사 중...\n")
 
-df = pd.read_parquet(file_path)
+loader = StatcastLoader(data_dir)
+
+if TARGET_YEAR not in loader.available_years():
+    print(f"❌ {TARGET_YEAR}년 데이터 파일이 없습니다! ({loader.data_dir})")
+    sys.exit(1)
 
 # 1. 타석 결과(events)가 있는 데이터만 뽑아봅니다. (이게 OPS 계산의 핵심 데이터)
-# events가 None인 것은(볼, 스트라이크 등) 타율 계산에 안 쓰니까 일단 제외합니다.
-valid_at_bats = df[df['events'].notnull()]
+# events가 None인 것은(볼, 스트라이크 등) 타율 계산에 안 쓰니까 읽는 단계에서 제외합니다.
+# 연도 전체를 한 번에 올리지 않고 배치 단위로 한 번만 훑으며 집계합니다.
+total_ab = 0
+event_counts = pd.Series(dtype='int64')
+missing_parts = []
+
+for batch in loader.iter_batches(
+    years=[TARGET_YEAR],
+    columns=['game_date', 'player_name', 'events'],
+    filters=ds.field('events').is_valid(),
+    as_pandas=True,
+):
+    total_ab += len(batch)
+    event_counts = event_counts.add(batch['events'].value_counts(), fill_value=0)
+
+    # 2. 여기서 치명적인 결측치가 있는지 확인합니다.
+    missing = batch[batch['player_name'].isnull() | batch['game_date'].isnull()]
+    if not missing.empty:
+        missing_parts.append(missing)
+
+event_counts = event_counts.astype(int).sort_values(ascending=False)
+event_counts.index.name = 'events'
+event_counts.name = 'count'
+
+print(f"✅ 타석 결과가 나온 데이터(타수/사사구 등): {total_ab:,} 개")
 
-print(f"✅ 타석 결과가 나온 데이터(타수/사사구 등): {len(valid_at_bats):,} 개")
+if total_ab == 0:
+    print(f"🚨 비상! {TARGET_YEAR}년 데이터에 타석 결과(events)가 하나도 없습니다.")
+    sys.exit(1)
 
-# 2. 여기서 치명적인 결측치가 있는지 확인합니다.
-critical_missing = valid_at_bats[valid_at_bats['player_name'].isnull() | valid_at_bats['game_date'].isnull()]
+critical_missing = pd.concat(missing_parts) if missing_parts else pd.DataFrame()
 
 if len(critical_missing) > 0:
     print(f"🚨 비상! 치명적인 데이터 누락 발견: {len(critical_missing)} 개")
@@ -26,14 +62,13 @@ else:
 
 # 3. events 컬럼에 어떤 값들이 들어있는지 확인 (이상한 값이 섞여있나 체크)
 print("\n📊 타석 결과값 종류 (상위 10개):")
-print(valid_at_bats['events'].value_counts().head(10))
+print(event_counts.head(10))
 
 # 4. (추가) OPS 계산할 때 홈런, 안타 등이 잘 섞여 있는지 비율 확인
 print("\n📈 데이터 밸런스 체크:")
-total_ab = len(valid_at_bats)
-hr_count = len(valid_at_bats[valid_at_bats['events'] == 'home_run'])
-so_count = len(valid_at_bats[valid_at_bats['events'] == 'strikeout'])
+hr_count = int(event_counts.get('home_run', 0))
+so_count = int(event_counts.get('strikeout', 0))
 
 print(f" - 전체 타석 결과: {total_ab:,} 개")
 print(f" - 홈런: {hr_count:,} 개 (약 {hr_count/total_ab*100:.1f}%)")
-print(f" - 삼진: {so_count:,} 개 (약 {so_count/total_ab*100:.1f}%)")
\ No newline at end of file
+print(f" - 삼진: {so_count:,} 개 (약 {so_count/total_ab*100:.1f}%)")
@@ -1,11 +1,23 @@
 import os
 import time
-import pandas as pd
+import random
+import threading
+import pyarrow as pa
+import pyarrow.parquet as pq
 from pybaseball import statcast
 import calendar
+import tempfile
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import date
 import sys
 
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from statcast_cache import StatcastCache
+from statcast_fixtures import synthetic_statcast
+from data_loader import StatcastLoader
+from statcast_catalog import StatcastCatalog
+from player_dim import build_players
+
 # ==========================================================
 # 1. 경로 설정
 # ==========================================================
@@ -13,89 +25,468 @@ BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 DATA_DIR = os.path.join(BASE_DIR, '..', 'simulation', 'data')
 DATA_DIR = os.path.normpath(DATA_DIR)
 os.makedirs(DATA_DIR, exist_ok=True)
+
+# 날짜별 체크포인트 저장 경로: simulation/data/checkpoints/statcast_{year}/
+CHECKPOINT_DIR = os.path.join(DATA_DIR, 'checkpoints')
 # ==========================================================
 
-def collect_data_by_year(target_year):
-    print(f"📂 데이터 저장 경로: {DATA_DIR}")
-    print(f"🎯 [Target] {target_year}년 데이터 수집 시작 (무결성 최우선 모드)")
-    print("   -> 정책: 모든 기간 에러 발생 시 3회 재시도 후 실패하면 즉시 종료(STOP).")
-    print("   -> 건너뛰는(SKIP) 날짜는 없습니다.")
-    
-    yearly_dfs = []
-    
-    # 3월 ~ 11월
+# 수집 설정
+MAX_RETRIES = 3          # 날짜별 최대 재시도 횟수
+RETRY_BACKOFF = 2.0      # 재시도 대기 시간 기준값(초), 시도마다 2배씩 증가
+REQUESTS_PER_SEC = 2.0   # 전체 워커가 공유하는 초당 요청 수 (기존 0.5초 딜레이와 동일)
+MAX_WORKERS = 4          # 동시 수집 워커 수 (1이면 기존 순차 모드)
+
+# 요청 기간 설정 ('day': 하루씩 요청, 'adaptive': 여러 날짜를 묶어서 요청)
+WINDOW_MODE = 'adaptive'
+INITIAL_WINDOW_DAYS = 3
+MIN_WINDOW_DAYS = 1
+MAX_WINDOW_DAYS = 14
+TARGET_WINDOW_ROWS = 25000   # 요청 1회당 목표 투구 수 (정규시즌 하루 약 4,500개)
+MAX_WINDOW_ROWS = 60000      # 여러 날짜 요청의 응답이 이보다 크면 받지 않고 기간을 절반으로 줄여 다시 요청
+
+# 응답 캐시 (readwrite / replay / off). replay 모드는 네트워크 없이 기록된 응답만 사용 (없으면 CacheMiss)
+CACHE_MODE = os.environ.get('STATCAST_CACHE_MODE', 'readwrite')
+
+# STATCAST_USE_FIXTURE=1: replay 모드에서 기록되지 않은 날짜를 가짜 데이터로 대체 (테스트 전용)
+# 이때 체크포인트/연도 파일은 실제 데이터 폴더가 아닌 임시 폴더에만 저장합니다.
+USE_FIXTURE = os.environ.get('STATCAST_USE_FIXTURE') == '1'
+FIXTURE_OUTPUT_DIR = os.path.join(tempfile.gettempdir(), 'statcast_fixture_run')
+
+STATCAST_CACHE = StatcastCache(fetcher=statcast, mode=CACHE_MODE,
+                               fixture=synthetic_statcast if USE_FIXTURE else None)
+
+
+class DayFetchError(Exception):
+    """재시도를 모두 소진해도 하루치 데이터를 받지 못했을 때 발생"""
+
+    def __init__(self, date_str, cause):
+        super().__init__(f"{date_str} {MAX_RETRIES}회 시도 실패: {cause}")
+        self.date_str = date_str
+        self.cause = cause
+
+
+class TokenBucket:
+    """
+    여러 스레드가 공유하는 토큰 버킷 방식의 요청 속도 제한기.
+    초당 rate개의 토큰이 채워지고, 최대 capacity개까지 한 번에 사용할 수 있습니다.
+    """
+
+    def __init__(self, rate, capacity=1):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated_at = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        """토큰 1개를 얻을 때까지 대기합니다."""
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+                self.updated_at = now
+
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+
+class DayCheckpoint:
+    """
+    시즌 수집 중 완료된 날짜를 하루 단위 파티션으로 즉시 저장합니다.
+
+    - 데이터가 있는 날: {date}.parquet 로 저장 (임시 파일 작성 후 rename)
+    - 완료된 날짜(경기 없는 날 포함)는 _completed.txt 에 한 줄씩 기록
+    - 재실행 시 _completed.txt 에 있는 날짜는 건너뜁니다.
+    - 오늘 날짜는 경기가 진행 중일 수 있으므로 완료로 기록하지 않습니다.
+    """
+
+    MANIFEST = '_completed.txt'
+
+    def __init__(self, target_year, root_dir=None):
+        self.target_year = target_year
+        self.path = os.path.join(root_dir or CHECKPOINT_DIR, f"statcast_{target_year}")
+        self.manifest_path = os.path.join(self.path, self.MANIFEST)
+        os.makedirs(self.path, exist_ok=True)
+        self.completed = self._read_manifest()
+
+    def _read_manifest(self):
+        if not os.path.exists(self.manifest_path):
+            return set()
+        with open(self.manifest_path, 'r', encoding='utf-8') as f:
+            return {line.strip() for line in f if line.strip()}
+
+    def day_path(self, date_str):
+        return os.path.join(self.path, f"{date_str}.parquet")
+
+    def save(self, date_str, df):
+        """하루치 결과를 저장하고 완료 목록에 기록합니다. (df가 None이면 경기 없는 날)"""
+        if df is not None:
+            tmp_path = self.day_path(date_str) + '.tmp'
+            df.to_parquet(tmp_path, index=False)
+            os.replace(tmp_path, self.day_path(date_str))
+
+        if date_str >= str(date.today()):
+            return
+
+        with open(self.manifest_path, 'a', encoding='utf-8') as f:
+            f.write(date_str + '\n')
+            f.flush()
+            os.fsync(f.fileno())
+        self.completed.add(date_str)
+
+    def day_files(self):
+        """저장된 날짜별 파일을 날짜 순서대로 반환합니다."""
+        names = sorted(n for n in os.listdir(self.path) if n.endswith('.parquet'))
+        return [os.path.join(self.path, n) for n in names]
+
+    def compact(self, file_path):
+        """
+        날짜별 파일을 순서대로 하나씩 읽어 연도 파일 하나로 합칩니다.
+        Row Group 단위로 이어 쓰기 때문에 메모리에는 하루치 데이터만 올라갑니다.
+        반환값: 저장된 총 행 수 (저장할 데이터가 없으면 0)
+        """
+        files = self.day_files()
+        if not files:
+            return 0
+
+        # 날짜마다 컬럼 타입이 조금씩 다를 수 있으므로(전부 결측인 컬럼 등) 스키마 통합
+        schema = pa.unify_schemas(
+            [pq.read_schema(f) for f in files], promote_options='permissive'
+        )
+
+        total_rows = 0
+        tmp_path = file_path + '.tmp'
+        with pq.ParquetWriter(tmp_path, schema) as writer:
+            for f in files:
+                table = _conform_table(pq.read_table(f), schema)
+                writer.write_table(table)
+                total_rows += table.num_rows
+        os.replace(tmp_path, file_path)
+        return total_rows
+
+
+def _conform_table(table, schema):
+    """통합 스키마에 맞춰 컬럼 순서/타입을 맞추고, 없는 컬럼은 결측값으로 채웁니다."""
+    columns = []
+    for field in schema:
+        if field.name in table.column_names:
+            columns.append(table[field.name].cast(field.type))
+        else:
+            columns.append(pa.nulls(table.num_rows, type=field.type))
+    return pa.Table.from_arrays(columns, schema=schema)
+
+
+def iter_season_dates(target_year):
+    """3월 ~ 11월 중 오늘 이전의 날짜 문자열(YYYY-MM-DD)을 순서대로 반환합니다."""
+    today = str(date.today())
     for month in range(3, 12):
         _, last_day = calendar.monthrange(target_year, month)
-        print(f"\n📅 {target_year}년 {month}월 데이터 수집 중...")
-        
         for day in range(1, last_day + 1):
             date_str = f"{target_year}-{month:02d}-{day:02d}"
-            
+
             # 미래 날짜는 중단
-            if date_str > str(date.today()):
-                break
-            
-            # === 재시도(Retry) 로직 (최대 3회) ===
-            max_retries = 3
-            success = False
-            
-            for attempt in range(max_retries):
-                try:
-                    # 데이터 요청
-                    df = statcast(start_dt=date_str, end_dt=date_str)
-                    
-                    # 데이터 없음 (경기 없는 날) -> 정상 상황
-                    if df is None or df.empty:
-                        print(".", end="", flush=True)
-                        success = True
-                        break
-
-                    # 정규시즌('R') 필터링
-                    if 'game_type' in df.columns:
-                        df = df[df['game_type'] == 'R']
-                    
-                    if not df.empty:
-                        yearly_dfs.append(df)
-                        print("O", end="", flush=True)
-                    else:
-                        print(".", end="", flush=True) # 정규시즌 아님
-                    
-                    success = True
-                    break # 성공 시 재시도 루프 탈출
-                    
-                except Exception as e:
-                    # 실패 시 잠시 대기 후 재시도
-                    if attempt < max_retries - 1:
-                        time.sleep(2) 
-                        continue
-                    else:
-                        # 3번 다 실패함
-                        print(f"\n❌ [ERROR] {date_str} 3회 시도 실패: {e}")
-            
-            # === 3번 다 실패했을 때 처리 (무조건 STOP) ===
-            if not success:
-                print(f"\n🛑 [STOP] {date_str} 데이터 수집 실패!")
-                print("   -> 건너뛰지 않고 프로그램을 종료합니다.")
-                print("   -> 원인을 확인하고 해결 후 다시 실행해주세요.")
-                sys.exit(1)
-                
-            # 서버 차단 방지 딜레이
-            time.sleep(0.5)
+            if date_str > today:
+                return
+            yield date_str
+
+
+def _fetch_raw(start_dt, end_dt, limiter=None, stop_event=None, retries=MAX_RETRIES):
+    """
+    start_dt ~ end_dt 기간의 원본 응답을 받습니다. (정규시즌 필터링 전)
+    retries번 모두 실패하면 DayFetchError를 발생시킵니다.
+    """
+    label = start_dt if start_dt == end_dt else f"{start_dt}~{end_dt}"
+
+    for attempt in range(retries):
+        # 다른 워커가 이미 실패했다면 더 이상 요청하지 않음
+        if stop_event is not None and stop_event.is_set():
+            return None
+
+        try:
+            # 데이터 요청 (캐시에 없을 때만 네트워크 요청 + 속도 제한 적용)
+            return STATCAST_CACHE.statcast(
+                start_dt=start_dt, end_dt=end_dt,
+                before_fetch=limiter.acquire if limiter is not None else None,
+            )
+        except Exception as e:
+            if attempt < retries - 1:
+                # 지수 백오프 + 지터 (워커끼리 동시에 재시도하지 않도록)
+                time.sleep(RETRY_BACKOFF * (2 ** attempt) + random.uniform(0, 1))
+                continue
+            raise DayFetchError(label, e)
+
+
+def _regular_season(df):
+    """정규시즌('R') 데이터만 남깁니다. 남는 데이터가 없으면 None."""
+    # 데이터 없음 (경기 없는 날) -> 정상 상황
+    if df is None or df.empty:
+        return None
+
+    if 'game_type' in df.columns:
+        df = df[df['game_type'] == 'R']
+
+    return df if not df.empty else None
+
+
+def fetch_day(date_str, limiter=None, stop_event=None):
+    """
+    하루치 Statcast 데이터를 받아 정규시즌('R') 데이터만 반환합니다.
+    경기가 없는 날은 None을 반환하고, 재시도를 모두 실패하면 DayFetchError를 발생시킵니다.
+    """
+    return _regular_season(_fetch_raw(date_str, date_str, limiter, stop_event))
+
+
+class WindowIntegrityError(Exception):
+    """기간 응답을 날짜별로 나눴을 때 요청 범위 밖의 날짜가 섞여 있는 경우"""
+
+
+def _split_by_day(df, window_dates):
+    """
+    여러 날짜 응답을 날짜별 결과로 나눕니다.
+    요청한 모든 날짜에 대해 결과(경기 없으면 None)를 반환하고,
+    범위 밖 날짜가 섞여 있으면 WindowIntegrityError를 발생시킵니다.
+    """
+    if df is None or df.empty:
+        return {d: None for d in window_dates}
+
+    day_key = df['game_date'].astype(str).str[:10]
+    unexpected = set(day_key.unique()) - set(window_dates)
+    if unexpected:
+        raise WindowIntegrityError(f"요청 범위 밖 날짜 포함: {sorted(unexpected)[:3]}")
+
+    parts = dict(tuple(df.groupby(day_key, sort=False)))
+    return {d: _regular_season(parts.get(d)) for d in window_dates}
+
+
+def _next_window(window, rows):
+    """
+    직전 응답 크기로 다음 요청 기간(일)을 정합니다.
+    TARGET_WINDOW_ROWS에 가까워지도록 한 번에 최대 2배까지 늘리거나 절반으로 줄입니다.
+    """
+    if rows > MAX_WINDOW_ROWS:
+        return max(MIN_WINDOW_DAYS, window // 2)
+
+    rows_per_day = rows / window
+    if rows_per_day == 0:
+        target = window * 2
+    else:
+        target = int(TARGET_WINDOW_ROWS / rows_per_day)
+    return max(MIN_WINDOW_DAYS, min(MAX_WINDOW_DAYS, window * 2, max(window // 2, target)))
+
+
+def fetch_run(dates, on_day, limiter=None, stop_event=None):
+    """
+    연속된 날짜 목록을 여러 날짜 단위(window)로 요청한 뒤 날짜별로 나눠 on_day로 전달합니다.
+
+    - 경기가 없거나 적은 기간(시즌 초/말, 올스타 휴식기)은 기간을 늘리고
+    - 응답이 MAX_WINDOW_ROWS보다 크거나 요청이 실패하면 기간을 절반으로 줄여 다시 요청합니다.
+      (하루 단위 요청은 크기와 관계없이 받아들임)
+    - 하루 단위까지 줄었는데도 실패하면 기존처럼 DayFetchError (무결성 우선)
+    """
+    window = INITIAL_WINDOW_DAYS
+    i = 0
+
+    while i < len(dates):
+        if stop_event is not None and stop_event.is_set():
+            return
+
+        chunk = dates[i:i + window]
+
+        if len(chunk) == 1:
+            raw = _fetch_raw(chunk[0], chunk[0], limiter, stop_event)
+            days = {chunk[0]: _regular_season(raw)}
+        else:
+            try:
+                raw = _fetch_raw(chunk[0], chunk[-1], limiter, stop_event, retries=1)
+                days = _split_by_day(raw, chunk)
+            except (DayFetchError, WindowIntegrityError):
+                # 기간을 절반으로 줄여 같은 시작일부터 다시 요청
+                window = max(MIN_WINDOW_DAYS, len(chunk) // 2)
+                time.sleep(RETRY_BACKOFF * random.uniform(0.5, 1))
+                continue
+
+            if raw is not None and len(raw) > MAX_WINDOW_ROWS:
+                # 예산을 넘은 응답은 받아들이지 않고 기간을 절반으로 나눠 같은 시작일부터 다시 요청
+                # (응답 캐시에 하루 단위로 기록되므로 readwrite/replay 모드에서는 네트워크를 다시 쓰지 않음)
+                window = max(MIN_WINDOW_DAYS, len(chunk) // 2)
+                continue
+
+        if stop_event is not None and stop_event.is_set():
+            return
+
+        for date_str in chunk:
+            on_day(date_str, days[date_str])
+
+        i += len(chunk)
+        rows = 0 if raw is None else len(raw)
+        window = _next_window(len(chunk), rows)
+
+
+def _split_runs(dates):
+    """날짜 목록을 연속된 구간으로 나눕니다. (월이 바뀌면 구간도 나눠 워커에 고르게 분배)"""
+    runs = []
+    prev = None
+    for date_str in dates:
+        d = date.fromisoformat(date_str)
+        if prev is None or (d - prev).days != 1 or d.month != prev.month:
+            runs.append([])
+        runs[-1].append(date_str)
+        prev = d
+    return runs
+
+
+def _stop(date_str, error):
+    print(f"\n❌ [ERROR] {error}")
+    print(f"\n🛑 [STOP] {date_str} 데이터 수집 실패!")
+    print("   -> 건너뛰지 않고 프로그램을 종료합니다.")
+    print("   -> 원인을 확인하고 해결 후 다시 실행해주세요.")
+    sys.exit(1)
+
+
+def _collect_sequential(dates, on_day):
+    """기존 방식: 하루씩 순서대로 수집합니다."""
+    limiter = TokenBucket(REQUESTS_PER_SEC)
+    current_month = None
+
+    for date_str in dates:
+        month = date_str[:7]
+        if month != current_month:
+            current_month = month
+            print(f"\n📅 {month} 데이터 수집 중...")
+
+        try:
+            df = fetch_day(date_str, limiter=limiter)
+        except DayFetchError as e:
+            _stop(date_str, e)
+
+        on_day(date_str, df)
+        print("O" if df is not None else ".", end="", flush=True)
+
+
+def _collect_concurrent(dates, workers, on_day):
+    """
+    워커 풀로 여러 날짜를 동시에 수집합니다.
+    요청 속도는 모든 워커가 공유하는 토큰 버킷으로 제한되며,
+    한 날짜라도 최종 실패하면 남은 작업을 취소하고 종료합니다.
+    완료된 날짜는 끝나는 순서대로 on_day 로 전달됩니다. (저장은 메인 스레드에서 수행)
+    """
+    limiter = TokenBucket(REQUESTS_PER_SEC)
+    stop_event = threading.Event()
+
+    print(f"\n⚡ 동시 수집 모드: 워커 {workers}개, 초당 {REQUESTS_PER_SEC}회 요청 제한")
+
+    executor = ThreadPoolExecutor(max_workers=workers)
+    futures = {executor.submit(fetch_day, d, limiter, stop_event): d for d in dates}
+
+    for future in as_completed(futures):
+        date_str = futures[future]
+        try:
+            df = future.result()
+        except DayFetchError as e:
+            stop_event.set()
+            executor.shutdown(wait=False, cancel_futures=True)
+            _stop(date_str, e)
+
+        on_day(date_str, df)
+        print("O" if df is not None else ".", end="", flush=True)
+
+    executor.shutdown()
+
+
+def _collect_adaptive(dates, workers, on_day):
+    """
+    연속 구간별로 fetch_run을 실행합니다. workers > 1이면 구간들을 워커 풀에 나눠 동시에 수집합니다.
+    on_day는 여러 워커 스레드에서 호출되므로 lock으로 감싸서 전달합니다.
+    """
+    limiter = TokenBucket(REQUESTS_PER_SEC)
+    stop_event = threading.Event()
+    lock = threading.Lock()
+    runs = _split_runs(dates)
+
+    def save_day(date_str, df):
+        with lock:
+            on_day(date_str, df)
+            print("O" if df is not None else ".", end="", flush=True)
+
+    print(f"\n🪟 가변 기간 모드: {len(runs)}개 구간, 기간 {MIN_WINDOW_DAYS}~{MAX_WINDOW_DAYS}일, 워커 {max(1, workers)}개")
+
+    executor = ThreadPoolExecutor(max_workers=max(1, workers))
+    futures = {executor.submit(fetch_run, run, save_day, limiter, stop_event): run for run in runs}
+
+    for future in as_completed(futures):
+        try:
+            future.result()
+        except DayFetchError as e:
+            stop_event.set()
+            executor.shutdown(wait=False, cancel_futures=True)
+            with lock:
+                _stop(e.date_str, e)
+
+    executor.shutdown()
+
+
+def collect_data_by_year(target_year, workers=1, window_mode='day'):
+    # 가짜 데이터가 섞일 수 있으면 실제 데이터 폴더(체크포인트 포함)에는 쓰지 않음
+    output_dir = FIXTURE_OUTPUT_DIR if STATCAST_CACHE.fixture is not None else DATA_DIR
+    if output_dir != DATA_DIR:
+        print(f"🧪 [Fixture] 가짜 데이터 대체 사용 중 - 실제 데이터 폴더 대신 {output_dir}에 저장합니다.")
+    print(f"📂 데이터 저장 경로: {output_dir}")
+    print(f"🎯 [Target] {target_year}년 데이터 수집 시작 (무결성 최우선 모드)")
+    print(f"   -> 정책: 모든 기간 에러 발생 시 {MAX_RETRIES}회 재시도 후 실패하면 즉시 종료(STOP).")
+    print("   -> 건너뛰는(SKIP) 날짜는 없습니다.")
+
+    # 완료된 날짜는 체크포인트에 바로 기록되므로, 중단 후 재실행하면 이어서 수집합니다.
+    checkpoint = DayCheckpoint(target_year, root_dir=os.path.join(output_dir, 'checkpoints'))
+    dates = [d for d in iter_season_dates(target_year) if d not in checkpoint.completed]
+
+    if checkpoint.completed:
+        print(f"♻️ 체크포인트 발견: 완료된 {len(checkpoint.completed)}일은 건너뜁니다. (남은 날짜: {len(dates)}일)")
+
+    if window_mode == 'adaptive':
+        _collect_adaptive(dates, workers, checkpoint.save)
+    elif workers > 1:
+        _collect_concurrent(dates, workers, checkpoint.save)
+    else:
+        _collect_sequential(dates, checkpoint.save)
 
     # ==========================================================
-    # 저장
+    # 저장 (날짜별 체크포인트 -> 연도 파일 압축)
     # ==========================================================
     print("\n\n🧩 데이터 병합 및 저장 중...")
-    
-    if yearly_dfs:
-        full_df = pd.concat(yearly_dfs, ignore_index=True)
-        file_name = f"statcast_{target_year}.parquet"
-        file_path = os.path.join(DATA_DIR, file_name)
-        full_df.to_parquet(file_path, index=False)
-        print(f"✅ {target_year}년 저장 완료! (총 {len(full_df):,}행)")
+
+    file_name = f"statcast_{target_year}.parquet"
+    file_path = os.path.join(output_dir, file_name)
+    if STATCAST_CACHE.fixture_hits and output_dir == DATA_DIR:
+        raise RuntimeError("가짜(fixture) 응답이 포함된 데이터는 실제 데이터 폴더에 저장할 수 없습니다.")
+    total_rows = checkpoint.compact(file_path)
+
+    if total_rows and output_dir != DATA_DIR:
+        print(f"🧪 [Fixture] {target_year}년 임시 저장 완료 (총 {total_rows:,}행, 가짜 응답 {STATCAST_CACHE.fixture_hits}회)")
+        print("   -> 카탈로그 / 타석·경기 테이블 / 선수 테이블은 갱신하지 않습니다.")
+    elif total_rows:
+        print(f"✅ {target_year}년 저장 완료! (총 {total_rows:,}행)")
+
+        # 카탈로그(행 수, 날짜 범위, 결측 수, 해시 등) 갱신
+        StatcastCatalog(DATA_DIR).update(file_path)
+
+        # 파티션 데이터셋을 쓰고 있다면 해당 연도 파티션도 갱신
+        loader = StatcastLoader(DATA_DIR)
+        if loader.has_dataset():
+            loader.build_dataset([target_year])
+
+        # 분석용 타석(PA) / 경기 단위 테이블 갱신 (경기 테이블은 타석 테이블부터 갱신)
+        loader.build_game_table([target_year])
+        build_players(loader)
     else:
         print(f"⚠️ {target_year}년 데이터 없음.")
 
+    cache_stats = STATCAST_CACHE.stats()
+    print(f"🗄️ 응답 캐시({cache_stats['mode']}): 적중 {cache_stats['hits']}회 / 미적중 {cache_stats['misses']}회, "
+          f"{cache_stats['entries']}개 ({cache_stats['size_mb']}MB)")
+
 if __name__ == "__main__":
     TARGET_YEAR = 2025
-    collect_data_by_year(TARGET_YEAR)
\ No newline at end of file
+    collect_data_by_year(TARGET_YEAR, workers=MAX_WORKERS, window_mode=WINDOW_MODE)
@@ -1,48 +1,705 @@
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
 import glob
+import hashlib
+import json
 import os
+import re
+import sys
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from pa_table import PA_SOURCE_COLUMNS, PA_TABLE_VERSION, build_plate_appearances
+from game_table import GAME_SOURCE_COLUMNS, GAME_TABLE_VERSION, build_games
+
+# 연도/월 파티션 데이터셋 (simulation/data/statcast_dataset/year=2024/month=7/...)
+DATASET_DIR_NAME = 'statcast_dataset'
+PARTITION_COLUMNS = ['year', 'month']
+ROWS_PER_GROUP = 64 * 1024  # Row Group이 작을수록 통계(min/max)로 건너뛸 수 있는 범위가 세밀해짐
+
+# 연도 파일 동시 읽기 설정
+READ_WORKERS = os.cpu_count() or 1   # 동시에 디코딩할 연도 수
+READ_MEMORY_LIMIT = None             # 디코딩 중인 데이터 추정 크기 상한(bytes), None이면 제한 없음
+
+# 압축 해제된 Arrow IPC 캐시 (simulation/data/_arrow_cache/{year}.arrow)
+# 요청된 컬럼(+ 필터 컬럼)만 저장하고, 없는 컬럼이 요청되면 기존 컬럼과 합쳐서 다시 만듭니다.
+ARROW_CACHE_DIR_NAME = '_arrow_cache'
+
+# 시즌별 타석(PA) 단위 테이블 (simulation/data/pa_table/pa_{year}.parquet)
+PA_DIR_NAME = 'pa_table'
+
+# 시즌별 경기 단위 테이블 (simulation/data/game_table/games_{year}.parquet)
+GAME_DIR_NAME = 'game_table'
+
+PARTITION_SCHEMA = pa.schema([('year', pa.int32()), ('month', pa.int32())])
+
+# compact 모드에서 범주형(category)으로 바꿀 저카디널리티 문자열 컬럼
+CATEGORY_COLUMNS = [
+    'player_name', 'events', 'description', 'bb_type', 'pitch_type', 'inning_topbot',
+    'game_type', 'home_team', 'away_team', 'stand', 'p_throws', 'type',
+]
+
+
+def _to_expression(filters):
+    """
+    pandas.read_parquet과 같은 형식의 filters를 pyarrow Expression으로 변환합니다.
+    예: [('game_type', '==', 'R'), ('pitcher', 'in', [543037, 605483])]
+    이미 Expression이면 그대로 사용합니다.
+    """
+    if filters is None or isinstance(filters, ds.Expression):
+        return filters
+    return pq.filters_to_expression(filters)
+
+
+def _filter_columns(filters):
+    """filters가 참조하는 컬럼 이름 목록. Expression이면 알 수 없으므로 None을 반환합니다."""
+    if filters is None:
+        return []
+    if isinstance(filters, ds.Expression):
+        return None
+    # [(컬럼, 연산자, 값), ...] 또는 [[...], [...]] (OR로 묶인 조건 목록)
+    conditions = [f for group in filters for f in group] if isinstance(filters[0], list) else filters
+    return [f[0] for f in conditions]
+
+
+def file_sha256(path, chunk_size=8 * 1024 * 1024):
+    """파일 내용의 SHA-256 해시 (캐시 무효화/카탈로그용)"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _game_dates(table):
+    """game_date 컬럼을 날짜형(date32)으로 변환합니다. (문자열/타임스탬프 모두 지원)"""
+    col = table['game_date']
+    if pa.types.is_string(col.type) or pa.types.is_large_string(col.type):
+        col = pc.strptime(pc.utf8_slice_codeunits(col, 0, 10), format='%Y-%m-%d', unit='s')
+    return pc.cast(col, pa.date32()) if not pa.types.is_date(col.type) else col
+
+
+def compact_frame(df, category_columns=CATEGORY_COLUMNS):
+    """
+    DataFrame의 메모리 사용량을 줄입니다. (원본을 직접 수정)
+    - 저카디널리티 문자열 -> category
+    - float64 -> float32
+    - 정수 -> 값 범위에 맞는 가장 작은 정수형 (int8/int16/int32)
+    """
+    for col in df.columns:
+        s = df[col]
+        if col in category_columns and (s.dtype == object or pd.api.types.is_string_dtype(s)):
+            df[col] = s.astype('category')
+        elif s.dtype == np.float64:
+            df[col] = s.astype(np.float32)
+        elif pd.api.types.is_integer_dtype(s) and isinstance(s.dtype, np.dtype):
+            df[col] = pd.to_numeric(s, downcast='integer')
+    return df
+
+
+def unify_categories(frames):
+    """
+    여러 DataFrame의 category 컬럼이 같은 사전(정렬된 합집합)을 쓰도록 맞춥니다.
+    사전이 같아야 concat 후에도 category로 유지되고, 연도 순서와 무관하게 코드 값이 같아집니다.
+    """
+    category_cols = {
+        col for f in frames for col in f.columns if isinstance(f[col].dtype, pd.CategoricalDtype)
+    }
+    for col in category_cols:
+        categories = sorted(set().union(*(f[col].cat.categories for f in frames if col in f.columns)))
+        for f in frames:
+            if col in f.columns:
+                f[col] = f[col].cat.set_categories(categories)
+    return frames
+
+
+def parallel_ordered(items, fn, max_workers=READ_WORKERS, memory_limit=READ_MEMORY_LIMIT, cost_fn=None):
+    """
+    items 각각에 fn을 스레드 풀에서 동시에 실행하고, 결과를 items 순서대로 (item, 결과)로 반환합니다.
+
+    memory_limit이 있으면 cost_fn(item)으로 추정한 크기의 합이 상한을 넘지 않도록
+    새 작업 제출을 미룹니다. (아직 반환하지 않은 결과까지 포함, 단 하나는 항상 진행)
+    pyarrow의 parquet 디코딩은 GIL을 풀기 때문에 스레드만으로도 코어 수만큼 빨라집니다.
+    """
+    max_workers = max(1, max_workers or 1)
+    pending = deque()
+    in_flight = 0
+    items = iter(items)
+    waiting = None
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        while True:
+            # 워커 수와 메모리 상한이 허용하는 만큼 작업 제출
+            while len(pending) < max_workers:
+                if waiting is None:
+                    item = next(items, StopIteration)
+                    if item is StopIteration:
+                        break
+                    cost = cost_fn(item) if (memory_limit and cost_fn) else 0
+                    waiting = (item, cost)
+
+                item, cost = waiting
+                if pending and memory_limit and in_flight + cost > memory_limit:
+                    break
+                pending.append((item, cost, executor.submit(fn, item)))
+                in_flight += cost
+                waiting = None
+
+            if not pending:
+                return
+
+            item, cost, future = pending.popleft()
+            result = future.result()
+            in_flight -= cost
+            yield item, result
+
+
+def _memory_mb(df):
+    return df.memory_usage(deep=True).sum() / 1024 ** 2
+
 
 class StatcastLoader:
-    def __init__(self, data_dir='../simulation/data'):
+    def __init__(self, data_dir='../simulation/data', max_workers=READ_WORKERS, memory_limit=READ_MEMORY_LIMIT,
+                 use_cache=False):
         # 현재 파일 위치 기준으로 데이터 폴더 절대 경로 설정
         base_dir = os.path.dirname(os.path.abspath(__file__))
-        self.data_dir = os.path.join(base_dir, data_dir)
-        
-    def load_all_years(self):
-        """폴더 내의 모든 statcast_xxxx.parquet 파일을 읽어서 하나로 합칩니다."""
-        # glob 패턴을 써서 statcast_*.parquet 파일 리스트를 가져옵니다.
-        file_pattern = os.path.join(self.data_dir, "statcast_*.parquet")
-        files = glob.glob(file_pattern)
-        
+        self.data_dir = os.path.normpath(os.path.join(base_dir, data_dir))
+        self.dataset_dir = os.path.join(self.data_dir, DATASET_DIR_NAME)
+        self.max_workers = max_workers
+        self.memory_limit = memory_limit
+        self.use_cache = use_cache
+        self.cache_dir = os.path.join(self.data_dir, ARROW_CACHE_DIR_NAME)
+        self.pa_dir = os.path.join(self.data_dir, PA_DIR_NAME)
+        self.game_dir = os.path.join(self.data_dir, GAME_DIR_NAME)
+
+    # ------------------------------------------------------
+    # 파일 / 데이터셋 탐색
+    # ------------------------------------------------------
+    def year_files(self, years=None):
+        """연도별 원본 파일(statcast_{year}.parquet) 경로를 연도 순서대로 반환합니다."""
+        files = {}
+        for file in glob.glob(os.path.join(self.data_dir, "statcast_*.parquet")):
+            match = re.search(r"statcast_(\d{4})\.parquet$", file)
+            if match:
+                files[int(match.group(1))] = file
+
+        if years is not None:
+            files = {y: f for y, f in files.items() if y in set(years)}
+        return [files[y] for y in sorted(files)]
+
+    def has_dataset(self):
+        return os.path.isdir(self.dataset_dir) and any(
+            name.startswith('year=') for name in os.listdir(self.dataset_dir)
+        )
+
+    def available_years(self):
+        """읽을 수 있는 연도 목록 (파티션 데이터셋이 있으면 파티션 기준)"""
+        if self.has_dataset():
+            return sorted(int(name.split('=')[1]) for name in os.listdir(self.dataset_dir)
+                          if name.startswith('year='))
+        return [int(re.search(r"(\d{4})", os.path.basename(f)).group(1)) for f in self.year_files()]
+
+    def year_sources(self, years=None):
+        """
+        {연도: [parquet 파일 경로, ...]}를 연도 순서대로 반환합니다.
+        파티션 데이터셋이 있으면 월 폴더 순서대로, 없으면 연도별 원본 파일 하나씩.
+        """
+        years = self.available_years() if years is None else sorted(years)
+
+        if self.has_dataset():
+            sources = {}
+            for year in years:
+                year_dir = os.path.join(self.dataset_dir, f"year={year}")
+                if os.path.isdir(year_dir):
+                    sources[year] = sorted(glob.glob(os.path.join(year_dir, 'month=*', '*.parquet')))
+            return sources
+
+        return {int(re.search(r"statcast_(\d{4})", f).group(1)): [f] for f in self.year_files(years)}
+
+    def dataset(self, years=None):
+        """
+        pyarrow Dataset을 반환합니다. (요청한 연도의 파일만 포함)
+        파티션 데이터셋이면 year/month 파티션 컬럼도 함께 사용할 수 있습니다.
+        """
+        paths = [p for files in self.year_sources(years).values() for p in files]
+        if not paths:
+            return None
+        if self.has_dataset():
+            partitioning = ds.partitioning(PARTITION_SCHEMA, flavor='hive')
+            return ds.dataset(paths, format='parquet', partitioning=partitioning,
+                              partition_base_dir=self.dataset_dir)
+        return ds.dataset(paths, format='parquet')
+
+    # ------------------------------------------------------
+    # 파티션 데이터셋 생성
+    # ------------------------------------------------------
+    def build_dataset(self, years=None):
+        """
+        연도별 원본 파일을 year/month 파티션 데이터셋으로 변환합니다.
+        이미 있는 연도 파티션은 새로 덮어씁니다.
+        월 폴더 순서대로 읽히므로, 날짜순으로 쌓인 원본 파일은 행 순서가 그대로 유지됩니다.
+        """
+        files = self.year_files(years)
         if not files:
+            print("❌ 변환할 데이터 파일이 없습니다!")
+            return
+
+        print(f"🗂️ 파티션 데이터셋 생성: {self.dataset_dir}")
+        for file in files:
+            table = pq.read_table(file)
+            dates = _game_dates(table)
+            table = table.append_column('year', pc.cast(pc.year(dates), pa.int32()))
+            # 폴더 이름 정렬 순서가 월 순서와 같도록 두 자리로 저장 (month=03 ... month=11)
+            month = pc.utf8_lpad(pc.cast(pc.month(dates), pa.string()), width=2, padding='0')
+            table = table.append_column('month', month)
+
+            ds.write_dataset(
+                table, self.dataset_dir, format='parquet',
+                partitioning=PARTITION_COLUMNS, partitioning_flavor='hive',
+                existing_data_behavior='delete_matching',
+                basename_template='part-{i}.parquet',
+                max_rows_per_group=ROWS_PER_GROUP, min_rows_per_group=ROWS_PER_GROUP // 2,
+            )
+            print(f"   - {os.path.basename(file)} -> {table.num_rows:,}행")
+
+        print("✅ 파티션 데이터셋 생성 완료!")
+
+    # ------------------------------------------------------
+    # 로드
+    # ------------------------------------------------------
+    # ------------------------------------------------------
+    # Arrow IPC 캐시
+    # ------------------------------------------------------
+    def _cache_paths(self, year):
+        return (os.path.join(self.cache_dir, f"{year}.arrow"),
+                os.path.join(self.cache_dir, f"{year}.json"))
+
+    @staticmethod
+    def _source_info(path):
+        stat = os.stat(path)
+        return {'path': os.path.abspath(path), 'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+
+    def _cache_is_valid(self, meta_path, sources):
+        """
+        원본 파일 목록과 크기/수정 시각이 같으면 유효.
+        수정 시각만 달라졌다면(복사/touch 등) 해시를 비교해서 내용이 같으면 유효로 보고 기록을 갱신합니다.
+        """
+        if not os.path.exists(meta_path):
+            return False
+        with open(meta_path, 'r', encoding='utf-8') as f:
+            meta = json.load(f)
+
+        recorded = {s['path']: s for s in meta.get('sources', [])}
+        if set(recorded) != {os.path.abspath(p) for p in sources}:
+            return False
+
+        touched = False
+        for path in sources:
+            info, saved = self._source_info(path), recorded[os.path.abspath(path)]
+            if info['size'] != saved['size']:
+                return False
+            if info['mtime_ns'] != saved['mtime_ns']:
+                if file_sha256(path) != saved['sha256']:
+                    return False
+                saved['mtime_ns'] = info['mtime_ns']
+                touched = True
+
+        if touched:
+            self._write_json(meta_path, meta)
+        return True
+
+    @staticmethod
+    def _meta_matches(meta_path, **expected):
+        """sidecar JSON에 기록된 값(생성 방식 버전 등)이 expected와 모두 같은지 확인합니다."""
+        if not os.path.exists(meta_path):
+            return False
+        with open(meta_path, 'r', encoding='utf-8') as f:
+            meta = json.load(f)
+        return all(meta.get(key) == value for key, value in expected.items())
+
+    def source_signature(self, sources):
+        """원본 파일 목록의 서명 (경로, 크기, 수정 시각, SHA-256). 파생 결과 캐시의 키로 기록합니다."""
+        return [dict(self._source_info(p), sha256=file_sha256(p)) for p in sources]
+
+    def signature_is_current(self, meta_path, sources):
+        """meta_path에 기록된 원본 서명이 현재 파일 내용과 같은지 확인합니다. (_cache_is_valid 참고)"""
+        return self._cache_is_valid(meta_path, sources)
+
+    @staticmethod
+    def _write_json(path, data):
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2)
+        os.replace(tmp_path, path)
+
+    def _build_cache(self, year, sources, partitioning, columns=None):
+        """
+        연도의 columns(None이면 전체 컬럼)를 디코딩해서 압축 없는 Arrow IPC 파일로 저장합니다.
+        압축 해제 크기는 원본 parquet의 수십 배이므로, 필요한 컬럼만 저장합니다.
+        """
+        arrow_path, meta_path = self._cache_paths(year)
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+        # 원본에 없는 컬럼은 건너뛰되, 같은 요청으로 다시 만들지 않도록 기록에는 남김
+        dataset = self._source_dataset(sources, partitioning)
+        present = None if columns is None else [c for c in dataset.schema.names if c in set(columns)]
+        table = dataset.to_table(columns=present, use_threads=False)
+
+        tmp_path = f"{arrow_path}.{os.getpid()}.tmp"
+        with pa.OSFile(tmp_path, 'wb') as sink:
+            with pa.ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+        os.replace(tmp_path, arrow_path)
+
+        self._write_json(meta_path, {
+            'year': year,
+            'columns': columns,
+            'sources': self.source_signature(sources),
+        })
+
+    def _cached_columns(self, year, sources):
+        """유효한 캐시에 저장된 컬럼 목록 (전체 컬럼이면 None, 캐시가 없거나 원본이 바뀌었으면 빈 목록)"""
+        arrow_path, meta_path = self._cache_paths(year)
+        if not (os.path.exists(arrow_path) and self._cache_is_valid(meta_path, sources)):
+            return []
+        with open(meta_path, 'r', encoding='utf-8') as f:
+            return json.load(f).get('columns', [])
+
+    def _read_cached_year(self, year, sources, partitioning, columns=None):
+        """
+        columns(None이면 전체)가 캐시에 없으면 기존 컬럼과 합쳐 새로 만든 뒤, 메모리 매핑으로 엽니다.
+        디코딩/압축 해제가 필요 없고, 여러 프로세스가 같은 OS 페이지 캐시를 공유합니다.
+        """
+        arrow_path, _ = self._cache_paths(year)
+        cached = self._cached_columns(year, sources)
+        if cached is not None and (columns is None or not set(columns) <= set(cached)):
+            self._build_cache(year, sources, partitioning,
+                              None if columns is None else sorted(set(cached) | set(columns)))
+
+        source = pa.memory_map(arrow_path, 'r')
+        return pa.ipc.open_file(source).read_all()
+
+    # ------------------------------------------------------
+    # 타석(PA) 단위 테이블
+    # ------------------------------------------------------
+    def _pa_paths(self, year):
+        return (os.path.join(self.pa_dir, f"pa_{year}.parquet"),
+                os.path.join(self.pa_dir, f"pa_{year}.json"))
+
+    def _pa_is_valid(self, year, sources):
+        """타석 테이블이 있고, 같은 생성 방식(PA_TABLE_VERSION)으로 지금의 원본에서 만들어졌으면 유효"""
+        pa_path, meta_path = self._pa_paths(year)
+        return (os.path.exists(pa_path) and self._meta_matches(meta_path, version=PA_TABLE_VERSION)
+                and self._cache_is_valid(meta_path, sources))
+
+    def _build_pa_year(self, year, sources, partitioning):
+        """한 시즌의 투구 단위 데이터를 읽어 타석 단위 테이블로 저장합니다. 반환값: 타석 수"""
+        pa_path, meta_path = self._pa_paths(year)
+        os.makedirs(self.pa_dir, exist_ok=True)
+
+        # 시즌당 한 번만 읽으므로 Arrow 캐시를 거치지 않고 원본에서 필요한 컬럼만 디코딩
+        dataset = self._source_dataset(sources, partitioning)
+        columns = [c for c in PA_SOURCE_COLUMNS if c in dataset.schema.names]
+        pitch_df = dataset.to_table(columns=columns).to_pandas()
+        num_pitches = len(pitch_df)
+        pa_df = build_plate_appearances(pitch_df)
+        del pitch_df
+
+        tmp_path = f"{pa_path}.{os.getpid()}.tmp"
+        pa_df.to_parquet(tmp_path, index=False, row_group_size=ROWS_PER_GROUP)
+        os.replace(tmp_path, pa_path)
+
+        self._write_json(meta_path, {
+            'version': PA_TABLE_VERSION,
+            'year': year,
+            'num_pitches': num_pitches,
+            'num_pa': len(pa_df),
+            'sources': self.source_signature(sources),
+        })
+        return len(pa_df)
+
+    def build_pa_table(self, years=None, force=False):
+        """
+        시즌별 타석 단위 테이블을 만듭니다. 원본이 바뀌지 않은 시즌은 건너뜁니다. (force=True면 전부 새로)
+        반환값: 새로 만든 시즌 목록
+        """
+        sources = self.year_sources(years)
+        partitioning = self._partitioning()
+        built = []
+
+        for year, paths in sources.items():
+            if not force and self._pa_is_valid(year, paths):
+                continue
+            rows = self._build_pa_year(year, paths, partitioning)
+            print(f"   - {year}년 타석 테이블 생성: {rows:,}타석")
+            built.append(year)
+        return built
+
+    def pa_files(self, years=None):
+        """요청한 시즌의 타석 테이블 경로 목록 (없거나 원본이 바뀐 시즌은 먼저 새로 만듦)"""
+        sources = self.year_sources(years)
+        self.build_pa_table(list(sources))
+        return [self._pa_paths(year)[0] for year in sources]
+
+    def load_pa(self, columns=None, filters=None, years=None, compact=False):
+        """
+        타석 단위 테이블을 읽어서 DataFrame으로 반환합니다. (시즌 -> 날짜 -> 경기 -> 타석 순서)
+        투구 단위 데이터 대비 약 1/4 행이며, 순번/결과 플래그가 이미 계산되어 있습니다.
+        columns / filters / compact는 load()와 같은 형식입니다.
+        """
+        paths = self.pa_files(years)
+        if not paths:
             print("❌ 데이터 파일을 찾을 수 없습니다!")
             return None
 
-        print(f"📂 총 {len(files)}개의 연도별 데이터 파일을 찾았습니다.")
-        
-        df_list = []
-        for file in sorted(files):
-            print(f"   - 로딩 중: {os.path.basename(file)} ...")
-            # 필요한 컬럼만 로드하면 속도가 훨씬 빠릅니다 (메모리 절약)
-            # 일단 전체를 로드하고 싶다면 columns=None 으로 두세요.
-            df = pd.read_parquet(file)
-            df_list.append(df)
-            
-        # 하나로 병합
-        print("🔄 데이터 병합 중...")
-        full_df = pd.concat(df_list, ignore_index=True)
-        
+        # 시즌마다 전부 결측인 컬럼의 타입이 다를 수 있으므로 스키마 통합
+        schema = pa.unify_schemas([pq.read_schema(p) for p in paths], promote_options='permissive')
+        table = ds.dataset(paths, format='parquet', schema=schema).to_table(
+            columns=list(columns) if columns is not None else None, filter=_to_expression(filters),
+        )
+        df = table.to_pandas(self_destruct=True, split_blocks=True)
+        return compact_frame(df) if compact else df
+
+    # ------------------------------------------------------
+    # 경기 단위 테이블
+    # ------------------------------------------------------
+    def _game_paths(self, year):
+        return (os.path.join(self.game_dir, f"games_{year}.parquet"),
+                os.path.join(self.game_dir, f"games_{year}.json"))
+
+    def _game_is_valid(self, year, sources):
+        """경기 테이블이 있고, 같은 생성 방식(GAME_TABLE_VERSION / 타석 테이블 PA_TABLE_VERSION)으로 지금의 원본에서 만들어졌으면 유효"""
+        game_path, meta_path = self._game_paths(year)
+        return (os.path.exists(game_path)
+                and self._meta_matches(meta_path, version=GAME_TABLE_VERSION, pa_version=PA_TABLE_VERSION)
+                and self._cache_is_valid(meta_path, sources))
+
+    def _build_game_year(self, year, sources):
+        """한 시즌의 타석 테이블을 경기 단위로 집계해서 저장합니다. 반환값: 경기 수"""
+        game_path, meta_path = self._game_paths(year)
+        os.makedirs(self.game_dir, exist_ok=True)
+
+        pa_path = self._pa_paths(year)[0]
+        missing = [c for c in GAME_SOURCE_COLUMNS if c not in pq.read_schema(pa_path).names]
+        if missing:
+            raise ValueError(f"{year}년 타석 테이블에 경기 테이블 생성에 필요한 컬럼이 없습니다: {missing}")
+        games = build_games(pd.read_parquet(pa_path, columns=GAME_SOURCE_COLUMNS))
+
+        tmp_path = f"{game_path}.{os.getpid()}.tmp"
+        games.to_parquet(tmp_path, index=False)
+        os.replace(tmp_path, game_path)
+
+        self._write_json(meta_path, {
+            'version': GAME_TABLE_VERSION,
+            'pa_version': PA_TABLE_VERSION,
+            'year': year,
+            'num_games': len(games),
+            'sources': self.source_signature(sources),
+        })
+        return len(games)
+
+    def build_game_table(self, years=None, force=False):
+        """
+        시즌별 경기 단위 테이블을 만듭니다. (타석 테이블이 없으면 먼저 생성)
+        원본이 바뀌지 않은 시즌은 건너뜁니다. 반환값: 새로 만든 시즌 목록
+        """
+        sources = self.year_sources(years)
+        self.build_pa_table(list(sources), force=force)
+        built = []
+
+        for year, paths in sources.items():
+            if not force and self._game_is_valid(year, paths):
+                continue
+            rows = self._build_game_year(year, paths)
+            print(f"   - {year}년 경기 테이블 생성: {rows:,}경기")
+            built.append(year)
+        return built
+
+    def load_games(self, columns=None, filters=None, years=None):
+        """
+        경기 단위 테이블을 읽어서 DataFrame으로 반환합니다. (없거나 원본이 바뀐 시즌은 먼저 생성)
+        경기별 최종 점수/승리 팀/양 팀 선발과 선발의 아웃·실점이 들어 있어, 투구 데이터를 훑지 않고 조인할 수 있습니다.
+        """
+        sources = self.year_sources(years)
+        if not sources:
+            print("❌ 데이터 파일을 찾을 수 없습니다!")
+            return None
+
+        self.build_game_table(list(sources))
+        paths = [self._game_paths(year)[0] for year in sources]
+        schema = pa.unify_schemas([pq.read_schema(p) for p in paths], promote_options='permissive')
+        table = ds.dataset(paths, format='parquet', schema=schema).to_table(
+            columns=list(columns) if columns is not None else None, filter=_to_expression(filters),
+        )
+        return table.to_pandas(self_destruct=True, split_blocks=True)
+
+    def _partitioning(self):
+        return ds.partitioning(PARTITION_SCHEMA, flavor='hive') if self.has_dataset() else None
+
+    def _source_dataset(self, sources, partitioning):
+        return ds.dataset(sources, format='parquet', partitioning=partitioning,
+                          partition_base_dir=self.dataset_dir if partitioning else None)
+
+    def _year_dataset(self, year, sources, partitioning, columns=None, filters=None):
+        """
+        한 연도의 Dataset. 캐시를 쓰면 메모리 매핑된 테이블을 감싼 Dataset을 반환합니다.
+        캐시에는 columns와 filters가 참조하는 컬럼만 저장합니다. (Expression 필터면 전체 컬럼)
+        """
+        if self.use_cache:
+            filter_columns = _filter_columns(filters)
+            needed = None if columns is None or filter_columns is None else list(columns) + filter_columns
+            # 메모리 매핑된 테이블에서 필요한 컬럼/행만 선택 (컬럼 선택은 복사 없음)
+            return ds.dataset(self._read_cached_year(year, sources, partitioning, needed))
+        return self._source_dataset(sources, partitioning)
+
+    def _columns(self, columns):
+        if columns is not None:
+            return list(columns)
+        dataset = self.dataset()
+        return [name for name in dataset.schema.names if name not in PARTITION_COLUMNS]
+
+    @staticmethod
+    def _estimated_bytes(paths, columns):
+        """parquet footer의 압축 해제 크기로 디코딩 후 메모리 사용량을 추정합니다."""
+        total = 0
+        for path in paths:
+            meta = pq.read_metadata(path)
+            for i in range(meta.num_row_groups):
+                rg = meta.row_group(i)
+                for j in range(rg.num_columns):
+                    col = rg.column(j)
+                    if columns is None or col.path_in_schema in columns:
+                        total += col.total_uncompressed_size
+        return total
+
+    def iter_year_tables(self, columns=None, filters=None, years=None):
+        """
+        연도별 pyarrow Table을 동시에 디코딩하고, 연도 순서대로 (year, table)을 반환합니다.
+        동시 작업 수는 max_workers, 디코딩 중인 데이터 크기는 memory_limit로 제한됩니다.
+        """
+        sources = self.year_sources(years)
+        if not sources:
+            return
+
+        columns = self._columns(columns)
+        expression = _to_expression(filters)
+        partitioning = self._partitioning()
+
+        def read_year(year):
+            # 연도 간 병렬 처리를 하므로 연도 내부는 단일 스레드로 디코딩 (코어 과점유 방지)
+            dataset = self._year_dataset(year, sources[year], partitioning, columns, filters)
+            return dataset.to_table(columns=columns, filter=expression, use_threads=False)
+
+        yield from parallel_ordered(
+            list(sources), read_year, max_workers=self.max_workers, memory_limit=self.memory_limit,
+            cost_fn=lambda year: self._estimated_bytes(sources[year], columns),
+        )
+
+    def iter_batches(self, years=None, columns=None, batch_rows=64 * 1024, filters=None, as_pandas=False):
+        """
+        전체 데이터를 작은 배치 단위로 한 번 훑는 제너레이터 (연도 -> 파일 순서 유지).
+
+        한 번에 batch_rows행 이하의 RecordBatch(as_pandas=True면 DataFrame)만 메모리에 올라가므로,
+        연도 전체를 pandas로 읽지 않고도 누적 집계를 할 수 있습니다.
+        필터 조건으로 남는 행이 없는 배치는 건너뜁니다.
+        """
+        sources = self.year_sources(years)
+        columns = self._columns(columns) if sources else None
+        expression = _to_expression(filters)
+        partitioning = self._partitioning()
+
+        for year, paths in sources.items():
+            scanner = self._year_dataset(year, paths, partitioning, columns, filters).scanner(
+                columns=columns, filter=expression, batch_size=batch_rows,
+                batch_readahead=1, fragment_readahead=1,
+            )
+            for batch in scanner.to_batches():
+                if batch.num_rows == 0:
+                    continue
+                yield batch.to_pandas() if as_pandas else batch
+
+    def load(self, columns=None, filters=None, years=None, compact=False):
+        """
+        필요한 컬럼/행만 읽어서 DataFrame으로 반환합니다.
+
+        :param columns: 읽을 컬럼 목록 (None이면 전체 컬럼, 파티션 컬럼 year/month는 요청 시에만 포함)
+        :param filters: [('컬럼', '연산자', 값), ...] 형식 또는 pyarrow Expression
+        :param years: 읽을 연도 목록 (파티션/파일 단위로 건너뜀)
+        :param compact: True면 연도별로 읽으면서 메모리 절약형 타입으로 변환 (compact_frame 참고)
+
+        파티션 조건은 폴더 단위로, 나머지 조건은 Row Group 통계(min/max)로 먼저 걸러낸 뒤 읽습니다.
+        연도 파일은 여러 스레드에서 동시에 디코딩됩니다.
+        """
+        if not self.year_sources(years):
+            print("❌ 데이터 파일을 찾을 수 없습니다!")
+            return None
+
+        if compact:
+            return self._load_compact(columns, filters, years)
+
+        tables = [table for _, table in self.iter_year_tables(columns, filters, years)]
+
+        # concat_tables는 버퍼를 복사하지 않고 청크만 이어 붙임.
+        # self_destruct로 변환이 끝난 컬럼의 Arrow 메모리를 바로 해제해 전체 사본이 두 벌 생기지 않도록 함
+        table = pa.concat_tables(tables, promote_options='permissive')
+        del tables
+        return table.to_pandas(self_destruct=True, split_blocks=True)
+
+    def _load_compact(self, columns, filters, years):
+        """연도별로 디코딩하자마자 축소하므로, 원본 타입으로는 진행 중인 연도만 메모리에 올라갑니다."""
+        frames = []
+        before_mb = 0.0
+        for _, table in self.iter_year_tables(columns, filters, years):
+            df = table.to_pandas(self_destruct=True, split_blocks=True)
+            del table
+            before_mb += _memory_mb(df)
+            frames.append(compact_frame(df))
+
+        if not frames:
+            return None
+
+        full_df = pd.concat(unify_categories(frames), ignore_index=True)
+        after_mb = _memory_mb(full_df)
+        self.last_memory_report = {'before_mb': before_mb, 'after_mb': after_mb}
+        print(f"💾 compact 모드: {before_mb:,.1f}MB -> {after_mb:,.1f}MB "
+              f"({(1 - after_mb / before_mb) * 100 if before_mb else 0:.0f}% 절감)")
+        return full_df
+
+    def load_all_years(self, columns=None, compact=False):
+        """
+        모든 연도 데이터를 읽어서 하나로 합칩니다.
+        columns를 지정하면 해당 컬럼만 읽습니다. (메모리 절약)
+        compact=True면 범주형/작은 숫자형으로 변환해서 합칩니다.
+        """
+        years = self.available_years()
+        if not years:
+            print("❌ 데이터 파일을 찾을 수 없습니다!")
+            return None
+
+        print(f"📂 총 {len(years)}개 연도 데이터를 찾았습니다. ({years[0]}~{years[-1]})")
+        full_df = self.load(columns=columns, compact=compact)
+
         print(f"✅ 통합 완료! 총 데이터: {len(full_df):,} 개")
         return full_df
 
 # --- 실행 테스트 ---
 if __name__ == "__main__":
     loader = StatcastLoader()
-    df = loader.load_all_years()
-    
+
+    # 파티션 데이터셋이 없으면 먼저 생성
+    if not loader.has_dataset():
+        loader.build_dataset()
+
+    df = loader.load(columns=['game_date'])
+
     if df is not None:
         # 연도별 데이터 개수 확인 (검증)
         print("\n📊 연도별 데이터 개수 확인:")
         # game_date가 문자열이면 날짜형으로 변환 후 연도 추출
         df['year'] = pd.to_datetime(df['game_date']).dt.year
-        print(df['year'].value_counts().sort_index())
\ No newline at end of file
+        print(df['year'].value_counts().sort_index())
@@ -0,0 +1,120 @@
+# data_science/event_lookup.py
+import numpy as np
+import pandas as pd
+
+# ==========================================================
+# 이벤트(events) / 투구 결과(description) 분류표
+# ==========================================================
+# 분석 스크립트마다 따로 들고 있던 안타/삼진/스윙/컨택 목록과 아웃·루타 계산을 한곳에 모았습니다.
+# 분류는 행마다 함수를 호출하지 않고, 고유 값(보통 수십 개)만 분류표로 만든 뒤
+# 범주 코드(category codes / factorize)로 배열 인덱싱해서 한 번에 처리합니다.
+
+HIT_EVENTS = ['single', 'double', 'triple', 'home_run']
+TOTAL_BASES = {'single': 1, 'double': 2, 'triple': 3, 'home_run': 4}
+STRIKEOUT_EVENTS = ['strikeout', 'strikeout_double_play']
+ONBASE_EVENTS = HIT_EVENTS + ['walk', 'hit_by_pitch']
+
+# 아웃 1개로 세는 이벤트 (병살/삼중살은 이름으로 판단)
+OUT_EVENTS = [
+    'strikeout', 'field_out', 'force_out', 'sac_fly', 'sac_bunt',
+    'fielders_choice', 'fielders_choice_out', 'strikeout_double_play',
+    'caught_stealing_2b', 'caught_stealing_3b', 'caught_stealing_home',
+    'pickoff_caught_stealing_2b', 'pickoff_caught_stealing_3b',
+    'pickoff_caught_stealing_home', 'batter_interference'
+]
+
+# 타수(AB)에서 빠지는 타석 결과 / 타석으로 세지 않는 주루 이벤트
+NON_AB_EVENTS = [
+    'walk', 'intent_walk', 'hit_by_pitch', 'sac_fly', 'sac_bunt', 'sac_fly_double_play',
+    'sac_bunt_double_play', 'catcher_interf', 'batter_interference',
+]
+NON_PA_EVENTS = [
+    'caught_stealing_2b', 'caught_stealing_3b', 'caught_stealing_home',
+    'pickoff_1b', 'pickoff_2b', 'pickoff_3b',
+    'pickoff_caught_stealing_2b', 'pickoff_caught_stealing_3b', 'pickoff_caught_stealing_home',
+    'stolen_base_2b', 'stolen_base_3b', 'stolen_base_home', 'wild_pitch', 'passed_ball',
+    'other_out', 'runner_double_play', 'truncated_pa',
+]
+
+# 안정화 분석(calc_stabilization)에서 쓰던 약식 타수 정의 (결과 비교를 위해 그대로 유지)
+APPROX_AB_EVENTS = ['single', 'double', 'triple', 'home_run', 'strikeout', 'strikeout_double_play', 'field_out']
+
+SWING_DESCRIPTIONS = ['foul', 'foul_bunt', 'foul_tip', 'hit_into_play', 'swinging_strike',
+                      'swinging_strike_blocked', 'missed_bunt']
+CONTACT_DESCRIPTIONS = ['foul', 'foul_bunt', 'foul_tip', 'hit_into_play']
+WHIFF_DESCRIPTIONS = ['swinging_strike', 'swinging_strike_blocked', 'missed_bunt']
+
+EVENT_ATTRIBUTES = [
+    'outs', 'total_bases', 'is_pa', 'is_ab', 'is_ab_approx', 'is_hit', 'is_1b', 'is_2b', 'is_3b', 'is_hr',
+    'is_k', 'is_bb', 'is_ibb', 'is_hbp', 'is_onbase',
+]
+DESCRIPTION_ATTRIBUTES = ['is_swing', 'is_contact', 'is_whiff', 'is_called_strike', 'is_in_play']
+
+
+def event_outs(event):
+    """이벤트 하나의 아웃 카운트 (삼중살 3, 병살 2, 그 외 아웃 이벤트 1)"""
+    if 'triple_play' in event: return 3
+    if 'double_play' in event: return 2
+    if event in OUT_EVENTS: return 1
+    return 0
+
+
+def event_attributes(event):
+    """이벤트 하나의 분류 값 (EVENT_ATTRIBUTES 순서). 분류표를 만들 때 고유 값마다 한 번만 호출됩니다."""
+    return {
+        'outs': event_outs(event),
+        'total_bases': TOTAL_BASES.get(event, 0),
+        'is_pa': event not in NON_PA_EVENTS,
+        'is_ab': event not in NON_AB_EVENTS and event not in NON_PA_EVENTS,
+        'is_ab_approx': event in APPROX_AB_EVENTS,
+        'is_hit': event in HIT_EVENTS,
+        'is_1b': event == 'single',
+        'is_2b': event == 'double',
+        'is_3b': event == 'triple',
+        'is_hr': event == 'home_run',
+        'is_k': event in STRIKEOUT_EVENTS,
+        'is_bb': event == 'walk',
+        'is_ibb': event == 'intent_walk',
+        'is_hbp': event == 'hit_by_pitch',
+        'is_onbase': event in ONBASE_EVENTS,
+    }
+
+
+def description_attributes(description):
+    """투구 결과(description) 하나의 분류 값 (DESCRIPTION_ATTRIBUTES 순서)"""
+    return {
+        'is_swing': description in SWING_DESCRIPTIONS,
+        'is_contact': description in CONTACT_DESCRIPTIONS,
+        'is_whiff': description in WHIFF_DESCRIPTIONS,
+        'is_called_strike': description == 'called_strike',
+        'is_in_play': description.startswith('hit_into_play'),
+    }
+
+
+def _codes(values):
+    """(코드 배열, 고유 값) - category면 기존 코드를 그대로 쓰고, 아니면 factorize. 결측은 -1"""
+    if isinstance(values, pd.Series) and isinstance(values.dtype, pd.CategoricalDtype):
+        return values.cat.codes.to_numpy(), values.cat.categories
+    return pd.factorize(values)
+
+
+def _classify(values, attribute_fn, attributes):
+    codes, uniques = _codes(values)
+    # 고유 값 x 속성 분류표 (마지막 행은 결측용 0)
+    table = np.zeros((len(uniques) + 1, len(attributes)), dtype=np.int8)
+    for i, value in enumerate(uniques):
+        attrs = attribute_fn(str(value))
+        table[i] = [attrs[a] for a in attributes]
+
+    index = values.index if isinstance(values, pd.Series) else None
+    return pd.DataFrame(table[codes], columns=attributes, index=index)
+
+
+def classify_events(events, attributes=EVENT_ATTRIBUTES):
+    """events 컬럼을 분류해서 int8 컬럼들(outs, total_bases, is_hit ...)의 DataFrame으로 반환합니다."""
+    return _classify(events, event_attributes, list(attributes))
+
+
+def classify_descriptions(descriptions, attributes=DESCRIPTION_ATTRIBUTES):
+    """description 컬럼을 분류해서 int8 컬럼들(is_swing, is_contact ...)의 DataFrame으로 반환합니다."""
+    return _classify(descriptions, description_attributes, list(attributes))
@@ -0,0 +1,73 @@
+# data_science/game_table.py
+import numpy as np
+import pandas as pd
+
+# ==========================================================
+# 경기(Game) 단위 테이블 정의
+# ==========================================================
+# 타석(PA) 테이블에서 경기별 최종 점수, 승리 팀, 양 팀 선발 투수와 선발의 아웃/실점을 한 번에 계산합니다.
+# 시즌별로 한 번만 만들어 저장하고 (StatcastLoader.build_game_table), 경기 단위 분석은 load_games()로 시작합니다.
+
+# 경기 테이블 생성 방식 버전 (build_games가 바뀌면 올려서 기존 테이블을 다시 만듦)
+GAME_TABLE_VERSION = 1
+
+# 타석 테이블에서 가져올 컬럼 (하나라도 없으면 경기 테이블을 만들 수 없음)
+GAME_SOURCE_COLUMNS = [
+    'game_pk', 'game_date', 'game_year', 'game_type', 'home_team', 'away_team',
+    'inning', 'inning_topbot', 'at_bat_number', 'pitch_number', 'pitcher',
+    'post_home_score', 'post_away_score', 'outs',
+]
+
+
+def _starters(pa_df, topbot):
+    """1회 초(Top) 또는 말(Bot)에 가장 먼저 던진 투수 = 수비 팀 선발"""
+    first_inning = pa_df[(pa_df['inning'] == 1) & (pa_df['inning_topbot'] == topbot)]
+    return first_inning.drop_duplicates('game_pk').set_index('game_pk')['pitcher']
+
+
+def build_games(pa_df):
+    """
+    한 시즌의 타석 단위 DataFrame을 경기 단위로 변환합니다. (경기별 Python 루프 없음)
+
+    - home_score / away_score: 경기 마지막 타석 이후 점수, winner: 'home' / 'away' / None(무승부)
+    - home_starter: 1회 초 수비(홈팀) 선발, away_starter: 1회 말 수비(원정팀) 선발
+    - *_starter_outs: 선발이 그 경기에서 잡은 아웃 수, *_starter_runs: 선발이 던지는 동안 상대 팀 최대 점수
+    """
+    pa_df = pa_df.sort_values(by=['game_pk', 'at_bat_number', 'pitch_number'])
+
+    # 경기 마지막 타석 = 최종 점수
+    last = pa_df.drop_duplicates('game_pk', keep='last').set_index('game_pk')
+    games = pd.DataFrame({
+        'game_date': last['game_date'],
+        'game_year': last['game_year'],
+        'game_type': last['game_type'],
+        'home_team': last['home_team'],
+        'away_team': last['away_team'],
+        'home_score': last['post_home_score'],
+        'away_score': last['post_away_score'],
+    })
+    games['winner'] = np.select(
+        [games['home_score'] > games['away_score'], games['home_score'] < games['away_score']],
+        ['home', 'away'], default=None,
+    )
+
+    # 투수별 경기 내 아웃 합계 / 상대 최대 점수
+    by_pitcher = pa_df.groupby(['game_pk', 'pitcher']).agg(
+        outs=('outs', 'sum'),
+        max_home=('post_home_score', 'max'),
+        max_away=('post_away_score', 'max'),
+    )
+
+    # 홈팀 선발은 원정팀 점수(post_away_score)를, 원정팀 선발은 홈팀 점수를 허용 실점으로 봄
+    for side, topbot, runs_col in (('home', 'Top', 'max_away'), ('away', 'Bot', 'max_home')):
+        starter = _starters(pa_df, topbot)
+        keys = pd.MultiIndex.from_arrays([starter.index, starter.to_numpy()])
+        stats = by_pitcher.reindex(keys)
+
+        games[f'{side}_starter'] = starter.reindex(games.index).astype('Int64')
+        games[f'{side}_starter_outs'] = pd.Series(stats['outs'].to_numpy(), index=starter.index) \
+            .reindex(games.index).astype('Int64')
+        games[f'{side}_starter_runs'] = pd.Series(stats[runs_col].to_numpy(), index=starter.index) \
+            .reindex(games.index).astype('Int64')
+
+    return games.reset_index()
@@ -1,8 +1,12 @@
 import pandas as pd
-import glob
 import os
+import sys
 import json
 
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from data_loader import StatcastLoader
+from statcast_catalog import StatcastCatalog
+
 # 경로 설정
 base_dir = os.path.dirname(os.path.abspath(__file__))
 data_dir = os.path.join(base_dir, '..', 'simulation', 'data')
@@ -19,43 +23,52 @@ def generate_dashboard_data():
         "top_pitchers": {}
     }
     
-    # 모든 파케이 파일 찾기
-    files = sorted(glob.glob(os.path.join(data_dir, "statcast_*.parquet")))
+    # 읽을 수 있는 연도 찾기 (파티션 데이터셋 또는 연도별 파일)
+    loader = StatcastLoader(data_dir)
+    years = loader.available_years()
     
-    if not files:
+    if not years:
         print("❌ 데이터 파일이 없습니다.")
         return
 
-    # 메모리 터짐 방지를 위해 파일 하나씩 열어서 집계 (Chunk processing)
+    # 연도별 행 수는 카탈로그에서 가져옴 (새로 생기거나 바뀐 연도 파일만 다시 계산)
+    catalog = StatcastCatalog(data_dir)
+    catalog.refresh()
+
+    # 메모리 터짐 방지를 위해 작은 배치 단위로 한 번만 훑으며 집계 (Streaming)
     all_pitch_types = pd.Series(dtype='int')
     all_pitchers = pd.Series(dtype='int')
+    pitcher_names = {}  # MLBAM id -> 가장 최근에 본 이름 (선수 테이블을 따로 만들지 않도록 같이 훑음)
 
-    for file in files:
-        filename = os.path.basename(file)
-        print(f"   Reading {filename}...")
+    for year in years:
+        print(f"   Reading {year}...")
+        count = 0
         
-        df = pd.read_parquet(file, columns=['game_date', 'pitch_type', 'player_name'])
+        for df in loader.iter_batches(years=[year], columns=['pitch_type', 'pitcher', 'player_name'], as_pandas=True):
+            count += len(df)
+            
+            # 2. 구종 집계 누적
+            all_pitch_types = all_pitch_types.add(df['pitch_type'].value_counts(), fill_value=0)
+            
+            # 3. 투수별 집계 누적 (이름 대신 MLBAM id로 집계)
+            all_pitchers = all_pitchers.add(df['pitcher'].value_counts(), fill_value=0)
+            latest = df.dropna(subset=['player_name']).drop_duplicates('pitcher', keep='last')
+            pitcher_names.update(zip(latest['pitcher'].tolist(), latest['player_name'].tolist()))
         
-        # 1. 연도 추출 및 개수 세기
-        year = str(pd.to_datetime(df['game_date'].iloc[0]).year)
-        count = len(df)
-        summary['years'][year] = count
+        # 1. 연도별 개수 (카탈로그에 없는 연도만 직접 센 값 사용)
+        entry = catalog.entry(year)
+        if entry is not None:
+            count = entry['num_rows']
+        summary['years'][str(year)] = count
         summary['total_pitches'] += count
-        
-        # 2. 구종 집계 누적
-        type_counts = df['pitch_type'].value_counts()
-        all_pitch_types = all_pitch_types.add(type_counts, fill_value=0)
-        
-        # 3. 투수별 집계 누적
-        pitcher_counts = df['player_name'].value_counts()
-        all_pitchers = all_pitchers.add(pitcher_counts, fill_value=0)
 
     # 집계 데이터 정리 (정수형 변환)
     # 구종 Top 10
     summary['pitch_types'] = all_pitch_types.sort_values(ascending=False).head(10).astype(int).to_dict()
     
-    # 투수 Top 10
-    summary['top_pitchers'] = all_pitchers.sort_values(ascending=False).head(10).astype(int).to_dict()
+    # 투수 Top 10 (id로 집계한 뒤 이름은 표시할 때만 찾음)
+    top_pitchers = all_pitchers.sort_values(ascending=False).head(10).astype(int)
+    summary['top_pitchers'] = {pitcher_names.get(int(pid), str(int(pid))): count for pid, count in top_pitchers.items()}
 
     # JSON 파일로 저장
     with open(output_file, 'w', encoding='utf-8') as f:
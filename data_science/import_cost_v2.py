@@ -2,26 +2,19 @@ import os
 import django
 import pandas as pd
 import sys
-import unicodedata
 
 # Django 설정 로드
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
 django.setup()
 
 from analysis.models import MlbPlayerCost
+from player_dim import load_players, name_to_id, normalize_name
 
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 DATA_DIR = os.path.join(BASE_DIR, 'data_science', 'data')
 
-def normalize_name(name):
-    """ 이름 정규화 (악센트 제거, 소문자 변환 등) """
-    if not isinstance(name, str):
-        return ""
-    nfkd_form = unicodedata.normalize('NFKD', name)
-    only_ascii = "".join([c for c in nfkd_form if not unicodedata.combining(c)])
-    return only_ascii.lower().replace('.', '').strip()
-
 def clean_currency(value):
     """ $81.00 -> 81000000 변환 """
     if pd.isna(value) or value == '':
@@ -40,6 +33,12 @@ def import_data():
     years = range(2020, 2026) 
     types = ['batter', 'pitcher']
     
+    # 투수 이름 -> MLBAM id 매핑 (선수 차원 테이블, Statcast 데이터가 없으면 id 없이 저장)
+    # 선수 차원 테이블에는 투수 이름만 있으므로 타자는 id를 채우지 않음
+    # (동명이인 투수의 id가 잘못 연결되는 것을 막기 위해 - 타자 이름 출처가 생기면 추가)
+    players = load_players()
+    pitcher_ids = name_to_id(players[players['is_pitcher']]) if players is not None else {}
+
     print("🗑️ 기존 데이터 삭제 중...")
     MlbPlayerCost.objects.all().delete()
 
@@ -109,6 +108,7 @@ def import_data():
                     player = MlbPlayerCost(
                         year=year,
                         name=raw_name,
+                        player_id=pitcher_ids.get(target_name) if p_type == 'pitcher' else None,
                         team=team,
                         player_type=p_type,
                         salary=salary_val,
@@ -37,7 +37,7 @@ def import_data():
         print("✅ DB 연결 수립 완료")
 
     required_cols = [
-        'player_name', 'game_date', 'p_throws', 'pitch_type',
+        'player_name', 'pitcher', 'game_date', 'p_throws', 'pitch_type',
         'release_speed', 'release_pos_x', 'release_pos_y', 'release_pos_z',
         'vx0', 'vy0', 'vz0', 'ax', 'ay', 'az',
         'sz_top', 'sz_bot', 'pfx_x', 'pfx_z',
@@ -58,12 +58,16 @@ def import_data():
         ) as reader:
             
             for chunk in reader:
+                # 투수 MLBAM id는 선수 차원 테이블 키(player_id)로 저장
+                chunk = chunk.rename(columns={'pitcher': 'player_id'})
                 chunk = chunk.replace({np.nan: None})
                 
                 objs = []
                 for row in chunk.to_dict('records'):
                     if not row.get('player_name'): 
                         continue
+                    if row.get('player_id') is not None:
+                        row['player_id'] = int(row['player_id'])
                     objs.append(PitchData(**row))
                 
                 if objs:
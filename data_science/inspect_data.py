@@ -1,6 +1,10 @@
 # data_science/inspect_data.py
 import pandas as pd
 import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from statcast_catalog import StatcastCatalog
 
 # 확인하고 싶은 연도 설정 (문제가 있는 연도 중 하나 선택)
 TARGET_YEAR = 2025  
@@ -16,24 +20,31 @@ def inspect_parquet():
     print(f"🕵️‍♂️ {TARGET_YEAR}년 데이터 정밀 분석 중...")
     
     try:
-        # 1. 데이터 로드
-        df = pd.read_parquet(DATA_PATH)
-        print(f"✅ 파일 로드 성공! (총 행 개수: {len(df):,} rows)")
+        # 1. 행 수 / 날짜 범위 / 경기 수는 카탈로그에서 바로 확인 (데이터 파일을 읽지 않음)
+        catalog = StatcastCatalog(os.path.dirname(DATA_PATH))
+        if catalog.is_stale(TARGET_YEAR, DATA_PATH):
+            print("📒 카탈로그 항목이 없거나 오래되어 다시 계산합니다...")
+            catalog.update(DATA_PATH)
+        entry = catalog.entry(TARGET_YEAR)
+        columns = [c['name'] for c in entry['schema']]
+        print(f"✅ 카탈로그 확인! (총 행 개수: {entry['num_rows']:,} rows)")
         
         # 2. 날짜 범위 확인 (가장 의심되는 부분)
-        if 'game_date' in df.columns:
-            dates = df['game_date'].unique()
+        if 'game_date' in columns:
             print(f"\n📅 데이터 날짜 범위:")
-            print(f"   - 시작일: {min(dates)}")
-            print(f"   - 종료일: {max(dates)}")
-            print(f"   - 수집된 날짜 수: {len(dates)}일")
+            print(f"   - 시작일: {entry['min_game_date']}")
+            print(f"   - 종료일: {entry['max_game_date']}")
+            print(f"   - 수집된 날짜 수: {entry['num_dates']}일")
         else:
             print("\n⚠️ 'game_date' 컬럼이 없습니다.")
 
         # 3. 게임 수 확인
-        if 'game_pk' in df.columns:
-            games = df['game_pk'].nunique()
-            print(f"\n⚾ 고유 경기(Game PK) 수: {games} 경기 (정상 범위: 약 2,400 경기)")
+        if 'game_pk' in columns:
+            print(f"\n⚾ 고유 경기(Game PK) 수: {entry['num_games']} 경기 (정상 범위: 약 2,400 경기)")
+
+        # 4~5. 분포/샘플은 카탈로그에 없으므로 필요한 컬럼만 읽음
+        sample_columns = [c for c in ('game_type', 'inning_topbot') if c in columns]
+        df = pd.read_parquet(DATA_PATH, columns=sample_columns) if sample_columns else pd.DataFrame()
         
         # 4. 게임 타입 확인 (정규시즌 'R' 필터링 문제인지 확인)
         if 'game_type' in df.columns:
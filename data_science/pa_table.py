@@ -0,0 +1,66 @@
+# data_science/pa_table.py
+import os
+import sys
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from event_lookup import classify_events
+
+# ==========================================================
+# 타석(PA) 단위 테이블 정의
+# ==========================================================
+# 투구 단위 Statcast 데이터에서 events가 있는 행(타석 결과가 나온 투구)만 남기고,
+# 분석에서 반복해서 만들던 순번/결과 플래그/루타/아웃 수를 미리 계산해 둡니다.
+# 시즌별로 한 번만 만들어 저장하고 (StatcastLoader.build_pa_table), 분석은 load_pa()로 시작합니다.
+
+# 투구 단위 데이터에서 가져올 컬럼 (원본에 없는 컬럼은 건너뜀)
+PA_SOURCE_COLUMNS = [
+    'game_year', 'game_date', 'game_pk', 'game_type', 'home_team', 'away_team',
+    'inning', 'inning_topbot', 'outs_when_up', 'at_bat_number', 'pitch_number',
+    'batter', 'pitcher', 'player_name', 'stand', 'p_throws',
+    'events', 'description', 'bb_type', 'launch_speed', 'launch_angle',
+    'home_score', 'away_score', 'post_home_score', 'post_away_score',
+]
+
+# 타석 테이블 생성 방식 버전 (build_plate_appearances / event_lookup 분류표가 바뀌면 올려서 기존 테이블을 다시 만듦)
+PA_TABLE_VERSION = 1
+
+# 타석 테이블에 저장할 결과 플래그 (event_lookup 분류표 기준)
+PA_FLAG_COLUMNS = ['is_pa', 'is_ab', 'is_hit', 'is_1b', 'is_2b', 'is_3b', 'is_hr',
+                   'is_k', 'is_bb', 'is_ibb', 'is_hbp', 'is_onbase']
+
+
+def build_plate_appearances(df):
+    """
+    한 시즌의 투구 단위 DataFrame을 타석 단위로 변환합니다.
+
+    - pitch_index: 시즌 원본(투구 단위)에서의 행 위치 (투구 단위 분석과 순서/짝홀을 맞출 때 사용)
+    - n_pitches: 해당 타석의 투구 수
+    - pa_count_season / pitcher_pa_count_season: 시즌 내 타자/투수별 타석 순번 (1부터)
+    - is_*: 결과 플래그 (int8), total_bases: 루타 수, outs: 해당 이벤트로 잡은 아웃 수
+    """
+    df = df.reset_index(drop=True)
+    if 'game_year' not in df.columns:
+        df['game_year'] = pd.to_datetime(df['game_date']).dt.year
+
+    # 타석별 투구 수 (결과가 나온 투구에 붙임)
+    n_pitches = df.groupby(['game_pk', 'at_bat_number'], sort=False)['at_bat_number'].transform('size')
+
+    pa_df = df[df['events'].notnull()].copy()
+    pa_df['pitch_index'] = pa_df.index.astype(np.int64)
+    pa_df['n_pitches'] = n_pitches[pa_df.index].astype(np.int16)
+
+    # 날짜 -> 경기 -> 타석 순으로 한 번만 정렬
+    pa_df = pa_df.sort_values(by=['game_date', 'game_pk', 'at_bat_number']).reset_index(drop=True)
+    pa_df['pa_count_season'] = pa_df.groupby(['game_year', 'batter']).cumcount() + 1
+    pa_df['pitcher_pa_count_season'] = pa_df.groupby(['game_year', 'pitcher']).cumcount() + 1
+
+    # 결과 플래그 / 루타 / 아웃 수는 이벤트 분류표로 한 번에 계산
+    classified = classify_events(pa_df['events'], PA_FLAG_COLUMNS + ['total_bases', 'outs'])
+    for name in PA_FLAG_COLUMNS:
+        pa_df[name] = classified[name]
+    pa_df['is_batted'] = pa_df['bb_type'].notnull().astype(np.int8)
+    pa_df['total_bases'] = classified['total_bases']
+    pa_df['outs'] = classified['outs']
+    return pa_df
@@ -0,0 +1,127 @@
+# data_science/player_dim.py
+import os
+import sys
+import unicodedata
+import numpy as np
+import pandas as pd
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(current_dir)
+from data_loader import StatcastLoader
+
+# ==========================================================
+# 선수 차원(Dimension) 테이블
+# ==========================================================
+# Statcast의 batter / pitcher 컬럼에 있는 MLBAM id(정수)를 키로, 이름과 이름 변형들을 함께 저장합니다.
+# 분석 파이프라인은 정수 id로 그룹핑/조인하고, 이름은 화면에 보여줄 때만 이 테이블에서 찾아 씁니다.
+DATA_DIR = os.path.normpath(os.path.join(current_dir, '..', 'simulation', 'data'))
+PLAYERS_FILE_NAME = 'players.parquet'
+
+# 시즌 키 = id * SEASON_KEY_BASE + 연도 (예: 543037_2024 -> 5430372024)
+SEASON_KEY_BASE = 10000
+
+
+def normalize_name(name):
+    """ 이름 정규화 (악센트 제거, 소문자 변환 등) """
+    if not isinstance(name, str):
+        return ""
+    nfkd_form = unicodedata.normalize('NFKD', name)
+    only_ascii = "".join([c for c in nfkd_form if not unicodedata.combining(c)])
+    return only_ascii.lower().replace('.', '').strip()
+
+
+def display_name(name):
+    """Statcast 형식 'Last, First'를 'First Last'로 바꿉니다."""
+    if not isinstance(name, str):
+        return None
+    last, sep, first = name.partition(', ')
+    return f"{first} {last}" if sep else name
+
+
+def season_key(player_ids, years):
+    """선수-시즌 단위 그룹핑용 정수 키 (문자열 결합 대신 사용)"""
+    return np.asarray(player_ids, dtype=np.int64) * SEASON_KEY_BASE + np.asarray(years, dtype=np.int64)
+
+
+def players_path(data_dir=DATA_DIR):
+    return os.path.join(os.path.normpath(data_dir), PLAYERS_FILE_NAME)
+
+
+def build_players(loader=None):
+    """
+    시즌별 타석 테이블에서 선수 차원 테이블을 만들어 저장합니다.
+    - 투수: Statcast player_name이 투수 이름이므로 이름/이름 변형을 함께 기록
+    - 타자: id만 기록 (Statcast 데이터에는 타자 이름이 없음)
+    반환값: 선수 DataFrame (player_id 순)
+    """
+    loader = loader or StatcastLoader(DATA_DIR)
+    pa_df = loader.load_pa(columns=['game_year', 'batter', 'pitcher', 'player_name'])
+    if pa_df is None:
+        return None
+
+    # 투수별 (연도, 이름) 조합 - 가장 최근 시즌 이름을 대표 이름으로 사용
+    pitcher_names = (pa_df[['pitcher', 'game_year', 'player_name']].dropna()
+                     .drop_duplicates()
+                     .sort_values(['pitcher', 'game_year']))
+    variants = pitcher_names.groupby('pitcher')['player_name'].agg(lambda s: sorted(set(s)))
+    latest = pitcher_names.drop_duplicates('pitcher', keep='last').set_index('pitcher')['player_name']
+
+    roles = pd.concat([
+        pa_df[['pitcher', 'game_year']].rename(columns={'pitcher': 'player_id'}).assign(is_pitcher=True, is_batter=False),
+        pa_df[['batter', 'game_year']].rename(columns={'batter': 'player_id'}).assign(is_pitcher=False, is_batter=True),
+    ]).groupby('player_id').agg(
+        is_pitcher=('is_pitcher', 'any'),
+        is_batter=('is_batter', 'any'),
+        first_year=('game_year', 'min'),
+        last_year=('game_year', 'max'),
+    )
+
+    players = roles.join(latest.rename('name')).join(variants.rename('name_variants'))
+    players['name_variants'] = [v if isinstance(v, list) else [] for v in players['name_variants']]
+    players['display_name'] = players['name'].map(display_name)
+    players['name_key'] = players['display_name'].map(lambda n: normalize_name(n) if isinstance(n, str) else None)
+    players = players.reset_index()
+    players['player_id'] = players['player_id'].astype(np.int32)
+    players[['first_year', 'last_year']] = players[['first_year', 'last_year']].astype(np.int16)
+
+    players = players[['player_id', 'name', 'display_name', 'name_key', 'name_variants',
+                       'is_pitcher', 'is_batter', 'first_year', 'last_year']]
+
+    path = players_path(loader.data_dir)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    players.to_parquet(tmp_path, index=False)
+    os.replace(tmp_path, path)
+    return players
+
+
+def load_players(data_dir=DATA_DIR):
+    """선수 차원 테이블을 읽습니다. 없으면 새로 만듭니다."""
+    path = players_path(data_dir)
+    if not os.path.exists(path):
+        return build_players(StatcastLoader(data_dir))
+    return pd.read_parquet(path)
+
+
+def id_to_name(players, display=True):
+    """{player_id: 이름} Series (화면 표시용)"""
+    return players.set_index('player_id')['display_name' if display else 'name']
+
+
+def name_to_id(players):
+    """
+    정규화한 이름(및 이름 변형) -> player_id 사전.
+    같은 이름의 선수가 여럿이면 모호하므로 사전에서 제외합니다.
+    """
+    pairs = {}
+    for player_id, variants in zip(players['player_id'], players['name_variants']):
+        for name in variants:
+            for key in {normalize_name(name), normalize_name(display_name(name))}:
+                pairs.setdefault(key, set()).add(int(player_id))
+    return {key: ids.pop() for key, ids in pairs.items() if key and len(ids) == 1}
+
+
+if __name__ == "__main__":
+    players = build_players()
+    if players is not None:
+        print(f"👤 선수 차원 테이블 저장: {players_path()}")
+        print(f"   - 투수 {int(players['is_pitcher'].sum()):,}명 / 타자 {int(players['is_batter'].sum()):,}명")
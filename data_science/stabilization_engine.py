@@ -0,0 +1,320 @@
+# data_science/stabilization_engine.py
+import numpy as np
+import pandas as pd
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+# ==========================================================
+# 반분 신뢰도(split-half) 계산 엔진
+# ==========================================================
+# 스탯마다, 기준 타석(threshold)마다 전체 데이터를 다시 groupby 하지 않고,
+# 선수별 반분(A/B) 합계와 개수를 스탯당 한 번만 bincount로 구한 뒤 모든 기준을 선수 배열 위에서 훑습니다.
+# 결과는 기존 groupby 방식(선수별 A/B 평균의 피어슨 r -> 스피어만-브라운 보정)과 같습니다.
+
+# 기준 타석별로 계산을 건너뛰는 조건 (기존 calc_stabilization과 동일)
+MIN_PLAYERS = 50  # 기준을 넘는 선수가 이보다 적으면 건너뜀
+MIN_PAIRS = 30    # A/B 양쪽에 기록이 있는 선수가 이보다 많아야 계산
+
+# 무작위 반분(random split-half) 반복 설정
+RESAMPLES = 200       # 반분을 다시 나누는 횟수
+RESAMPLE_SEED = 42    # 같은 데이터면 같은 결과가 나오도록 고정
+CI_LEVEL = 0.95       # 보정 신뢰도 분포의 구간 (백분위)
+MAX_LEVELS = 16       # 값 종류가 이 이하이면 (0/1 플래그, 루타 수 등) 값별 개수 행렬로 반분
+RESAMPLE_CHUNK_CELLS = 20_000_000  # 연속형 값의 행 단위 반분에서 한 번에 만드는 (반복 x 행) 배열 크기 상한
+
+# 워커 프로세스에서 공유 메모리에 붙인 컬럼들 {(데이터 이름, 컬럼명): 배열}
+_shared_columns = {}
+_shared_blocks = []
+
+
+def player_codes(ids):
+    """선수(-시즌) id를 0..n-1 정수 코드로 바꿉니다. 코드 순서 = id 정렬 순서 (groupby 결과와 같은 순서)"""
+    codes, uniques = pd.factorize(np.asarray(ids), sort=True)
+    return codes, len(uniques)
+
+
+def half_totals(codes, n_players, half, values, mask=None):
+    """
+    선수별 반분 합계/개수를 한 번에 구합니다.
+    half: 0이면 A, 1이면 B / mask: 분모 조건 (None이면 전체 행)
+    반환: (4, 선수 수) 배열 - [A 개수, A 합계, B 개수, B 합계]
+    결측(NaN) 값은 개수/합계 모두에서 제외합니다. (groupby 평균과 같음)
+    """
+    values = np.asarray(values)
+    if np.issubdtype(values.dtype, np.floating):
+        valid = ~np.isnan(values)
+        mask = valid if mask is None else (mask & valid)
+    if mask is not None:
+        codes, half, values = codes[mask], half[mask], values[mask]
+    index = codes.astype(np.int64) * 2 + half
+    counts = np.bincount(index, minlength=n_players * 2).reshape(n_players, 2)
+    sums = np.bincount(index, weights=values, minlength=n_players * 2).reshape(n_players, 2)
+    return np.stack([counts[:, 0], sums[:, 0], counts[:, 1], sums[:, 1]])
+
+
+def spearman_brown(r):
+    """반분 상관계수를 전체 길이 신뢰도로 보정"""
+    return (2 * r) / (1 + r)
+
+
+def split_half_r(totals, players):
+    """선택한 선수들(불리언 배열)의 A/B 평균 피어슨 r. A/B 양쪽 기록이 MIN_PAIRS 이하이면 None"""
+    count_a, sum_a, count_b, sum_b = totals[:, players]
+    paired = (count_a > 0) & (count_b > 0)
+    if np.count_nonzero(paired) <= MIN_PAIRS:
+        return None
+    mean_a = sum_a[paired] / count_a[paired]
+    mean_b = sum_b[paired] / count_b[paired]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        r = np.corrcoef(mean_a, mean_b)[0, 1]
+    return None if np.isnan(r) else r
+
+
+def threshold_sweep(totals, thresholds):
+    """
+    기준 타석마다 (기준, 보정 신뢰도)를 반환합니다.
+    선수별 전체 개수(A+B)를 한 번 정렬해 두고, 기준을 넘는 선수 수는 searchsorted로 바로 셉니다.
+    """
+    n_total = totals[0] + totals[2]
+    sorted_total = np.sort(n_total)
+
+    results = []
+    for threshold in thresholds:
+        n_valid = len(sorted_total) - np.searchsorted(sorted_total, threshold, side='left')
+        if n_valid < MIN_PLAYERS:
+            continue
+        r = split_half_r(totals, n_total >= threshold)
+        if r is not None:
+            results.append((threshold, spearman_brown(r)))
+    return results
+
+
+# ==========================================================
+# 무작위 반분 반복 (선수별 값 개수 행렬 위에서 한 번에)
+# ==========================================================
+# 홀짝 분할 하나는 임의로 정한 분할 한 번이라 곡선이 흔들립니다.
+# 선수마다 기록을 무작위로 절반씩 나누는 일을 RESAMPLES번 반복하고, 보정 신뢰도의 평균과 구간을 구합니다.
+# 값 종류가 적으면 (선수 x 값) 개수 행렬에서 초기하분포로 A쪽 개수를 (반복 x 선수) 배열로 한 번에 뽑으므로
+# 반복마다 행을 다시 나누지 않습니다. (반복 횟수만큼의 Python 루프 없음)
+def level_counts(codes, n_players, values, mask=None):
+    """(값 종류, 선수 x 값 종류 개수 행렬). 값 종류가 MAX_LEVELS보다 많으면 None"""
+    if mask is not None:
+        codes, values = codes[mask], values[mask]
+    level_codes, levels = pd.factorize(values, sort=True)
+    if len(levels) > MAX_LEVELS:
+        return None
+    index = codes.astype(np.int64) * len(levels) + level_codes
+    counts = np.bincount(index, minlength=n_players * len(levels)).reshape(n_players, len(levels))
+    return np.asarray(levels, dtype=np.float64), counts
+
+
+def random_half_sums(levels, counts, n_resamples, rng):
+    """
+    선수마다 기록 n개 중 n // 2개를 무작위로 A에 배정했을 때의 A쪽 합계 (반복 x 선수).
+    값 종류마다 남은 기록에서 A에 들어갈 개수를 초기하분포로 뽑습니다. (루프는 값 종류 수만큼)
+    """
+    remaining = counts.sum(axis=1)
+    draw = np.broadcast_to(remaining // 2, (n_resamples, len(remaining)))
+    sum_a = np.zeros(draw.shape)
+    for j, level in enumerate(levels):
+        good = counts[:, j]
+        remaining = remaining - good
+        taken = draw if j == len(levels) - 1 else rng.hypergeometric(good, remaining, draw, size=draw.shape)
+        sum_a += taken * level
+        draw = draw - taken
+    return sum_a
+
+
+def random_half_rows(codes, n_players, values, mask, n_resamples, rng):
+    """
+    값 종류가 많은 연속형 스탯(타구 속도 등)용: 행마다 A/B를 무작위로 배정한 A쪽 (합계, 개수) (반복 x 선수).
+    (반복 x 행) 배열이 RESAMPLE_CHUNK_CELLS를 넘지 않도록 반복을 몇 개씩 묶어서 계산합니다.
+    """
+    if mask is not None:
+        codes, values = codes[mask], values[mask]
+    order = np.argsort(codes, kind='stable')
+    codes, values = codes[order], values[order].astype(np.float64)
+    present, starts = np.unique(codes, return_index=True)
+
+    sum_a = np.zeros((n_resamples, n_players))
+    count_a = np.zeros((n_resamples, n_players))
+    chunk = max(1, RESAMPLE_CHUNK_CELLS // max(len(values), 1))
+    for begin in range(0, n_resamples, chunk):
+        size = min(chunk, n_resamples - begin)
+        # 행마다 무작위 비트 1개 (바이트로 뽑아서 펼침), A에 배정된 행 = 1
+        bits = rng.integers(0, 256, (size, len(values) // 8 + 1), dtype=np.uint8)
+        in_a = np.unpackbits(bits, axis=1)[:, :len(values)].astype(np.float64)
+        count_a[begin:begin + size, present] = np.add.reduceat(in_a, starts, axis=1)
+        in_a *= values
+        sum_a[begin:begin + size, present] = np.add.reduceat(in_a, starts, axis=1)
+    return sum_a, count_a
+
+
+def batched_corr(a, b):
+    """행(반복)마다 a와 b의 피어슨 r (반복 수 길이 배열)"""
+    a = a - a.mean(axis=1, keepdims=True)
+    b = b - b.mean(axis=1, keepdims=True)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return (a * b).sum(axis=1) / np.sqrt((a * a).sum(axis=1) * (b * b).sum(axis=1))
+
+
+def resampled_curve(codes, n_players, values, mask, thresholds, n_resamples=RESAMPLES, seed=RESAMPLE_SEED):
+    """
+    기준 타석마다 (기준, 보정 신뢰도 평균, 구간 하한, 구간 상한)을 반환합니다.
+    기준을 넘는 선수만 골라 (반복 x 선수) 평균 배열로 반복별 r을 한 번에 구합니다.
+    """
+    rng = np.random.default_rng(seed)
+    values = np.asarray(values, dtype=np.float64)
+    mask = ~np.isnan(values) if mask is None else (mask & ~np.isnan(values))  # 결측 값은 제외
+    min_threshold = min(thresholds)
+
+    leveled = level_counts(codes, n_players, values, mask)
+    if leveled is not None:
+        levels, counts = leveled
+        n_total = counts.sum(axis=1)
+        keep = n_total >= min_threshold
+        counts, n_total = counts[keep], n_total[keep]
+        sum_total = counts @ levels
+        sum_a = random_half_sums(levels, counts, n_resamples, rng)
+        count_a = np.broadcast_to(n_total // 2, sum_a.shape)
+    else:
+        totals = half_totals(codes, n_players, np.zeros(len(codes), dtype=np.int8), values, mask)
+        n_total, sum_total = totals[0], totals[1]
+        keep = n_total >= min_threshold
+        n_total, sum_total = n_total[keep], sum_total[keep]
+        sum_a, count_a = random_half_rows(codes, n_players, values, mask, n_resamples, rng)
+        sum_a, count_a = sum_a[:, keep], count_a[:, keep]
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        mean_a = sum_a / count_a
+        mean_b = (sum_total - sum_a) / (n_total - count_a)
+
+    alpha = (1 - CI_LEVEL) / 2 * 100
+    results = []
+    for threshold in thresholds:
+        players = n_total >= threshold
+        if np.count_nonzero(players) < MIN_PLAYERS or np.count_nonzero(players) <= MIN_PAIRS:
+            continue
+        r = batched_corr(mean_a[:, players], mean_b[:, players])
+        corrected = spearman_brown(r[~np.isnan(r)])
+        if len(corrected) == 0:
+            continue
+        low, high = np.percentile(corrected, [alpha, 100 - alpha])
+        results.append((threshold, corrected.mean(), low, high))
+    return results
+
+
+# ==========================================================
+# 폐쇄형(closed-form) 추정: 선수별 (개수, 합계, 제곱합)만으로 계산
+# ==========================================================
+# 관측 비율의 선수 간 분산 = 실력(참값) 분산 + 표본 오차 분산 (일원 랜덤효과 분산분해).
+# 0/1 스탯이면 선수별 (성공 수, 시행 수)에 대한 베타-이항 적률 추정과 같습니다.
+# 투구/타석 단위 데이터 없이 작은 선수-시즌 집계 테이블만 있으면 됩니다.
+def variance_components(n, sums, sumsq):
+    """
+    선수별 (개수, 합계, 제곱합) 배열 -> (실력 분산, 선수 내 분산)
+    선수 내 분산은 합동(pooled) 추정, 실력 분산은 관측 분산에서 표본 오차 몫을 뺀 값 (음수면 0)
+    """
+    n = np.asarray(n, dtype=np.float64)
+    sums = np.asarray(sums, dtype=np.float64)
+    sumsq = np.asarray(sumsq, dtype=np.float64)
+    means = sums / n
+    within = max((sumsq - sums * means).sum() / (n - 1).sum(), 0.0)
+    observed = means.var(ddof=1)
+    return max(observed - within * np.mean(1 / n), 0.0), within
+
+
+def closed_form_curve(n, sums, sumsq, thresholds):
+    """
+    기준 타석마다 (기준, 신뢰도)를 반환합니다.
+    기준 이상 기록이 있는 선수들로 분산을 나눈 뒤, 기록이 정확히 기준만큼일 때의 신뢰도
+    r = 실력 분산 / (실력 분산 + 선수 내 분산 / 기준)을 계산합니다. (KR-21과 같은 형태)
+    """
+    n = np.asarray(n)
+    results = []
+    for threshold in thresholds:
+        players = n >= threshold
+        if np.count_nonzero(players) < MIN_PLAYERS or np.count_nonzero(players) <= MIN_PAIRS:
+            continue
+        true_var, within = variance_components(n[players], sums[players], sumsq[players])
+        if true_var + within == 0:
+            continue
+        results.append((threshold, true_var / (true_var + within / threshold)))
+    return results
+
+
+# ==========================================================
+# 스탯별 병렬 계산 (공유 메모리 컬럼 + 프로세스 풀)
+# ==========================================================
+def stat_curve(columns, source, n_players, val_col, filter_col, thresholds, resamples=0):
+    """
+    한 스탯의 (기준, 보정 신뢰도) 목록.
+    columns: {(데이터 이름, 컬럼명): 배열} - 데이터마다 'player'(선수 코드)와 'group'(반분) 컬럼이 있어야 함
+    resamples > 0이면 고정 반분 대신 무작위 반분 반복: (기준, 평균, 구간 하한, 구간 상한) 목록
+    """
+    mask = columns[(source, filter_col)].astype(bool, copy=False) if filter_col else None
+    if resamples:
+        return resampled_curve(columns[(source, 'player')], n_players, columns[(source, val_col)], mask,
+                               thresholds, n_resamples=resamples)
+    totals = half_totals(columns[(source, 'player')], n_players, columns[(source, 'group')],
+                         columns[(source, val_col)], mask)
+    return threshold_sweep(totals, thresholds)
+
+
+class SharedColumns:
+    """
+    컬럼 배열들을 공유 메모리에 한 번만 복사해 둡니다.
+    워커는 spec(블록 이름/dtype/shape)만 받아서 같은 메모리를 그대로 읽습니다. (워커별 복사/pickle 없음)
+    """
+
+    def __init__(self, columns):
+        self.blocks = []
+        self.spec = {}
+        for key, array in columns.items():
+            array = np.ascontiguousarray(array)
+            block = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+            np.ndarray(array.shape, dtype=array.dtype, buffer=block.buf)[:] = array
+            self.blocks.append(block)
+            self.spec[key] = (block.name, array.dtype.str, array.shape)
+
+    def close(self):
+        for block in self.blocks:
+            block.close()
+            block.unlink()
+        self.blocks = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def _attach_shared(spec):
+    """워커 초기화: 공유 메모리 블록에 붙어서 배열로 감쌉니다. (읽기 전용)"""
+    for key, (name, dtype, shape) in spec.items():
+        block = shared_memory.SharedMemory(name=name)
+        array = np.ndarray(shape, dtype=np.dtype(dtype), buffer=block.buf)
+        array.flags.writeable = False
+        _shared_blocks.append(block)
+        _shared_columns[key] = array
+
+
+def _shared_stat_curve(*task):
+    return stat_curve(_shared_columns, *task)
+
+
+def run_stat_curves(columns, tasks, workers=1):
+    """
+    tasks: [(데이터 이름, 선수 수, 값 컬럼, 분모 조건 컬럼, 기준 목록[, 반복 횟수])]
+    workers > 1이면 필요한 컬럼을 공유 메모리에 올리고 스탯을 프로세스 풀에 나눠 계산합니다.
+    결과는 항상 tasks 순서대로 반환합니다. (완료 순서와 무관)
+    """
+    if workers <= 1 or len(tasks) <= 1:
+        return [stat_curve(columns, *task) for task in tasks]
+
+    with SharedColumns(columns) as shared:
+        with ProcessPoolExecutor(max_workers=min(workers, len(tasks)),
+                                 initializer=_attach_shared, initargs=(shared.spec,)) as executor:
+            futures = [executor.submit(_shared_stat_curve, *task) for task in tasks]
+            return [future.result() for future in futures]
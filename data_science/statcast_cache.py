@@ -0,0 +1,242 @@
+# data_science/statcast_cache.py
+import os
+import json
+import hashlib
+import threading
+import time
+from datetime import date
+import pandas as pd
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+
+# ==========================================================
+# 1. 경로 및 설정
+# ==========================================================
+CACHE_DIR = os.path.normpath(os.path.join(current_dir, '..', 'simulation', 'data', 'statcast_cache'))
+MAX_CACHE_BYTES = 20 * 1024 ** 3  # 20GB 초과 시 오래된 응답부터 삭제
+
+# 캐시 동작 모드
+#   - readwrite: 캐시에 있으면 사용, 없으면 네트워크 요청 후 저장 (기본값)
+#   - replay   : 네트워크를 전혀 사용하지 않음. 캐시에 없으면 CacheMiss
+#                (fixture를 직접 지정한 경우에만 가짜 데이터로 대체 - 테스트/벤치마크 전용)
+#   - off      : 캐시를 사용하지 않고 항상 네트워크 요청
+CACHE_MODES = ('readwrite', 'replay', 'off')
+
+# 빈 응답(경기 없는 날)은 .empty 기록 파일로 남깁니다. replay 모드는 항상 빈 응답으로 돌려주고,
+# readwrite 모드는 일시적인 오류였을 수 있으므로 기록 후 이 시간이 지나면 다시 요청해 확인합니다.
+EMPTY_TTL_SECONDS = 7 * 24 * 3600
+
+
+class CacheMiss(KeyError):
+    """replay 모드에서 기록된 응답도, 대체할 fixture도 없을 때 발생"""
+
+
+class StatcastCache:
+    """
+    pybaseball statcast() 호출 앞에 두는 디스크 캐시.
+
+    응답을 하루 단위로 나눠 (날짜, columns)의 해시값을 파일 이름으로 사용하며(content-addressed),
+    parquet 파일로 저장합니다. 전체 크기가 max_bytes를 넘으면 가장 오래 사용하지 않은
+    응답부터 삭제합니다. 오늘 이후 날짜는 데이터가 바뀔 수 있으므로 저장하지 않고,
+    경기 없는 날은 빈 응답 기록(.empty)으로 남깁니다. (EMPTY_TTL_SECONDS 참고)
+    fixture_hits: replay 모드에서 가짜 데이터로 대체한 응답 수 (0이 아니면 결과를 실제 데이터로 쓰면 안 됨)
+    """
+
+    def __init__(self, fetcher=None, cache_dir=CACHE_DIR, max_bytes=MAX_CACHE_BYTES,
+                 mode='readwrite', fixture=None):
+        if mode not in CACHE_MODES:
+            raise ValueError(f"알 수 없는 캐시 모드: {mode} (가능: {', '.join(CACHE_MODES)})")
+
+        self.fetcher = fetcher
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.mode = mode
+        self.fixture = fixture
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.fixture_hits = 0
+
+        os.makedirs(self.cache_dir, exist_ok=True)
+        self.total_bytes = sum(os.path.getsize(p) for p in self._entries())
+
+    # ------------------------------------------------------
+    # 키 / 경로
+    # ------------------------------------------------------
+    @staticmethod
+    def make_key(start_dt, end_dt, columns=None):
+        """요청 파라미터를 정규화한 뒤 SHA-256 해시로 변환합니다."""
+        payload = json.dumps({
+            'start_dt': str(start_dt),
+            'end_dt': str(end_dt or start_dt),
+            'columns': sorted(columns) if columns else None,
+        }, sort_keys=True)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, key[:2], f"{key}.parquet")
+
+    @staticmethod
+    def _empty_path(path):
+        """경기 없는 날(빈 응답) 기록 파일: 내용은 기록 시각(unix time)"""
+        return path[:-len('.parquet')] + '.empty'
+
+    def _entries(self):
+        for root, _, names in os.walk(self.cache_dir):
+            for name in names:
+                if name.endswith('.parquet'):
+                    yield os.path.join(root, name)
+
+    # ------------------------------------------------------
+    # 조회 / 저장
+    # ------------------------------------------------------
+    def statcast(self, start_dt, end_dt=None, columns=None, before_fetch=None):
+        """
+        statcast(start_dt, end_dt)와 같은 형태로 호출합니다.
+        before_fetch: 실제 네트워크 요청 직전에만 호출할 함수 (예: 속도 제한기의 acquire)
+
+        캐시는 하루 단위로 저장되므로, 요청 기간이 달라도 (예: adaptive 모드에서 창 크기가 바뀐 재실행)
+        기록된 날짜들을 모아 응답을 조립합니다. 기록되지 않은 날짜가 있으면 그 구간만 한 번에 요청합니다.
+        """
+        end_dt = end_dt or start_dt
+
+        if self.mode == 'off':
+            return self._fetch(start_dt, end_dt, columns, before_fetch)
+
+        days = pd.date_range(str(start_dt), str(end_dt)).strftime('%Y-%m-%d').tolist()
+        frames = {day: self._read_day(day, columns) for day in days}
+        missing = [day for day, df in frames.items() if df is None]
+
+        with self.lock:
+            if missing:
+                self.misses += 1
+            else:
+                self.hits += 1
+
+        if not missing:
+            return _concat([frames[day] for day in days])
+
+        # 첫 번째 ~ 마지막 미기록 날짜 구간을 한 번에 요청 (사이에 기록된 날짜는 새 응답으로 대체)
+        span = days[days.index(missing[0]):days.index(missing[-1]) + 1]
+        if self.mode == 'replay':
+            if self.fixture is None:
+                raise CacheMiss(f"기록된 응답 없음: {', '.join(missing)}")
+            df = self.fixture(span[0], span[-1])
+            with self.lock:
+                self.fixture_hits += 1
+            df = df[columns] if columns and not df.empty else df
+        else:
+            df = self._fetch(span[0], span[-1], columns, before_fetch)
+
+        fetched = _split_days(df, span)
+        if fetched is None:
+            # 요청하지 않은 날짜가 섞인 응답 -> 저장하지 않고 그대로 돌려줘서 호출한 쪽에서 검증
+            return df
+
+        today = str(date.today())
+        for day in span:
+            frames[day] = fetched[day]
+            if self.mode == 'readwrite' and day in missing and day < today:
+                self._store_day(day, columns, fetched[day])
+        return _concat([frames[day] for day in days])
+
+    def _read_day(self, day, columns):
+        """기록된 하루치 응답. 기록이 없으면 None, 경기 없는 날로 기록됐으면 빈 DataFrame."""
+        path = self._path(self.make_key(day, day, columns))
+        try:
+            os.utime(path)  # LRU 순서 갱신
+            return pd.read_parquet(path)
+        except FileNotFoundError:
+            pass  # 저장된 적이 없거나 방금 eviction으로 삭제됨
+
+        try:
+            with open(self._empty_path(path), 'r', encoding='utf-8') as f:
+                recorded_at = float(f.read().strip() or 0)
+        except FileNotFoundError:
+            return None
+        # replay는 기록을 그대로 신뢰하고, readwrite는 오래된 빈 응답만 다시 확인
+        if self.mode == 'readwrite' and time.time() - recorded_at > EMPTY_TTL_SECONDS:
+            return None
+        return pd.DataFrame()
+
+    def _store_day(self, day, columns, df):
+        path = self._path(self.make_key(day, day, columns))
+        if not df.empty:
+            self._store(path, df)
+            return
+
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        empty_path = self._empty_path(path)
+        tmp_path = f"{empty_path}.{threading.get_ident()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(str(time.time()))
+        os.replace(tmp_path, empty_path)
+
+    def _fetch(self, start_dt, end_dt, columns, before_fetch=None):
+        if self.fetcher is None:
+            raise CacheMiss("fetcher가 지정되지 않아 네트워크 요청을 할 수 없습니다.")
+        if before_fetch is not None:
+            before_fetch()
+        df = self.fetcher(start_dt=start_dt, end_dt=end_dt)
+        if df is None:
+            df = pd.DataFrame()
+        return df[columns] if columns and not df.empty else df
+
+    def _store(self, path, df):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        df.to_parquet(tmp_path, index=False)
+
+        with self.lock:
+            # 다른 스레드가 같은 응답을 먼저 저장했다면 중복 집계하지 않음
+            if os.path.exists(path):
+                os.remove(tmp_path)
+                return
+            os.replace(tmp_path, path)
+            self.total_bytes += os.path.getsize(path)
+            if self.total_bytes > self.max_bytes:
+                self._evict()
+
+    def _evict(self):
+        """최근 사용 시각(mtime)이 오래된 응답부터 지워 max_bytes 이하로 맞춥니다. (lock 보유 상태에서 호출)"""
+        entries = sorted(self._entries(), key=os.path.getmtime)
+        for path in entries:
+            if self.total_bytes <= self.max_bytes:
+                break
+            size = os.path.getsize(path)
+            os.remove(path)
+            self.total_bytes -= size
+
+    def stats(self):
+        return {
+            'mode': self.mode,
+            'hits': self.hits,
+            'misses': self.misses,
+            'fixture_hits': self.fixture_hits,
+            'entries': sum(1 for _ in self._entries()),
+            'size_mb': round(self.total_bytes / 1024 ** 2, 1),
+        }
+
+
+def _split_days(df, days):
+    """응답을 날짜별로 나눕니다. (날짜 -> DataFrame, 행이 없는 날은 빈 DataFrame)
+    요청하지 않은 날짜가 섞여 있거나 game_date가 없으면 나눌 수 없으므로 None"""
+    if df.empty:
+        return {day: pd.DataFrame() for day in days}
+    if 'game_date' not in df.columns:
+        return None
+
+    day_key = df['game_date'].astype(str).str[:10]
+    if not day_key.isin(days).all():
+        return None
+    groups = {day: group for day, group in df.groupby(day_key, sort=False)}
+    return {day: groups[day].reset_index(drop=True) if day in groups else pd.DataFrame() for day in days}
+
+
+def _concat(frames):
+    frames = [df for df in frames if not df.empty]
+    if not frames:
+        return pd.DataFrame()
+    if len(frames) == 1:
+        return frames[0]
+    return pd.concat(frames, ignore_index=True)
@@ -0,0 +1,210 @@
+# data_science/statcast_catalog.py
+import os
+import re
+import sys
+import json
+import glob
+import threading
+from datetime import datetime
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(current_dir)
+from data_loader import file_sha256, _game_dates
+
+# ==========================================================
+# 1. 경로 및 설정
+# ==========================================================
+DATA_DIR = os.path.normpath(os.path.join(current_dir, '..', 'simulation', 'data'))
+CATALOG_FILE_NAME = 'statcast_catalog.json'
+CATALOG_VERSION = 1
+
+
+def describe_file(path):
+    """
+    연도 파일 하나의 카탈로그 항목을 만듭니다.
+    - 스키마, 행 수, Row Group 수: parquet footer(메타데이터)만 읽음
+    - 컬럼별 결측 수: Row Group 통계에서 합산 (통계가 없는 컬럼만 실제로 읽어서 계산)
+    - game_date 범위 / 날짜 수 / 고유 game_pk 수: 두 컬럼만 배치 단위로 읽어서 계산
+    """
+    parquet = pq.ParquetFile(path)
+    metadata = parquet.metadata
+    schema = parquet.schema_arrow
+    stat = os.stat(path)
+
+    # 결측 수 (Row Group 통계 합산)
+    null_counts = {}
+    missing_stats = []
+    for i, field in enumerate(schema):
+        total = 0
+        for rg in range(metadata.num_row_groups):
+            stats = metadata.row_group(rg).column(i).statistics
+            if stats is None or not stats.has_null_count:
+                missing_stats.append(field.name)
+                break
+            total += stats.null_count
+        else:
+            null_counts[field.name] = total
+
+    if missing_stats:
+        for batch in parquet.iter_batches(columns=missing_stats):
+            for name in missing_stats:
+                null_counts[name] = null_counts.get(name, 0) + batch.column(name).null_count
+
+    # 날짜 범위 / 경기 수
+    key_columns = [c for c in ('game_date', 'game_pk') if c in schema.names]
+    min_date = max_date = None
+    dates, games = set(), set()
+    for batch in parquet.iter_batches(columns=key_columns):
+        table = pa.Table.from_batches([batch])
+        if 'game_date' in key_columns:
+            dates.update(d for d in pc.unique(_game_dates(table)).to_pylist() if d is not None)
+        if 'game_pk' in key_columns:
+            games.update(g for g in pc.unique(table['game_pk']).to_pylist() if g is not None)
+    if dates:
+        min_date, max_date = str(min(dates)), str(max(dates))
+
+    return {
+        'file': os.path.basename(path),
+        'size': stat.st_size,
+        'mtime_ns': stat.st_mtime_ns,
+        'sha256': file_sha256(path),
+        'num_rows': metadata.num_rows,
+        'num_row_groups': metadata.num_row_groups,
+        'schema': [{'name': f.name, 'type': str(f.type)} for f in schema],
+        'min_game_date': min_date,
+        'max_game_date': max_date,
+        'num_dates': len(dates),
+        'num_games': len(games),
+        'null_counts': {f.name: int(null_counts[f.name]) for f in schema},
+        'updated_at': datetime.now().isoformat(timespec='seconds'),
+    }
+
+
+class StatcastCatalog:
+    """
+    연도별 원본 파일(statcast_{year}.parquet)의 목록과 통계를 담은 JSON 카탈로그.
+
+    연도 파일을 새로 쓸 때마다 update()로 해당 연도 항목을 갱신합니다.
+    행 수, 날짜 범위, 경기 수, 컬럼별 결측 수 같은 질문은 데이터 파일을 열지 않고 여기서 바로 답합니다.
+    파일 크기/수정 시각이 기록과 다르면 오래된(stale) 항목으로 보고 refresh()에서 다시 계산합니다.
+    """
+
+    def __init__(self, data_dir=DATA_DIR):
+        self.data_dir = os.path.normpath(data_dir)
+        self.path = os.path.join(self.data_dir, CATALOG_FILE_NAME)
+        self.lock = threading.Lock()
+        self.files = self._read()
+
+    # ------------------------------------------------------
+    # 읽기 / 쓰기
+    # ------------------------------------------------------
+    def _read(self):
+        if not os.path.exists(self.path):
+            return {}
+        with open(self.path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        if data.get('version') != CATALOG_VERSION:
+            return {}
+        return {int(year): entry for year, entry in data.get('files', {}).items()}
+
+    def _write(self):
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({
+                'version': CATALOG_VERSION,
+                'files': {str(year): self.files[year] for year in sorted(self.files)},
+            }, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, self.path)
+
+    def exists(self):
+        return os.path.exists(self.path)
+
+    # ------------------------------------------------------
+    # 갱신
+    # ------------------------------------------------------
+    @staticmethod
+    def _year_of(path):
+        match = re.search(r"statcast_(\d{4})\.parquet$", path)
+        return int(match.group(1)) if match else None
+
+    def _year_files(self):
+        files = {}
+        for path in glob.glob(os.path.join(self.data_dir, 'statcast_*.parquet')):
+            year = self._year_of(path)
+            if year is not None:
+                files[year] = path
+        return files
+
+    def is_stale(self, year, path):
+        entry = self.files.get(year)
+        if entry is None:
+            return True
+        stat = os.stat(path)
+        return entry['size'] != stat.st_size or entry['mtime_ns'] != stat.st_mtime_ns
+
+    def update(self, path):
+        """연도 파일 하나의 항목을 다시 계산해서 카탈로그에 저장합니다. (연도 파일을 쓴 직후 호출)"""
+        year = self._year_of(path)
+        if year is None:
+            raise ValueError(f"연도 파일 이름이 아닙니다: {path}")
+
+        entry = describe_file(path)
+        with self.lock:
+            self.files[year] = entry
+            self._write()
+        return entry
+
+    def refresh(self):
+        """
+        폴더의 연도 파일과 카탈로그를 맞춥니다.
+        새로 생기거나 바뀐 파일만 다시 계산하고, 사라진 파일의 항목은 지웁니다.
+        반환값: 다시 계산한 연도 목록
+        """
+        files = self._year_files()
+        changed = [year for year in sorted(files) if self.is_stale(year, files[year])]
+
+        with self.lock:
+            for year in changed:
+                self.files[year] = describe_file(files[year])
+            for year in set(self.files) - set(files):
+                del self.files[year]
+            self._write()
+        return changed
+
+    # ------------------------------------------------------
+    # 조회
+    # ------------------------------------------------------
+    def years(self):
+        return sorted(self.files)
+
+    def entry(self, year):
+        return self.files.get(year)
+
+    def total_rows(self):
+        return sum(entry['num_rows'] for entry in self.files.values())
+
+    def summary(self):
+        """연도별 행 수 / 날짜 범위 / 경기 수 요약 (대시보드용)"""
+        return {
+            str(year): {
+                'rows': entry['num_rows'],
+                'games': entry['num_games'],
+                'dates': entry['num_dates'],
+                'min_game_date': entry['min_game_date'],
+                'max_game_date': entry['max_game_date'],
+            }
+            for year, entry in sorted(self.files.items())
+        }
+
+
+if __name__ == "__main__":
+    catalog = StatcastCatalog()
+    changed = catalog.refresh()
+    print(f"📒 카탈로그 갱신: {catalog.path}")
+    print(f"   - 다시 계산한 연도: {changed if changed else '없음'}")
+    for year, info in catalog.summary().items():
+        print(f"   - {year}: {info['rows']:,}행, {info['games']:,}경기, "
+              f"{info['min_game_date']} ~ {info['max_game_date']}")
@@ -0,0 +1,164 @@
+# data_science/statcast_fixtures.py
+import zlib
+import numpy as np
+import pandas as pd
+
+# ==========================================================
+# 오프라인 테스트/벤치마크용 가짜 Statcast 데이터 생성기
+# ==========================================================
+# 같은 날짜를 요청하면 항상 같은 결과가 나오도록 날짜 문자열로 시드를 고정합니다.
+# 실제 데이터와 동일한 컬럼 이름/의미를 사용하므로 분석 스크립트를 그대로 돌려볼 수 있습니다.
+
+TEAMS = ['ARI', 'ATL', 'BAL', 'BOS', 'CHC', 'CWS', 'CIN', 'CLE', 'COL', 'DET',
+         'HOU', 'KC', 'LAA', 'LAD', 'MIA', 'MIL', 'MIN', 'NYM', 'NYY', 'OAK',
+         'PHI', 'PIT', 'SD', 'SF', 'SEA', 'STL', 'TB', 'TEX', 'TOR', 'WSH']
+
+PA_EVENTS = ['field_out', 'strikeout', 'single', 'walk', 'double', 'home_run',
+             'grounded_into_double_play', 'force_out', 'hit_by_pitch', 'sac_fly',
+             'triple', 'fielders_choice_out']
+PA_EVENT_PROBS = [0.41, 0.22, 0.14, 0.08, 0.045, 0.03, 0.02, 0.02, 0.01, 0.007, 0.004, 0.014]
+EVENT_OUTS = {'field_out': 1, 'strikeout': 1, 'grounded_into_double_play': 2,
+              'force_out': 1, 'sac_fly': 1, 'fielders_choice_out': 1}
+EVENT_BASES = {'single': 1, 'walk': 1, 'hit_by_pitch': 1, 'double': 2, 'triple': 3, 'home_run': 4}
+BATTED_BALL = {'field_out': 'fly_ball', 'single': 'line_drive', 'double': 'line_drive',
+               'triple': 'fly_ball', 'home_run': 'fly_ball', 'grounded_into_double_play': 'ground_ball',
+               'force_out': 'ground_ball', 'sac_fly': 'fly_ball', 'fielders_choice_out': 'ground_ball'}
+PITCH_TYPES = ['FF', 'SL', 'CH', 'CU', 'SI', 'FC']
+NON_PA_DESCRIPTIONS = ['ball', 'called_strike', 'foul', 'swinging_strike']
+
+# 가상 선수 풀 (MLBAM id 형태의 정수)
+N_PITCHERS_PER_TEAM = 13
+N_BATTERS_PER_TEAM = 13
+
+
+def _pitcher_id(team_idx, slot):
+    return 600000 + team_idx * 100 + slot
+
+
+def _batter_id(team_idx, slot):
+    return 500000 + team_idx * 100 + slot
+
+
+def _half_inning(rng, rows, game, inning, topbot, pitchers, batters, lineup_pos, score):
+    """반 이닝 하나를 시뮬레이션하며 투구 단위 행을 rows에 추가합니다."""
+    outs = 0
+    runners = 0
+    fielding = 'home' if topbot == 'Top' else 'away'
+
+    while outs < 3:
+        # 선발은 5~7회, 이후 불펜이 이닝마다 교체
+        pitcher = pitchers[0] if inning <= game['starter_innings'][fielding] else pitchers[min(inning - 5, len(pitchers) - 1)]
+        batter = batters[lineup_pos[0] % 9]
+        lineup_pos[0] += 1
+        game['at_bat_number'] += 1
+
+        event = rng.choice(PA_EVENTS, p=PA_EVENT_PROBS)
+        n_pitches = int(rng.integers(1, 7))
+        outs_when_up = outs
+
+        if event in EVENT_OUTS:
+            outs = min(3, outs + EVENT_OUTS[event])
+            runs = 1 if event == 'sac_fly' and runners and outs < 3 else 0
+            runners = max(0, runners - runs)
+        else:
+            bases = EVENT_BASES[event]
+            runs = max(0, runners + 1 - 3) if bases == 1 else (runners + 1 if bases == 4 else min(runners, bases))
+            runners = 0 if bases == 4 else min(3, runners + 1 - runs)
+
+        pre = dict(score)
+        score[topbot] += runs
+
+        for pitch_number in range(1, n_pitches + 1):
+            last = pitch_number == n_pitches
+            post = score if last else pre
+            rows.append({
+                'pitch_type': rng.choice(PITCH_TYPES),
+                'game_date': game['game_date'],
+                'release_speed': round(float(rng.normal(92, 4)), 1),
+                'player_name': game['names'][pitcher],
+                'batter': batter,
+                'pitcher': pitcher,
+                'events': event if last else None,
+                'description': ('hit_into_play' if event in BATTED_BALL else
+                                'swinging_strike' if event == 'strikeout' else
+                                'hit_by_pitch' if event == 'hit_by_pitch' else 'ball')
+                               if last else rng.choice(NON_PA_DESCRIPTIONS),
+                'game_type': 'R',
+                'home_team': game['home_team'],
+                'away_team': game['away_team'],
+                'bb_type': BATTED_BALL.get(event) if last else None,
+                'game_year': game['game_year'],
+                'outs_when_up': outs_when_up,
+                'inning': inning,
+                'inning_topbot': topbot,
+                'launch_speed': round(float(rng.normal(88, 12)), 1) if last and event in BATTED_BALL else np.nan,
+                'release_spin_rate': round(float(rng.normal(2300, 200))),
+                'game_pk': game['game_pk'],
+                'at_bat_number': game['at_bat_number'],
+                'pitch_number': pitch_number,
+                'home_score': pre['Bot'],
+                'away_score': pre['Top'],
+                'post_home_score': post['Bot'],
+                'post_away_score': post['Top'],
+            })
+
+
+def synthetic_statcast(start_dt, end_dt=None):
+    """
+    start_dt ~ end_dt 기간의 가짜 Statcast 투구 데이터를 생성합니다.
+    매주 월요일은 경기 없는 날로 처리하여 빈 날짜도 재현합니다.
+    """
+    end_dt = end_dt or start_dt
+    frames = []
+
+    for day in pd.date_range(start_dt, end_dt):
+        if day.dayofweek == 0 or day.month < 3 or day.month > 10:
+            continue
+
+        date_str = day.strftime('%Y-%m-%d')
+        rng = np.random.default_rng(zlib.crc32(date_str.encode()))
+        order = rng.permutation(len(TEAMS))
+        rows = []
+
+        for g in range(len(TEAMS) // 2):
+            home_idx, away_idx = int(order[2 * g]), int(order[2 * g + 1])
+            home_pitchers = [_pitcher_id(home_idx, s) for s in rng.permutation(N_PITCHERS_PER_TEAM)[:6]]
+            away_pitchers = [_pitcher_id(away_idx, s) for s in rng.permutation(N_PITCHERS_PER_TEAM)[:6]]
+            game = {
+                'game_pk': int(day.strftime('%y%m%d')) * 100 + g,
+                'game_date': date_str,
+                'game_year': day.year,
+                'home_team': TEAMS[home_idx],
+                'away_team': TEAMS[away_idx],
+                'at_bat_number': 0,
+                'starter_innings': {'home': int(rng.integers(4, 8)), 'away': int(rng.integers(4, 8))},
+                'names': {p: f"Pitcher, {p}" for p in home_pitchers + away_pitchers},
+            }
+            batters = {
+                'Top': [_batter_id(away_idx, s) for s in range(N_BATTERS_PER_TEAM)][:9],
+                'Bot': [_batter_id(home_idx, s) for s in range(N_BATTERS_PER_TEAM)][:9],
+            }
+            lineup = {'Top': [0], 'Bot': [0]}
+            score = {'Top': 0, 'Bot': 0}
+
+            inning = 1
+            while True:
+                _half_inning(rng, rows, game, inning, 'Top', home_pitchers, batters['Top'], lineup['Top'], score)
+                # 9회말 홈팀이 앞서 있으면 경기 종료
+                if inning >= 9 and score['Bot'] > score['Top']:
+                    break
+                _half_inning(rng, rows, game, inning, 'Bot', away_pitchers, batters['Bot'], lineup['Bot'], score)
+                if inning >= 9 and score['Bot'] != score['Top']:
+                    break
+                if inning >= 12:  # 가짜 데이터에서는 무승부도 일부 허용
+                    break
+                inning += 1
+
+        frames.append(pd.DataFrame(rows))
+
+    if not frames:
+        return pd.DataFrame()
+
+    df = pd.concat(frames, ignore_index=True)
+    # 실제 Statcast 응답처럼 최신 투구가 먼저 오도록 역순 정렬
+    return df.iloc[::-1].reset_index(drop=True)
@@ -0,0 +1,64 @@
+# data_science/test_statcast_cache.py
+import os
+import sys
+import tempfile
+import unittest
+import pandas as pd
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from statcast_cache import StatcastCache, CacheMiss
+
+
+def _rows(*days):
+    return pd.DataFrame({'game_date': list(days), 'pitch_type': ['FF'] * len(days)})
+
+
+class StatcastCacheReplayTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.cache_dir = self.tmp.name
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _record(self, responses):
+        """readwrite 모드로 응답을 기록합니다. responses: (start_dt, end_dt) -> DataFrame"""
+        cache = StatcastCache(fetcher=lambda start_dt, end_dt: responses[(start_dt, end_dt)],
+                              cache_dir=self.cache_dir)
+        for start_dt, end_dt in responses:
+            cache.statcast(start_dt, end_dt)
+
+    def test_replay_recorded_empty_day(self):
+        # 경기 없는 날(빈 응답)도 기록되어 replay에서 CacheMiss 없이 빈 응답으로 돌아와야 함
+        self._record({('2019-04-01', '2019-04-01'): pd.DataFrame()})
+
+        replay = StatcastCache(cache_dir=self.cache_dir, mode='replay')
+        df = replay.statcast('2019-04-01', '2019-04-01')
+        self.assertTrue(df.empty)
+        self.assertEqual(replay.hits, 1)
+
+    def test_replay_unrecorded_day_raises(self):
+        replay = StatcastCache(cache_dir=self.cache_dir, mode='replay')
+        with self.assertRaises(CacheMiss):
+            replay.statcast('2019-04-01', '2019-04-01')
+
+    def test_replay_assembles_different_window(self):
+        # 3일 창으로 기록한 응답을 다른 창 크기로 다시 요청해도 하루 단위 기록에서 조립
+        self._record({('2019-04-01', '2019-04-03'): _rows('2019-04-01', '2019-04-01', '2019-04-03')})
+
+        replay = StatcastCache(cache_dir=self.cache_dir, mode='replay')
+        self.assertEqual(len(replay.statcast('2019-04-01', '2019-04-01')), 2)
+        self.assertTrue(replay.statcast('2019-04-02', '2019-04-02').empty)
+        self.assertEqual(replay.statcast('2019-04-02', '2019-04-03')['game_date'].tolist(), ['2019-04-03'])
+
+    def test_today_is_not_recorded(self):
+        today = str(pd.Timestamp.today().date())
+        self._record({(today, today): pd.DataFrame()})
+
+        replay = StatcastCache(cache_dir=self.cache_dir, mode='replay')
+        with self.assertRaises(CacheMiss):
+            replay.statcast(today, today)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,18 @@
+# Generated by Django 6.0 on 2026-10-18 08:11
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('simulation', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='pitchdata',
+            name='player_id',
+            field=models.IntegerField(blank=True, db_index=True, null=True),
+        ),
+    ]
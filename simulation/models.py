@@ -4,6 +4,8 @@ from django.db import models
 class PitchData(models.Model):
     # 검색 및 필터링을 위한 핵심 필드
     player_name = models.CharField(max_length=100, db_index=True)
+    # 투수 MLBAM id (선수 차원 테이블 키) - 그룹핑/조인은 이 정수 키로, 이름은 표시용
+    player_id = models.IntegerField(null=True, blank=True, db_index=True)
     game_date = models.DateField(null=True, blank=True)
     p_throws = models.CharField(max_length=10, null=True, blank=True)
     pitch_type = models.CharField(max_length=10, null=True, blank=True)